@@ -0,0 +1,31 @@
+-- ============================================================
+-- Migration 004: Denormalized spatial location of IfcElements
+-- Date: 2026-10-16
+-- Description: Store building/storey/space GlobalIds per element, so
+--              "elements on storey X" is an index lookup instead of a
+--              walk over the JSON tree in SpatialTrees
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE "IfcElements"
+ADD COLUMN "BuildingGlobalId" VARCHAR(22),
+ADD COLUMN "StoreyGlobalId" VARCHAR(22),
+ADD COLUMN "SpaceGlobalId" VARCHAR(22);
+
+-- Query pattern: WHERE RevisionId = ? AND StoreyGlobalId = ?
+CREATE INDEX "IX_IfcElements_RevisionId_StoreyGlobalId"
+ON "IfcElements"("RevisionId", "StoreyGlobalId");
+
+-- Query pattern: WHERE RevisionId = ? AND SpaceGlobalId = ?
+CREATE INDEX "IX_IfcElements_RevisionId_SpaceGlobalId"
+ON "IfcElements"("RevisionId", "SpaceGlobalId")
+WHERE "SpaceGlobalId" IS NOT NULL;
+
+COMMENT ON COLUMN "IfcElements"."BuildingGlobalId" IS 'GlobalId of the IfcBuilding the element is located in';
+COMMENT ON COLUMN "IfcElements"."StoreyGlobalId" IS 'GlobalId of the IfcBuildingStorey the element is located in';
+COMMENT ON COLUMN "IfcElements"."SpaceGlobalId" IS 'GlobalId of the IfcSpace the element is located in';
+
+COMMIT;
+
+SELECT 'Migration 004 completed: Added spatial location columns to IfcElements' as status;
@@ -49,6 +49,24 @@ public class IfcElement
     /// </summary>
     public string? Description { get; set; }
 
+    /// <summary>
+    /// GlobalId of the IfcBuilding the element is located in (denormalized)
+    /// </summary>
+    [MaxLength(22)]
+    public string? BuildingGlobalId { get; set; }
+
+    /// <summary>
+    /// GlobalId of the IfcBuildingStorey the element is located in (denormalized)
+    /// </summary>
+    [MaxLength(22)]
+    public string? StoreyGlobalId { get; set; }
+
+    /// <summary>
+    /// GlobalId of the IfcSpace the element is located in (denormalized)
+    /// </summary>
+    [MaxLength(22)]
+    public string? SpaceGlobalId { get; set; }
+
     /// <summary>
     /// All element properties stored as JSONB for fast querying
     /// Structure:
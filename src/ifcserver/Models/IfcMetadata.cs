@@ -49,5 +49,23 @@ public class IfcMetadata
         /// </summary>
         [JsonPropertyName("application")]
         public string? Application { get; set; }
+
+        /// <summary>
+        /// Exact instance count of every entity class in the file
+        /// </summary>
+        [JsonPropertyName("entity_histogram")]
+        public Dictionary<string, int> EntityHistogram { get; set; } = new();
+
+        /// <summary>
+        /// Instance count of every class including its subtypes (e.g. IfcBuildingElement: 157)
+        /// </summary>
+        [JsonPropertyName("entity_rollups")]
+        public Dictionary<string, int> EntityRollups { get; set; } = new();
+
+        /// <summary>
+        /// True if entity counts were extrapolated from a sample (fast header-only parse)
+        /// </summary>
+        [JsonPropertyName("entity_counts_approximate")]
+        public bool EntityCountsApproximate { get; set; }
     }
 }
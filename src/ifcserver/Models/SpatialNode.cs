@@ -43,6 +43,38 @@ public class SpatialNode
         /// </summary>
         [JsonPropertyName("children")]
         public List<SpatialNode> Children { get; set; } = new();
+
+        /// <summary>
+        /// Aggregates over the elements below a spatial node (null for element leaves)
+        /// </summary>
+        [JsonPropertyName("rollup")]
+        [JsonIgnore(Condition = JsonIgnoreCondition.WhenWritingNull)]
+        public SpatialNodeRollup? Rollup { get; set; }
+    }
+
+    /// <summary>
+    /// Element statistics of a spatial node, summed over its whole subtree.
+    /// Matches the Python new_rollup() structure.
+    /// </summary>
+    public class SpatialNodeRollup
+    {
+        /// <summary>
+        /// Number of elements below the node
+        /// </summary>
+        [JsonPropertyName("element_count")]
+        public int ElementCount { get; set; }
+
+        /// <summary>
+        /// Number of elements per IFC type (e.g., "IfcWall": 12)
+        /// </summary>
+        [JsonPropertyName("type_counts")]
+        public Dictionary<string, int> TypeCounts { get; set; } = new();
+
+        /// <summary>
+        /// Summed quantities per quantity set (e.g., "Qto_WallBaseQuantities": { "NetVolume": 12.5 })
+        /// </summary>
+        [JsonPropertyName("quantities")]
+        public Dictionary<string, Dictionary<string, double>> Quantities { get; set; } = new();
     }
 
     /// <summary>
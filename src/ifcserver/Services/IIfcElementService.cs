@@ -30,6 +30,14 @@ public interface IIfcElementService
     /// <returns>List of elements</returns>
     Task<List<IfcElement>> GetElementsByTypeAsync(int revisionId, string elementType);
 
+    /// <summary>
+    /// Get elements located in a building storey (uses the denormalized StoreyGlobalId column)
+    /// </summary>
+    /// <param name="revisionId">IFC model ID</param>
+    /// <param name="storeyGlobalId">GlobalId of the IfcBuildingStorey</param>
+    /// <returns>List of elements</returns>
+    Task<List<IfcElement>> GetElementsByStoreyAsync(int revisionId, string storeyGlobalId);
+
     /// <summary>
     /// Get element count for a specific model
     /// </summary>
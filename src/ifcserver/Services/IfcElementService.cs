@@ -111,6 +111,18 @@ public async Task<List<IfcElement>> GetElementsByTypeAsync(int modelId, string e
             .ToListAsync();
     }
 
+    /// <summary>
+    /// Get elements located in a building storey of a specific model
+    /// </summary>
+    public async Task<List<IfcElement>> GetElementsByStoreyAsync(int modelId, string storeyGlobalId)
+    {
+        return await _dbContext.IfcElements
+            .Where(e => e.RevisionId == modelId && e.StoreyGlobalId == storeyGlobalId)
+            .OrderBy(e => e.ElementType)
+            .ThenBy(e => e.Name)
+            .ToListAsync();
+    }
+
     /// <summary>
     /// Get element count for a specific model
     /// </summary>
@@ -372,6 +372,9 @@ public async Task<List<IfcElement>> ExtractAllElementsAsync(string ifcFilePath)
                     ElementType = e.ElementType,
                     Name = e.Name,
                     Description = e.Description,
+                    BuildingGlobalId = e.BuildingGlobalId,
+                    StoreyGlobalId = e.StoreyGlobalId,
+                    SpaceGlobalId = e.SpaceGlobalId,
                     PropertiesJson = JsonSerializer.Serialize(e.Properties),
                     CreatedAt = DateTime.UtcNow
                 }).ToList();
@@ -434,6 +437,9 @@ public async Task<List<IfcElement>> ExtractAllElementsAsync(string ifcFilePath)
                     ElementType = e.ElementType,
                     Name = e.Name,
                     Description = e.Description,
+                    BuildingGlobalId = e.BuildingGlobalId,
+                    StoreyGlobalId = e.StoreyGlobalId,
+                    SpaceGlobalId = e.SpaceGlobalId,
                     PropertiesJson = JsonSerializer.Serialize(e.Properties),
                     CreatedAt = DateTime.UtcNow
                 }).ToList();
@@ -702,6 +708,15 @@ private class ElementData
             [JsonPropertyName("description")]
             public string? Description { get; set; }
 
+            [JsonPropertyName("building_global_id")]
+            public string? BuildingGlobalId { get; set; }
+
+            [JsonPropertyName("storey_global_id")]
+            public string? StoreyGlobalId { get; set; }
+
+            [JsonPropertyName("space_global_id")]
+            public string? SpaceGlobalId { get; set; }
+
             [JsonPropertyName("properties")]
             public Dictionary<string, object> Properties { get; set; } = new();
         }
@@ -18,6 +18,8 @@
 - property_extractor: PropertySet extraction from IFC elements
 - gltf_exporter: IFC to glTF/GLB conversion
 - cache_manager: RAM caching for performance
+- pipeline: Single-parse revision processing (all upload stages)
+- worker: Long-lived stdin/stdout worker sharing one cache across requests
 
 Usage:
     from ifc_intelligence.parser import IfcParser
@@ -47,6 +49,8 @@
 from .gltf_exporter import GltfExporter, GltfExportOptions, GltfExportResult
 from .property_extractor import PropertyExtractor, IfcElementProperties
 from .spatial_tree_extractor import SpatialTreeExtractor, SpatialNode
+from .pipeline import RevisionPipeline
+from .worker import IfcWorker
 
 # Future imports
 # from .cache_manager import IfcCacheManager
@@ -61,4 +65,6 @@
     "IfcElementProperties",
     "SpatialTreeExtractor",
     "SpatialNode",
+    "RevisionPipeline",
+    "IfcWorker",
 ]
@@ -0,0 +1,401 @@
+"""
+Persistent Derived-Artifact Cache
+
+On-disk cache for results derived from IFC files: metadata, spatial trees
+and per-element properties. The RAM cache (IfcCacheManager) only helps while
+a process is alive; this cache survives restarts and is shared by every CLI
+invocation and worker pointed at the same directory, so a revision that was
+processed once is never parsed again just to answer the same question.
+
+Artifacts are keyed by the BLAKE2b hash of the IFC file content plus the
+artifact kind, the extractor version and its options. Bumping an extractor's
+ARTIFACT_VERSION therefore invalidates everything it wrote before, and a
+changed file never matches an old artifact.
+
+Storage format (one file per artifact):
+    header:  magic b"IFCA", format version (uint8), uncompressed length (uint64)
+    payload: zlib-compressed compact JSON
+
+Least recently used artifacts (by file mtime, refreshed on every hit) are
+deleted once the directory exceeds its disk budget.
+
+Enable it for the CLI scripts with the IFC_ARTIFACT_CACHE_DIR (and optionally
+IFC_ARTIFACT_CACHE_MB) environment variables, or pass an ArtifactCache to the
+extractors.
+
+License: MIT
+"""
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .cache_manager import hash_file_content
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+ARTIFACT_MAGIC = b"IFCA"
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".ifca"
+
+# magic, format version, uncompressed payload length
+_HEADER = struct.Struct("<4sBQ")
+
+# Evict down to this fraction of the budget, so that not every write evicts
+_EVICTION_LOW_WATER = 0.9
+
+
+def encode_artifact(data: Any, compress_level: int = 6) -> bytes:
+    """
+    Serialize an artifact to the on-disk format.
+
+    Args:
+        data: JSON-serializable value
+        compress_level: zlib compression level (1 = fastest, 9 = smallest)
+
+    Returns:
+        Header followed by the compressed payload
+    """
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, len(raw)) + zlib.compress(raw, compress_level)
+
+
+def decode_artifact(blob: bytes) -> Any:
+    """
+    Deserialize an artifact written by encode_artifact().
+
+    Args:
+        blob: File content
+
+    Returns:
+        The stored value
+
+    Raises:
+        ValueError: If the header or payload is invalid
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Truncated artifact header")
+
+    magic, format_version, length = _HEADER.unpack_from(blob)
+    if magic != ARTIFACT_MAGIC:
+        raise ValueError("Not an artifact file")
+    if format_version != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version: {format_version}")
+
+    try:
+        raw = zlib.decompress(blob[_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"Corrupt artifact payload: {e}")
+    if len(raw) != length:
+        raise ValueError("Artifact length mismatch")
+
+    return json.loads(raw.decode("utf-8"))
+
+
+def artifact_key(content_hash: str, kind: str, version: int, options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key of an artifact.
+
+    Args:
+        content_hash: Content hash of the IFC file
+        kind: Artifact kind (e.g. "metadata", "spatial_tree", "properties")
+        version: Version of the extractor that produces the artifact
+        options: Extractor options the result depends on
+
+    Returns:
+        Hex digest identifying the artifact
+    """
+    identity = json.dumps([content_hash, kind, version, options or {}], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Disk-size bounded cache of derived IFC artifacts.
+
+    Usage:
+        artifacts = ArtifactCache("/var/cache/ifc-artifacts", max_disk_mb=2048)
+        parser = IfcParser(artifact_cache=artifacts)
+        metadata = parser.parse_file("model.ifc")  # parsed once, then read from disk
+    """
+
+    def __init__(self, cache_dir: str, max_disk_mb: float = 1024, compress_level: int = 6):
+        """
+        Initialize the artifact cache.
+
+        Args:
+            cache_dir: Directory for artifact files (created if missing)
+            max_disk_mb: Disk budget in MB (default: 1024)
+            compress_level: zlib compression level (default: 6)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.compress_level = compress_level
+
+        self._lock = threading.Lock()
+        # path -> (stat signature, content hash), so unchanged files are hashed once
+        self._content_hashes: Dict[str, Tuple[tuple, str]] = {}
+        self._disk_bytes = self._scan_disk_usage()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._errors = 0
+
+    def file_hash(self, file_path: str) -> str:
+        """
+        Get the content hash of an IFC file (memoized per stat signature).
+
+        Args:
+            file_path: Path to the IFC file
+
+        Returns:
+            BLAKE2b hex digest of the file content
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        stat = os.stat(file_path)
+        signature = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            known = self._content_hashes.get(file_path)
+        if known is not None and known[0] == signature:
+            return known[1]
+
+        content_hash = hash_file_content(file_path)
+        with self._lock:
+            self._content_hashes[file_path] = (signature, content_hash)
+        return content_hash
+
+    def get(self, file_path: str, kind: str, version: int, options: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Look up an artifact of an IFC file.
+
+        Args:
+            file_path: Path to the IFC file the artifact was derived from
+            kind: Artifact kind
+            version: Extractor version
+            options: Extractor options
+
+        Returns:
+            The stored value, or None on a miss (also if the IFC file doesn't exist)
+        """
+        try:
+            content_hash = self.file_hash(file_path)
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        path = self._artifact_path(kind, artifact_key(content_hash, kind, version, options))
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            data = decode_artifact(blob)
+        except ValueError as e:
+            logger.warning("artifact_corrupt", path=str(path), error=str(e))
+            self._remove_file(path)
+            with self._lock:
+                self._errors += 1
+                self._misses += 1
+            return None
+
+        # Refresh mtime: eviction removes the least recently used artifacts first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self._hits += 1
+        logger.debug("artifact_hit", kind=kind, file_path=file_path)
+        return data
+
+    def put(
+        self,
+        file_path: str,
+        kind: str,
+        version: int,
+        data: Any,
+        options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Store an artifact of an IFC file.
+
+        Write failures are logged and otherwise ignored; the cache is an optimization.
+
+        Args:
+            file_path: Path to the IFC file the artifact was derived from
+            kind: Artifact kind
+            version: Extractor version
+            data: JSON-serializable value
+            options: Extractor options
+        """
+        try:
+            content_hash = self.file_hash(file_path)
+            blob = encode_artifact(data, self.compress_level)
+            path = self._artifact_path(kind, artifact_key(content_hash, kind, version, options))
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                previous_size = path.stat().st_size
+            except OSError:
+                previous_size = 0
+
+            # Write atomically, other processes may be reading the same artifact
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                # mkstemp creates 0600 files; other service users share the directory
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._remove_file(Path(tmp_path))
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("artifact_write_failed", kind=kind, file_path=file_path, error=str(e))
+            with self._lock:
+                self._errors += 1
+            return
+
+        with self._lock:
+            self._writes += 1
+            self._disk_bytes += len(blob) - previous_size
+            over_budget = self._disk_bytes > self.max_disk_bytes
+
+        if over_budget:
+            self._evict()
+
+    def clear(self) -> None:
+        """Delete all artifacts."""
+        for path in self._iter_artifacts():
+            self._remove_file(path)
+        with self._lock:
+            self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate (%), writes, evictions,
+            errors and disk usage
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "cache_dir": str(self.cache_dir),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total * 100, 2) if total else 0,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "errors": self._errors,
+                "disk_bytes": self._disk_bytes,
+                "disk_mb": round(self._disk_bytes / (1024 * 1024), 2),
+                "max_disk_mb": round(self.max_disk_bytes / (1024 * 1024), 2),
+            }
+
+    def _artifact_path(self, kind: str, key: str) -> Path:
+        """Location of an artifact file: <cache_dir>/<kind>/<key[:2]>/<key>.ifca"""
+        return self.cache_dir / kind / key[:2] / f"{key}{ARTIFACT_SUFFIX}"
+
+    def _iter_artifacts(self):
+        """All artifact files in the cache directory."""
+        return self.cache_dir.rglob(f"*{ARTIFACT_SUFFIX}")
+
+    def _scan_disk_usage(self) -> int:
+        """Total size of all artifact files."""
+        total = 0
+        for path in self._iter_artifacts():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """
+        Delete least recently used artifacts until the cache fits its budget.
+
+        Rescans the directory, since other processes may share it.
+        """
+        entries = []
+        for path in self._iter_artifacts():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * _EVICTION_LOW_WATER
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if self._remove_file(path):
+                total -= size
+                evicted += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self._evictions += evicted
+        logger.info("artifact_cache_evicted", evicted=evicted, disk_bytes=total)
+
+    @staticmethod
+    def _remove_file(path: Path) -> bool:
+        """Delete a file, ignoring files that are already gone."""
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+# Global artifact cache instance (configured from the environment)
+_global_artifact_cache: Optional[ArtifactCache] = None
+_global_artifact_cache_dir: Optional[str] = None
+
+
+def get_global_artifact_cache() -> Optional[ArtifactCache]:
+    """
+    Get the artifact cache configured by the environment.
+
+    IFC_ARTIFACT_CACHE_DIR enables the cache, IFC_ARTIFACT_CACHE_MB sets its
+    disk budget (default: 1024).
+
+    Returns:
+        Global ArtifactCache instance, or None if no cache directory is configured
+    """
+    global _global_artifact_cache, _global_artifact_cache_dir
+
+    cache_dir = os.environ.get("IFC_ARTIFACT_CACHE_DIR")
+    if not cache_dir:
+        return None
+
+    if _global_artifact_cache is None or _global_artifact_cache_dir != cache_dir:
+        max_disk_mb = float(os.environ.get("IFC_ARTIFACT_CACHE_MB", "1024"))
+        _global_artifact_cache = ArtifactCache(cache_dir, max_disk_mb=max_disk_mb)
+        _global_artifact_cache_dir = cache_dir
+
+    return _global_artifact_cache
@@ -5,18 +5,73 @@
 This enables fast property queries from the database instead of parsing IFC files repeatedly.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, Tuple
 from dataclasses import asdict
+from functools import lru_cache
 import sys
 import ifcopenshell
 import ifcopenshell.util.element
 from .cache_manager import IfcCacheManager, get_global_cache
 from .property_extractor import PropertyExtractor
+from .spatial_index import SpatialIndex
+from .change_detection import element_content_hash
+from .step_scanner import StepScanResult, scan_entities
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def resolve_covering_types(type_names: Tuple[str, ...], schema_name: str) -> Tuple[str, ...]:
+    """
+    Reduce a set of IFC types to the minimal set that covers the same entities.
+
+    by_type() includes subtypes, so a requested type whose ancestor is also
+    requested (e.g. IfcFlowTerminal under IfcDistributionElement) would only
+    return entities that are enumerated again through the ancestor.
+    Types that don't exist in the schema are dropped as well.
+
+    Args:
+        type_names: Requested IFC type names
+        schema_name: IFC schema identifier (IFC2X3, IFC4, ...)
+
+    Returns:
+        Sorted tuple of type names with no type being a subtype of another
+    """
+    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema_name)
+
+    declarations = {}
+    for type_name in type_names:
+        try:
+            declarations[type_name] = schema.declaration_by_name(type_name)
+        except RuntimeError:
+            # Entity type doesn't exist in this schema version
+            continue
+
+    requested = set(declarations)
+    covering = []
+    for type_name, declaration in declarations.items():
+        ancestor = declaration.supertype()
+        while ancestor is not None:
+            if ancestor.name() in requested:
+                break
+            ancestor = ancestor.supertype()
+        else:
+            covering.append(type_name)
+
+    return tuple(sorted(covering))
+
+
+def _count_supertypes_in(declaration, type_names: Set[str]) -> int:
+    """Number of names in type_names that are the declaration itself or one of its supertypes."""
+    count = 0
+    while declaration is not None:
+        if declaration.name() in type_names:
+            count += 1
+        declaration = declaration.supertype()
+    return count
+
+
 class BulkElementExtractor:
     """
     Extract all element properties from an IFC file in a single pass.
@@ -33,6 +88,8 @@ class BulkElementExtractor:
     # IFC element types to extract (physical building elements)
     # Note: by_type() returns all subtypes, so we only need parent types
     # e.g., "IfcWall" returns both IfcWall and IfcWallStandardCase
+    # Overlapping entries (e.g. IfcFlowTerminal under IfcDistributionElement) are
+    # removed per schema by resolve_covering_types() before enumeration.
     ELEMENT_TYPES = {
         # Structural elements (parent types only - subtypes are included automatically)
         "IfcWall",  # includes IfcWallStandardCase
@@ -74,6 +131,14 @@ def __init__(self, cache_manager: Optional[IfcCacheManager] = None):
         self.ifc_file: Optional[ifcopenshell.file] = None
         self.cache = cache_manager or get_global_cache()
         self.property_extractor = PropertyExtractor(cache_manager=self.cache)
+        self.enumeration_stats: Dict[str, Any] = {}
+        # Containment index of the loaded file (building/storey/space per element)
+        self.spatial_index: Optional[SpatialIndex] = None
+        # Expected number of elements (from get_element_count_estimate), for progress totals
+        self.element_count_estimate: Optional[int] = None
+
+        # Drop the model and its spatial index when the cache evicts it
+        self.cache.add_release_listener(self._release_file)
 
     def open_file(self, file_path: str) -> None:
         """
@@ -89,11 +154,19 @@ def open_file(self, file_path: str) -> None:
         try:
             self.ifc_file = self.cache.get_or_load(file_path)
             self.property_extractor.ifc_file = self.ifc_file
+            self.spatial_index = None
         except FileNotFoundError:
             raise FileNotFoundError(f"IFC file not found: {file_path}")
         except RuntimeError as e:
             raise RuntimeError(f"Failed to open IFC file: {e}")
 
+    def _release_file(self, ifc_file: ifcopenshell.file) -> None:
+        """Forget a model that left the cache, so it can be freed."""
+        if self.ifc_file is ifc_file:
+            self.ifc_file = None
+        if self.spatial_index is not None and self.spatial_index.ifc_file is ifc_file:
+            self.spatial_index = None
+
     def extract_all_elements(self, file_path: str) -> List[Dict[str, Any]]:
         """
         Extract all element properties from an IFC file.
@@ -109,47 +182,177 @@ def extract_all_elements(self, file_path: str) -> List[Dict[str, Any]]:
                     "element_type": "IfcWall",
                     "name": "Basic Wall:Exterior - Brick on Block:184944",
                     "description": null,
+                    "building_global_id": "1xS3BCk291UvhgP2dvNsgp",
+                    "storey_global_id": "1xS3BCk291UvhgP2a6eflN",
+                    "space_global_id": null,
                     "properties": {
                         "property_sets": {...},
                         "quantities": {...},
                         "type_properties": {...}
-                    }
+                    },
+                    "content_hash": "9f2c..."  # see change_detection.element_content_hash
                 },
                 ...
             ]
         """
         self.open_file(file_path)
 
-        elements = []
+        elements = list(self.iter_elements())
+
+        logger.info("extraction_summary", total_elements=len(elements), file_path=file_path,
+                    duplicates_avoided=self.enumeration_stats.get("duplicates_avoided", 0),
+                    type_pset_cache=self.get_type_pset_cache_stats())
+        return elements
+
+    def iter_elements(self, warnings: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract element data of the loaded file one element at a time.
+
+        Elements are produced as they are extracted, so callers can stream
+        them out without holding the whole result in memory.
+
+        Args:
+            warnings: Optional list that receives a message for every element that failed
+
+        Yields:
+            Element dictionaries (same format as extract_all_elements)
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        self.build_property_index()
+        self.build_spatial_index()
+
         element_count = 0
 
-        # Extract elements by type
-        for element_type in self.ELEMENT_TYPES:
+        # Each entity is visited exactly once
+        for instance in self.iter_element_instances():
             try:
-                instances = self.ifc_file.by_type(element_type)
-
-                for instance in instances:
-                    try:
-                        element_data = self._extract_element_data(instance)
-                        if element_data:
-                            elements.append(element_data)
-                            element_count += 1
-
-                            # Progress logging every 100 elements
-                            if element_count % 100 == 0:
-                                logger.debug("extraction_progress", elements_extracted=element_count)
-                    except Exception as e:
-                        # Skip individual elements that fail to extract
-                        element_id = instance.GlobalId if hasattr(instance, 'GlobalId') else 'unknown'
-                        logger.warning("element_extraction_failed", element_id=element_id, error=str(e))
-                        continue
-
+                element_data = self._extract_element_data(instance)
             except Exception as e:
-                # Skip element types that don't exist in this IFC schema
+                # Skip individual elements that fail to extract
+                element_id = instance.GlobalId if hasattr(instance, 'GlobalId') else 'unknown'
+                logger.warning("element_extraction_failed", element_id=element_id, error=str(e))
+                if warnings is not None:
+                    warnings.append(f"Failed to extract element {element_id}: {str(e)}")
                 continue
 
-        logger.info("extraction_summary", total_elements=element_count, file_path=file_path)
-        return elements
+            if element_data:
+                element_count += 1
+
+                # Progress logging every 100 elements
+                if element_count % 100 == 0:
+                    logger.debug("extraction_progress", elements_extracted=element_count,
+                                 total=self.element_count_estimate)
+
+                yield element_data
+
+    def build_property_index(self) -> Dict[str, int]:
+        """
+        Build the property set relationship index for the loaded file.
+
+        One linear scan over IfcRelDefinesByProperties / IfcRelDefinesByType
+        replaces the per-element inverse traversal of get_psets().
+
+        Returns:
+            Index statistics
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        return self.property_extractor.build_property_index().get_stats()
+
+    def build_spatial_index(self) -> Dict[str, int]:
+        """
+        Build the containment index for the loaded file.
+
+        One linear scan over the aggregation, containment and opening
+        relationships gives every element its building, storey and space.
+
+        Returns:
+            Index statistics
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        if not self.ifc_file:
+            raise RuntimeError("No IFC file loaded. Call open_file() first.")
+
+        if self.spatial_index is None or self.spatial_index.ifc_file is not self.ifc_file:
+            self.spatial_index = SpatialIndex(self.ifc_file)
+        return self.spatial_index.get_stats()
+
+    def get_type_pset_cache_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss statistics of the shared type-object property set cache.
+
+        Returns:
+            Dictionary with hits, misses and number of cached types
+        """
+        return self.property_extractor.get_type_pset_cache_stats()
+
+    def resolve_element_types(self, element_types: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        """
+        Resolve element types against the loaded file's schema into a minimal covering set.
+
+        Args:
+            element_types: Types to resolve (default: ELEMENT_TYPES)
+
+        Returns:
+            Sorted tuple of non-overlapping type names present in the schema
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        if not self.ifc_file:
+            raise RuntimeError("No IFC file loaded. Call open_file() first.")
+
+        requested = tuple(sorted(set(element_types if element_types is not None else self.ELEMENT_TYPES)))
+        return resolve_covering_types(requested, self.ifc_file.schema)
+
+    def iter_element_instances(self, element_types: Optional[Iterable[str]] = None) -> Iterator[ifcopenshell.entity_instance]:
+        """
+        Enumerate element instances of the loaded file, each exactly once.
+
+        Updates enumeration_stats with the resolved types, the number of
+        instances and the number of duplicate visits avoided compared to
+        calling by_type() for every requested type.
+
+        Args:
+            element_types: Types to enumerate (default: ELEMENT_TYPES)
+
+        Yields:
+            IFC element instances
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        requested = set(element_types if element_types is not None else self.ELEMENT_TYPES)
+        covering = self.resolve_element_types(requested)
+        dropped = requested.difference(covering)
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(self.ifc_file.schema)
+
+        self.enumeration_stats = {
+            "requested_types": len(requested),
+            "resolved_types": list(covering),
+            "instances": 0,
+            "duplicates_avoided": 0,
+        }
+
+        # Every instance would also have been enumerated once per dropped (covered)
+        # type it belongs to; counted per class during the single enumeration
+        dropped_per_class: Dict[str, int] = {}
+        for element_type in covering:
+            for instance in self.ifc_file.by_type(element_type):
+                class_name = instance.is_a()
+                duplicates = dropped_per_class.get(class_name)
+                if duplicates is None:
+                    duplicates = dropped_per_class[class_name] = _count_supertypes_in(
+                        schema.declaration_by_name(class_name), dropped
+                    )
+                self.enumeration_stats["instances"] += 1
+                self.enumeration_stats["duplicates_avoided"] += duplicates
+                yield instance
 
     def _extract_element_data(self, element: ifcopenshell.entity_instance) -> Optional[Dict[str, Any]]:
         """
@@ -169,7 +372,7 @@ def _extract_element_data(self, element: ifcopenshell.entity_instance) -> Option
 
         # Extract properties using the property extractor
         try:
-            props_obj = self.property_extractor.extract_properties(global_id)
+            props_obj = self.property_extractor.extract_element_properties(element)
             # Convert dataclass to dictionary
             properties = asdict(props_obj)
         except Exception as e:
@@ -180,31 +383,59 @@ def _extract_element_data(self, element: ifcopenshell.entity_instance) -> Option
         if not properties:
             return None
 
-        return {
+        if self.spatial_index is None:
+            self.build_spatial_index()
+        location = self.spatial_index.get_spatial_location(element)
+
+        element_data = {
             "global_id": global_id,
             "element_type": element.is_a(),
             "name": element.Name if hasattr(element, "Name") else None,
             "description": element.Description if hasattr(element, "Description") else None,
+            # Denormalized location, so filtering by storey doesn't need the spatial tree
+            "building_global_id": location["building"],
+            "storey_global_id": location["storey"],
+            "space_global_id": location["space"],
             "properties": properties
         }
 
+        # Stable fingerprint for change detection between revisions
+        element_data["content_hash"] = element_content_hash(element_data)
+
+        return element_data
+
     def get_element_count_estimate(self, file_path: str) -> int:
         """
         Get estimated count of elements that will be extracted.
 
+        Counts instance definitions with the raw STEP scanner instead of
+        parsing the model, so it is cheap to call before extraction (e.g. for
+        progress totals). Every entity is counted once, like iter_element_instances().
+
         Args:
             file_path: Path to the IFC file
 
         Returns:
             Estimated number of elements
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If the file is not an IFC-SPF file
         """
-        self.open_file(file_path)
+        self.element_count_estimate = self.count_elements(scan_entities(file_path))
+        return self.element_count_estimate
 
-        total = 0
-        for element_type in self.ELEMENT_TYPES:
-            try:
-                total += len(self.ifc_file.by_type(element_type))
-            except Exception:
-                continue
+    def count_elements(self, scan: StepScanResult, element_types: Optional[Iterable[str]] = None) -> int:
+        """
+        Count the elements of a scanned file that extraction would visit.
+
+        Args:
+            scan: Result of step_scanner.scan_entities()
+            element_types: Types to count (default: ELEMENT_TYPES)
 
-        return total
+        Returns:
+            Number of element instances
+        """
+        requested = tuple(sorted(set(element_types if element_types is not None else self.ELEMENT_TYPES)))
+        covering = resolve_covering_types(requested, scan.schema)
+        return sum(scan.rollups.get(element_type, 0) for element_type in covering)
@@ -4,6 +4,36 @@
 Provides LRU (Least Recently Used) caching for loaded IFC files.
 Keeps frequently accessed IFC files in RAM to avoid repeated parsing.
 
+Besides the entry count limit, the cache can be bounded by a memory budget.
+A parsed model needs several times its file size in RAM, so the resident
+footprint of each entry is estimated when it is loaded (RSS growth during the
+load, but never less than file size × memory_factor) and least recently used
+entries are evicted until the estimated total fits the budget.
+
+Entries are keyed by a file fingerprint instead of the path: device, inode,
+mtime and size, or optionally a BLAKE2b hash of the file content. A file
+replaced at the same path is detected on the next access and reloaded, and
+with content hashing identical files under different paths share one entry.
+
+The cache is thread-safe. Concurrent requests for a file that is not cached
+yet are coalesced into one load (single flight); the other requests wait for
+it instead of parsing the same file again. Different files load in parallel.
+
+Which entry is evicted, and whether a new file is cached at all, is decided
+by a pluggable policy (see cache_policy: lru, lfu, cost). Every request can be
+appended to an NDJSON access trace for replaying against other policies.
+
+A model the policy refuses to cache is still handed to the caller, and kept
+in a weak "pinned" map: as long as the request that loaded it holds the model,
+further requests for the same file get it from there instead of parsing it
+again. The pinned model is not counted against the budget and is freed with
+the last reference outside the cache.
+
+Long-lived extractors keep the model they worked on (plus indexes built on
+it) between requests. They register a release listener, which is called
+whenever an entry leaves the cache, so that they drop those references and
+the evicted model is actually freed.
+
 License: MIT (our code) + LGPL (IfcOpenShell library)
 """
 
@@ -11,44 +41,146 @@
 import time
 import os
 import sys
-from typing import Optional, Dict
+import json
+import hashlib
+import threading
+import weakref
+from typing import Callable, Optional, Dict, List, Tuple, Union
 from collections import OrderedDict
 
+from .cache_policy import CachePolicy, create_policy
+
+
+# Parsed model size relative to the IFC file size (measured ~7x on Duplex.ifc)
+DEFAULT_MEMORY_FACTOR = 8.0
+
+# Read size for content hashing
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_resident_memory_bytes() -> Optional[int]:
+    """
+    Get the resident set size of the current process.
+
+    Returns:
+        RSS in bytes, or None if it cannot be determined on this platform
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def hash_file_content(file_path: str) -> str:
+    """
+    Compute a fast content hash of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        BLAKE2b hex digest (128 bit)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _PendingLoad:
+    """A load in progress that concurrent requests for the same file wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[ifcopenshell.file] = None
+        self.error: Optional[BaseException] = None
+
 
 class IfcCacheManager:
     """
     LRU cache for loaded IFC files.
 
     Keeps frequently accessed IFC files in RAM to avoid repeated parsing.
-    Implements LRU eviction when cache is full.
+    Evicts by the configured policy (LRU by default) when cache is full or
+    over its memory budget. Entries are keyed by file fingerprint, so changed
+    files are reloaded.
     """
 
-    def __init__(self, max_size: int = 10, ttl_hours: int = 24):
+    def __init__(
+        self,
+        max_size: int = 10,
+        ttl_hours: int = 24,
+        max_memory_mb: Optional[float] = None,
+        memory_factor: float = DEFAULT_MEMORY_FACTOR,
+        hash_content: bool = False,
+        policy: Union[str, CachePolicy] = "lru",
+        trace_path: Optional[str] = None
+    ):
         """
         Initialize cache manager.
 
         Args:
             max_size: Maximum number of files to cache (default: 10)
             ttl_hours: Time-to-live in hours (default: 24)
+            max_memory_mb: Memory budget for parsed files in MB (default: None = no budget)
+            memory_factor: Minimum estimated RAM per byte of IFC file (default: 8.0)
+            hash_content: Key entries by content hash, sharing them across paths
+                          with identical content (default: False = stat fingerprint)
+            policy: Eviction/admission policy name ('lru', 'lfu', 'cost') or instance (default: 'lru')
+            trace_path: Append one NDJSON record per request to this file (default: None)
+
+        Raises:
+            ValueError: If the policy name is unknown
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_hours * 3600
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        self.memory_factor = memory_factor
+        self.hash_content = hash_content
+        self.policy = create_policy(policy)
+        self.trace_path = trace_path
 
-        # OrderedDict for LRU behavior
+        # Insertion/access order, keyed by fingerprint key (the policy picks victims)
         self._cache: OrderedDict[str, ifcopenshell.file] = OrderedDict()
         self._access_times: Dict[str, float] = {}
         self._file_sizes: Dict[str, int] = {}
+        self._memory_estimates: Dict[str, int] = {}
+
+        # key -> paths served from the entry; path -> (stat signature, key)
+        self._entry_paths: Dict[str, List[str]] = {}
+        self._path_keys: Dict[str, Tuple[tuple, str]] = {}
+
+        # Guards all state above; parsing itself runs outside the lock
+        self._lock = threading.RLock()
+        # key -> load in progress (single flight)
+        self._in_flight: Dict[str, _PendingLoad] = {}
+        # key -> model the policy did not admit, alive while a request still uses it
+        self._pinned: "weakref.WeakValueDictionary[str, ifcopenshell.file]" = weakref.WeakValueDictionary()
+        # Callbacks notified when a model leaves the cache (weak, see add_release_listener)
+        self._release_listeners: List[weakref.ref] = []
 
         # Statistics
         self._hits = 0
         self._misses = 0
+        self._coalesced = 0
+        self._pinned_hits = 0
         self._evictions = 0
+        self._rejected_admissions = 0
+        self._invalidations = 0
+        self._hits_by_kind = {"path": 0, "content": 0}
+        self._misses_by_kind = {"new": 0, "changed": 0, "expired": 0}
 
     def get_or_load(self, file_path: str) -> ifcopenshell.file:
         """
         Get IFC file from cache or load if not cached.
 
-        Implements LRU eviction when cache is full.
+        Implements LRU eviction when cache is full. If the file changed since it
+        was cached (different mtime/size/inode), the stale entry is invalidated.
+
+        Thread-safe: concurrent requests for the same file wait for a single
+        load (single flight), while loads of different files run in parallel.
 
         Args:
             file_path: Absolute path to IFC file
@@ -62,67 +194,130 @@ def get_or_load(self, file_path: str) -> ifcopenshell.file:
         """
         current_time = time.time()
 
-        # Check if in cache
-        if file_path in self._cache:
-            # Check TTL
-            if current_time - self._access_times[file_path] < self.ttl_seconds:
-                # Move to end (most recently used)
-                self._cache.move_to_end(file_path)
-                self._access_times[file_path] = current_time
-                self._hits += 1
+        # Check file exists
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+                self._misses_by_kind["new"] += 1
+            self._log_cache_event("MISS", file_path)
+            raise FileNotFoundError(f"IFC file not found: {file_path}")
 
-                # Log cache hit
-                self._log_cache_event("HIT", file_path)
+        signature = self._stat_signature(stat)
+        with self._lock:
+            key = self._known_key(file_path, signature)
+
+        # Hashing reads the whole file, don't hold the lock meanwhile
+        if key is None:
+            key = self._compute_key(file_path, signature)
+
+        with self._lock:
+            changed = self._bind_path(file_path, signature, key)
+            self.policy.record_access(key)
+
+            # Check if in cache
+            expired = False
+            if key in self._cache:
+                # Check TTL
+                if current_time - self._access_times[key] < self.ttl_seconds:
+                    return self._hit(key, file_path, current_time)
 
-                return self._cache[file_path]
-            else:
                 # Expired, remove
                 self._log_cache_event("EXPIRED", file_path)
-                del self._cache[file_path]
-                del self._access_times[file_path]
-                del self._file_sizes[file_path]
-
-        # Not in cache or expired - load file
-        self._misses += 1
-        self._log_cache_event("MISS", file_path)
+                self._drop(key)
+                expired = True
+
+            # Not admitted, but still in use by the request that loaded it
+            pinned = self._pinned.get(key)
+            if pinned is not None:
+                self._pinned_hits += 1
+                self._record_trace("pinned", key, file_path, stat.st_size)
+                self._log_cache_event("PINNED", file_path)
+                return pinned
+
+            # Another thread is already loading this file: wait for it
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = _PendingLoad()
+                self._in_flight[key] = pending
+                is_loader = True
+
+                self._misses += 1
+                self._misses_by_kind["expired" if expired else "changed" if changed else "new"] += 1
+
+                # Make room before loading, so old and new models don't peak together
+                if self._would_admit(key, stat.st_size, None):
+                    self._evict_to_fit(self._estimate_from_file_size(stat.st_size))
+            else:
+                is_loader = False
+                self._coalesced += 1
+                self._record_trace("coalesced", key, file_path, stat.st_size)
 
-        # Check file exists
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"IFC file not found: {file_path}")
+        if not is_loader:
+            self._log_cache_event("COALESCED", file_path)
+            return self._wait_for(pending, key, file_path)
 
-        # Load file
+        self._log_cache_event("MISS", file_path)
         try:
-            ifc_file = ifcopenshell.open(file_path)
-        except Exception as e:
-            raise RuntimeError(f"Failed to open IFC file: {str(e)}")
-
-        # Get file size
-        file_size = os.path.getsize(file_path)
+            ifc_file, memory_estimate, load_seconds = self._load(file_path, stat.st_size)
+        except BaseException as e:
+            # Also on KeyboardInterrupt/SystemExit: waiters must not block forever
+            with self._lock:
+                del self._in_flight[key]
+            pending.error = e
+            pending.done.set()
+            raise
+
+        with self._lock:
+            admitted = self._insert(key, file_path, signature, ifc_file, stat.st_size,
+                                    memory_estimate, load_seconds, current_time)
+            del self._in_flight[key]
+            self._record_trace("miss", key, file_path, stat.st_size, memory_estimate, load_seconds)
+        pending.result = ifc_file
+        pending.done.set()
+
+        self._log_cache_event("LOAD" if admitted else "REJECTED", file_path, key)
 
-        # Evict oldest if cache full
-        if len(self._cache) >= self.max_size:
-            oldest_key = next(iter(self._cache))
-            self._log_cache_event("EVICT", oldest_key)
+        return ifc_file
 
-            del self._cache[oldest_key]
-            del self._access_times[oldest_key]
-            del self._file_sizes[oldest_key]
-            self._evictions += 1
+    def add_release_listener(self, callback: Callable[[ifcopenshell.file], None]) -> None:
+        """
+        Register a callback that is called with every model leaving the cache.
 
-        # Add to cache
-        self._cache[file_path] = ifc_file
-        self._access_times[file_path] = current_time
-        self._file_sizes[file_path] = file_size
+        The cache is often global and outlives the objects using it, so bound
+        methods are referenced weakly: registering doesn't keep the owner alive.
+        The callback runs while the cache lock is held and must not call back
+        into the cache.
 
-        self._log_cache_event("LOAD", file_path)
+        Args:
+            callback: Function or bound method taking the released ifcopenshell.file
+        """
+        if hasattr(callback, "__self__"):
+            reference = weakref.WeakMethod(callback)
+        else:
+            # Plain functions are kept alive
+            def reference():
+                return callback
 
-        return ifc_file
+        with self._lock:
+            self._release_listeners = [ref for ref in self._release_listeners if ref() is not None]
+            self._release_listeners.append(reference)
 
     def clear(self):
         """Clear entire cache."""
-        self._cache.clear()
-        self._access_times.clear()
-        self._file_sizes.clear()
+        with self._lock:
+            released = list(self._cache.values())
+            self._cache.clear()
+            self._access_times.clear()
+            self._file_sizes.clear()
+            self._memory_estimates.clear()
+            self._entry_paths.clear()
+            self._path_keys.clear()
+            self._pinned.clear()
+            self.policy.clear()
+            for ifc_file in released:
+                self._notify_release(ifc_file)
 
         self._log_cache_event("CLEAR", "all")
 
@@ -130,15 +325,18 @@ def remove(self, file_path: str):
         """
         Remove specific file from cache.
 
+        Paths sharing the entry through identical content are removed as well.
+
         Args:
             file_path: Path to file to remove
         """
-        if file_path in self._cache:
-            del self._cache[file_path]
-            del self._access_times[file_path]
-            del self._file_sizes[file_path]
+        with self._lock:
+            known = self._path_keys.get(file_path)
+            if known is None or known[1] not in self._cache:
+                return
+            self._drop(known[1])
 
-            self._log_cache_event("REMOVE", file_path)
+        self._log_cache_event("REMOVE", file_path)
 
     def get_stats(self) -> dict:
         """
@@ -147,32 +345,338 @@ def get_stats(self) -> dict:
         Returns:
             Dictionary with cache statistics
         """
-        total_requests = self._hits + self._misses
-        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+        with self._lock:
+            total_requests = self._hits + self._misses + self._coalesced + self._pinned_hits
+            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+
+            total_size_bytes = sum(self._file_sizes.values())
+            total_size_mb = total_size_bytes / (1024 * 1024)
+            resident_bytes = self.get_estimated_resident_bytes()
+
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "pinned_hits": self._pinned_hits,
+                "in_flight": len(self._in_flight),
+                "hits_by_kind": dict(self._hits_by_kind),
+                "misses_by_kind": dict(self._misses_by_kind),
+                "evictions": self._evictions,
+                "rejected_admissions": self._rejected_admissions,
+                "invalidations": self._invalidations,
+                "policy": self.policy.name,
+                "hit_rate": round(hit_rate, 2),
+                "total_requests": total_requests,
+                "cached_files": [path for key in self._cache for path in self._entry_paths[key]],
+                "content_hashing": self.hash_content,
+                "total_size_mb": round(total_size_mb, 2),
+                "estimated_resident_bytes": resident_bytes,
+                "estimated_resident_mb": round(resident_bytes / (1024 * 1024), 2),
+                "max_memory_mb": round(self.max_memory_bytes / (1024 * 1024), 2) if self.max_memory_bytes else None,
+                "ttl_hours": self.ttl_seconds / 3600
+            }
+
+    def get_estimated_resident_bytes(self) -> int:
+        """
+        Get the estimated RAM used by all cached files.
+
+        Returns:
+            Sum of the per-file memory estimates in bytes
+        """
+        with self._lock:
+            return sum(self._memory_estimates.values())
+
+    def _hit(self, key: str, file_path: str, current_time: float) -> ifcopenshell.file:
+        """Serve a cached entry (caller holds the lock)."""
+        # Same path as before, or another path with identical content
+        kind = "path" if file_path in self._entry_paths[key] else "content"
+        if kind == "content":
+            self._entry_paths[key].append(file_path)
+
+        # Move to end (most recently used)
+        self._cache.move_to_end(key)
+        self.policy.on_hit(key)
+        self._access_times[key] = current_time
+        self._hits += 1
+        self._hits_by_kind[kind] += 1
+        self._record_trace("hit", key, file_path, self._file_sizes[key], self._memory_estimates[key])
+
+        # Log cache hit
+        self._log_cache_event("HIT", file_path)
+
+        return self._cache[key]
+
+    def _wait_for(self, pending: "_PendingLoad", key: str, file_path: str) -> ifcopenshell.file:
+        """Wait for a load started by another thread and share its result."""
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+
+        with self._lock:
+            paths = self._entry_paths.get(key)
+            if paths is not None and file_path not in paths:
+                paths.append(file_path)
+
+        return pending.result
+
+    def _load(self, file_path: str, file_size: int) -> Tuple[ifcopenshell.file, int, float]:
+        """
+        Parse a file without holding the lock.
+
+        Args:
+            file_path: Path to the IFC file
+            file_size: Size of the file in bytes
+
+        Returns:
+            Tuple of (opened file, estimated memory footprint in bytes, load time in seconds)
+
+        Raises:
+            RuntimeError: If file cannot be opened
+        """
+        rss_before = get_resident_memory_bytes()
+        load_start = time.time()
+        try:
+            ifc_file = ifcopenshell.open(file_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to open IFC file: {str(e)}")
+        load_seconds = time.time() - load_start
+        return ifc_file, self._estimate_memory(file_size, rss_before), load_seconds
+
+    def _insert(
+        self,
+        key: str,
+        file_path: str,
+        signature: tuple,
+        ifc_file: ifcopenshell.file,
+        file_size: int,
+        memory_estimate: int,
+        load_seconds: float,
+        current_time: float
+    ) -> bool:
+        """
+        Add a loaded file, evicting by count and memory budget (caller holds the lock).
+
+        Returns:
+            False if the policy refused to evict for the file (it is only pinned)
+        """
+        if not self._would_admit(key, file_size, load_seconds, memory_estimate):
+            self._rejected_admissions += 1
+            self._pinned[key] = ifc_file
+            return False
+
+        self._pinned.pop(key, None)
+
+        # Evict if cache full
+        while self._cache and len(self._cache) >= self.max_size:
+            self._evict_one()
+
+        # Evict by memory budget using the measured estimate
+        self._evict_to_fit(memory_estimate)
+
+        # Add to cache
+        self._cache[key] = ifc_file
+        self._access_times[key] = current_time
+        self._file_sizes[key] = file_size
+        self._memory_estimates[key] = memory_estimate
+        self._entry_paths[key] = [file_path]
+        self._path_keys[file_path] = (signature, key)
+        self.policy.on_insert(key, file_size, load_seconds)
+        return True
+
+    def _would_admit(
+        self,
+        key: str,
+        file_size: int,
+        load_seconds: Optional[float],
+        memory_estimate: Optional[int] = None
+    ) -> bool:
+        """Check whether a new file may evict entries for its place (caller holds the lock)."""
+        if not self._cache:
+            return True
+
+        if memory_estimate is None:
+            memory_estimate = self._estimate_from_file_size(file_size)
+
+        needs_room = len(self._cache) >= self.max_size or (
+            self.max_memory_bytes is not None
+            and self.get_estimated_resident_bytes() + memory_estimate > self.max_memory_bytes
+        )
+        if not needs_room:
+            return True
+
+        return self.policy.should_admit(key, file_size, load_seconds, self.policy.victim())
+
+    def _known_key(self, file_path: str, signature: tuple) -> Optional[str]:
+        """Cache key of a path whose stat signature is unchanged, else None (caller holds the lock)."""
+        known = self._path_keys.get(file_path)
+        if known is not None and known[0] == signature:
+            return known[1]
+        return None
+
+    def _compute_key(self, file_path: str, signature: tuple) -> str:
+        """
+        Compute the cache key of a file.
 
-        total_size_bytes = sum(self._file_sizes.values())
-        total_size_mb = total_size_bytes / (1024 * 1024)
+        The content hash is only computed when the path is new or its stat
+        signature changed, so unchanged files cost one stat() per access.
+
+        Args:
+            file_path: Path to the IFC file
+            signature: Current stat signature of the file
+
+        Returns:
+            Cache key
+        """
+        if self.hash_content:
+            return f"blake2b:{hash_file_content(file_path)}"
+        return "stat:" + ":".join(str(value) for value in signature)
 
-        return {
-            "size": len(self._cache),
-            "max_size": self.max_size,
-            "hits": self._hits,
-            "misses": self._misses,
-            "evictions": self._evictions,
-            "hit_rate": round(hit_rate, 2),
-            "total_requests": total_requests,
-            "cached_files": list(self._cache.keys()),
-            "total_size_mb": round(total_size_mb, 2),
-            "ttl_hours": self.ttl_seconds / 3600
-        }
+    def _bind_path(self, file_path: str, signature: tuple, key: str) -> bool:
+        """
+        Point a path at its current cache key, invalidating the old entry if the file changed.
+
+        Caller holds the lock.
+
+        Returns:
+            Whether the file changed since it was last seen
+        """
+        known = self._path_keys.get(file_path)
+
+        # A touched file with identical content keeps its entry
+        changed = known is not None and known[1] != key
+        if changed:
+            self._invalidate_path(file_path, known[1])
+
+        self._path_keys[file_path] = (signature, key)
+        return changed
+
+    def _invalidate_path(self, file_path: str, key: str):
+        """Detach a changed file from its old entry; drop the entry if no path uses it anymore."""
+        paths = self._entry_paths.get(key)
+        if paths is None:
+            return
+
+        if file_path in paths:
+            paths.remove(file_path)
+        if not paths:
+            self._log_cache_event("INVALIDATED", file_path)
+            self._drop(key)
+            self._invalidations += 1
+
+    @staticmethod
+    def _stat_signature(stat: os.stat_result) -> tuple:
+        """Fingerprint of a file that changes whenever the file is rewritten or replaced."""
+        return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _entry_name(self, key: str) -> str:
+        """First path of an entry (for logging)."""
+        paths = self._entry_paths.get(key)
+        return paths[0] if paths else key
+
+    def _estimate_from_file_size(self, file_size: int) -> int:
+        """Estimate the parsed size of a file from its size on disk."""
+        return int(file_size * self.memory_factor)
+
+    def _estimate_memory(self, file_size: int, rss_before: Optional[int]) -> int:
+        """
+        Estimate the resident footprint of a just-loaded file.
 
-    def _log_cache_event(self, event: str, file_path: str):
+        RSS growth underestimates when the allocator reuses memory freed by
+        earlier evictions, so the file-size estimate acts as a lower bound.
+
+        Args:
+            file_size: Size of the IFC file in bytes
+            rss_before: Process RSS before loading (None if unavailable)
+
+        Returns:
+            Estimated footprint in bytes
+        """
+        estimate = self._estimate_from_file_size(file_size)
+
+        rss_after = get_resident_memory_bytes()
+        if rss_before is not None and rss_after is not None:
+            estimate = max(estimate, rss_after - rss_before)
+
+        return estimate
+
+    def _evict_to_fit(self, required_bytes: int):
+        """
+        Evict files chosen by the policy until required_bytes fits into the memory budget.
+
+        Args:
+            required_bytes: Estimated footprint of the file about to be added
+        """
+        if self.max_memory_bytes is None:
+            return
+
+        while self._cache and self.get_estimated_resident_bytes() + required_bytes > self.max_memory_bytes:
+            self._evict_one()
+
+    def _evict_one(self):
+        """Evict the policy's victim (caller holds the lock)."""
+        victim = self.policy.victim()
+        self._log_cache_event("EVICT", self._entry_name(victim))
+        self._drop(victim, evicted=True)
+        self._evictions += 1
+
+    def _drop(self, key: str, evicted: bool = False):
+        """Remove an entry, its bookkeeping and the path mappings pointing at it."""
+        ifc_file = self._cache.pop(key)
+        del self._access_times[key]
+        del self._file_sizes[key]
+        del self._memory_estimates[key]
+        self.policy.on_remove(key, evicted=evicted)
+
+        for path in self._entry_paths.pop(key, []):
+            known = self._path_keys.get(path)
+            if known is not None and known[1] == key:
+                del self._path_keys[path]
+
+        self._notify_release(ifc_file)
+
+    def _notify_release(self, ifc_file: ifcopenshell.file):
+        """Call the release listeners for a model leaving the cache (caller holds the lock)."""
+        alive = []
+        for reference in self._release_listeners:
+            callback = reference()
+            if callback is None:
+                continue
+            alive.append(reference)
+            callback(ifc_file)
+        self._release_listeners = alive
+
+    def _record_trace(
+        self,
+        event: str,
+        key: str,
+        file_path: str,
+        file_size: int,
+        memory_estimate: Optional[int] = None,
+        load_seconds: Optional[float] = None
+    ):
+        """Append one request to the access trace (caller holds the lock)."""
+        if self.trace_path is None:
+            return
+
+        record = {"t": round(time.time(), 3), "event": event, "key": key, "path": file_path, "size": file_size}
+        if memory_estimate is not None:
+            record["memory"] = memory_estimate
+        if load_seconds is not None:
+            record["load_ms"] = round(load_seconds * 1000, 1)
+
+        with open(self.trace_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _log_cache_event(self, event: str, file_path: str, key: Optional[str] = None):
         """
         Log cache event (for debugging).
 
         Args:
             event: Event type (HIT, MISS, LOAD, EVICT, etc.)
             file_path: File path involved
+            key: Cache key of the entry (for LOAD)
         """
         # Simple console logging
         # In production, use proper logging framework
@@ -183,12 +687,21 @@ def _log_cache_event(self, event: str, file_path: str):
         elif event == "MISS":
             print(f"[Cache] ✗ MISS: {filename}", file=sys.stderr)
         elif event == "LOAD":
-            size_mb = self._file_sizes.get(file_path, 0) / (1024 * 1024)
-            print(f"[Cache] ⇧ LOAD: {filename} ({size_mb:.2f} MB)", file=sys.stderr)
+            size_mb = self._file_sizes.get(key, 0) / (1024 * 1024)
+            memory_mb = self._memory_estimates.get(key, 0) / (1024 * 1024)
+            print(f"[Cache] ⇧ LOAD: {filename} ({size_mb:.2f} MB, ~{memory_mb:.2f} MB in RAM)", file=sys.stderr)
+        elif event == "REJECTED":
+            print(f"[Cache] ⊘ REJECTED: {filename} (not cached, policy kept existing entries)", file=sys.stderr)
         elif event == "EVICT":
             print(f"[Cache] ⇩ EVICT: {filename}", file=sys.stderr)
         elif event == "EXPIRED":
             print(f"[Cache] ⏱ EXPIRED: {filename}", file=sys.stderr)
+        elif event == "PINNED":
+            print(f"[Cache] ⚲ PINNED: {filename} (not cached, reusing the model of a running request)", file=sys.stderr)
+        elif event == "COALESCED":
+            print(f"[Cache] ⇆ COALESCED: {filename} (waiting for load in progress)", file=sys.stderr)
+        elif event == "INVALIDATED":
+            print(f"[Cache] ↻ INVALIDATED: {filename} (file changed)", file=sys.stderr)
         elif event == "CLEAR":
             print(f"[Cache] 🗑 CLEAR: all files", file=sys.stderr)
         elif event == "REMOVE":
@@ -199,13 +712,22 @@ def _log_cache_event(self, event: str, file_path: str):
 _global_cache: Optional[IfcCacheManager] = None
 
 
-def get_global_cache(max_size: int = 10, ttl_hours: int = 24) -> IfcCacheManager:
+def get_global_cache(
+    max_size: int = 10,
+    ttl_hours: int = 24,
+    max_memory_mb: Optional[float] = None,
+    hash_content: bool = False,
+    policy: str = "lru"
+) -> IfcCacheManager:
     """
     Get or create global cache instance.
 
     Args:
         max_size: Maximum number of files to cache (default: 10)
         ttl_hours: Time-to-live in hours (default: 24)
+        max_memory_mb: Memory budget for parsed files in MB (default: None = no budget)
+        hash_content: Key entries by content hash (default: False = stat fingerprint)
+        policy: Eviction/admission policy name (default: 'lru')
 
     Returns:
         Global IfcCacheManager instance
@@ -213,6 +735,12 @@ def get_global_cache(max_size: int = 10, ttl_hours: int = 24) -> IfcCacheManager
     global _global_cache
 
     if _global_cache is None:
-        _global_cache = IfcCacheManager(max_size=max_size, ttl_hours=ttl_hours)
+        _global_cache = IfcCacheManager(
+            max_size=max_size,
+            ttl_hours=ttl_hours,
+            max_memory_mb=max_memory_mb,
+            hash_content=hash_content,
+            policy=policy
+        )
 
     return _global_cache
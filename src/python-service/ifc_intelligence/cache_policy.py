@@ -0,0 +1,341 @@
+"""
+IFC Cache Eviction and Admission Policies
+
+Pluggable policies deciding which parsed model IfcCacheManager evicts and
+whether a newly loaded model is admitted at all:
+
+- lru:  Least recently used (default, previous behaviour)
+- lfu:  Frequency-based with TinyLFU-style admission. Access counts are kept
+        for recently seen files even after eviction and halved periodically.
+        A new file only replaces the eviction victim if it was requested more
+        often, so a one-off scan over many old revisions cannot flush the
+        models viewers keep coming back to.
+- cost: GreedyDual-style priority frequency × parse cost, with parse cost =
+        load time × file size. Cheap models are evicted before expensive ones;
+        priorities age so formerly hot models eventually leave.
+
+replay_trace() runs a policy against a recorded access trace without loading
+any files, for comparing hit rates (see scripts/benchmark_cache_policies.py).
+
+License: MIT
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+
+# Fallback parse throughput for cost estimates when the load time is not known yet
+_ESTIMATED_SECONDS_PER_MB = 0.5
+
+
+class CachePolicy(ABC):
+    """
+    Base class of cache policies.
+
+    The cache calls record_access() for every request, on_insert()/on_hit()/
+    on_remove() to keep the policy in sync with its entries, victim() to pick
+    the entry to evict and should_admit() before evicting for a new entry.
+    Subclasses must implement on_insert(), on_remove(), victim() and clear().
+    """
+
+    name = "base"
+
+    def record_access(self, key: str) -> None:
+        """Record a request for key (hit or miss)."""
+
+    @abstractmethod
+    def on_insert(self, key: str, size_bytes: int, load_seconds: float) -> None:
+        """Track a newly cached entry."""
+
+    def on_hit(self, key: str) -> None:
+        """Update a cached entry on a cache hit."""
+
+    @abstractmethod
+    def on_remove(self, key: str, evicted: bool = False) -> None:
+        """
+        Stop tracking an entry.
+
+        Args:
+            key: Cache key
+            evicted: True if the entry was chosen by victim(), False for explicit removal/expiry
+        """
+
+    @abstractmethod
+    def victim(self) -> str:
+        """Pick the cached entry to evict next."""
+
+    def should_admit(self, key: str, size_bytes: int, load_seconds: Optional[float], victim: str) -> bool:
+        """
+        Decide whether a new entry may replace victim.
+
+        Args:
+            key: Key of the candidate entry
+            size_bytes: File size of the candidate
+            load_seconds: Measured parse time (None before loading)
+            victim: Key the cache would evict for it
+
+        Returns:
+            True to evict victim and cache the candidate
+        """
+        return True
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget all cached entries (access history may be kept)."""
+
+
+class LruPolicy(CachePolicy):
+    """Evict the least recently used entry; admit everything."""
+
+    name = "lru"
+
+    def __init__(self):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def on_insert(self, key: str, size_bytes: int, load_seconds: float) -> None:
+        self._order[key] = None
+
+    def on_hit(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def on_remove(self, key: str, evicted: bool = False) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LfuPolicy(CachePolicy):
+    """
+    Evict the least frequently used entry and only admit entries used more often than the victim.
+
+    Frequencies are remembered for up to history_size keys (including evicted
+    ones) and halved every aging_interval requests, so old popularity fades.
+    """
+
+    name = "lfu"
+
+    def __init__(self, history_size: int = 1000, aging_interval: int = 10000):
+        """
+        Initialize the policy.
+
+        Args:
+            history_size: Number of keys whose access count is remembered
+            aging_interval: Requests between halving all access counts
+        """
+        self.history_size = history_size
+        self.aging_interval = aging_interval
+
+        # key -> access count, in order of last access (for trimming)
+        self._frequency: OrderedDict[str, int] = OrderedDict()
+        # Cached keys in order of last access (tie-breaker)
+        self._resident: OrderedDict[str, None] = OrderedDict()
+        self._requests = 0
+
+    def record_access(self, key: str) -> None:
+        self._frequency[key] = self._frequency.get(key, 0) + 1
+        self._frequency.move_to_end(key)
+
+        self._requests += 1
+        if self._requests % self.aging_interval == 0:
+            for history_key in self._frequency:
+                self._frequency[history_key] //= 2
+
+        # Forget the least recently seen keys that are not cached
+        if len(self._frequency) > self.history_size:
+            for history_key in list(self._frequency):
+                if len(self._frequency) <= self.history_size:
+                    break
+                if history_key not in self._resident:
+                    del self._frequency[history_key]
+
+    def frequency(self, key: str) -> int:
+        """Remembered access count of key."""
+        return self._frequency.get(key, 0)
+
+    def on_insert(self, key: str, size_bytes: int, load_seconds: float) -> None:
+        self._resident[key] = None
+
+    def on_hit(self, key: str) -> None:
+        self._resident.move_to_end(key)
+
+    def on_remove(self, key: str, evicted: bool = False) -> None:
+        self._resident.pop(key, None)
+
+    def victim(self) -> str:
+        # min() keeps the first of equal counts, i.e. the least recently used
+        return min(self._resident, key=self.frequency)
+
+    def should_admit(self, key: str, size_bytes: int, load_seconds: Optional[float], victim: str) -> bool:
+        return self.frequency(key) > self.frequency(victim)
+
+    def clear(self) -> None:
+        self._resident.clear()
+
+
+class CostAwarePolicy(CachePolicy):
+    """
+    GreedyDual-Frequency: evict the entry with the lowest frequency × parse cost.
+
+    Parse cost is load time × file size (in seconds × MB). On every eviction
+    the victim's priority becomes the new baseline, which ages entries that
+    are no longer requested.
+    """
+
+    name = "cost"
+
+    def __init__(self, history_size: int = 1000):
+        """
+        Initialize the policy.
+
+        Args:
+            history_size: Number of uncached keys whose access count is remembered
+        """
+        self.history_size = history_size
+        self._baseline = 0.0
+        # key -> access count, in order of last access (for trimming)
+        self._frequency: OrderedDict[str, int] = OrderedDict()
+        self._cost: Dict[str, float] = {}
+        # Cached keys in order of last access -> priority
+        self._priority: OrderedDict[str, float] = OrderedDict()
+
+    @staticmethod
+    def parse_cost(size_bytes: int, load_seconds: Optional[float]) -> float:
+        """Parse cost of a file: load time × size (MB), estimating the load time from the size if unknown."""
+        size_mb = max(size_bytes / (1024 * 1024), 0.001)
+        if load_seconds is None:
+            load_seconds = size_mb * _ESTIMATED_SECONDS_PER_MB
+        return max(load_seconds, 0.001) * size_mb
+
+    def record_access(self, key: str) -> None:
+        self._frequency[key] = self._frequency.get(key, 0) + 1
+        self._frequency.move_to_end(key)
+
+        # Forget the least recently seen keys that are not cached
+        if len(self._frequency) > self.history_size + len(self._priority):
+            for history_key in list(self._frequency):
+                if len(self._frequency) <= self.history_size + len(self._priority):
+                    break
+                if history_key not in self._priority:
+                    del self._frequency[history_key]
+
+    def on_insert(self, key: str, size_bytes: int, load_seconds: float) -> None:
+        self._cost[key] = self.parse_cost(size_bytes, load_seconds)
+        self._priority[key] = self._baseline + self._frequency.get(key, 1) * self._cost[key]
+
+    def on_hit(self, key: str) -> None:
+        self._priority[key] = self._baseline + self._frequency.get(key, 1) * self._cost[key]
+        self._priority.move_to_end(key)
+
+    def on_remove(self, key: str, evicted: bool = False) -> None:
+        priority = self._priority.pop(key, None)
+        self._cost.pop(key, None)
+        if evicted and priority is not None:
+            self._baseline = max(self._baseline, priority)
+            # An evicted entry starts over when it is requested again
+            self._frequency.pop(key, None)
+
+    def victim(self) -> str:
+        return min(self._priority, key=self._priority.get)
+
+    def should_admit(self, key: str, size_bytes: int, load_seconds: Optional[float], victim: str) -> bool:
+        candidate = self._baseline + self._frequency.get(key, 1) * self.parse_cost(size_bytes, load_seconds)
+        return candidate >= self._priority[victim]
+
+    def clear(self) -> None:
+        self._priority.clear()
+        self._cost.clear()
+        self._frequency.clear()
+        self._baseline = 0.0
+
+
+# Available policies by name
+CACHE_POLICIES = {
+    "lru": LruPolicy,
+    "lfu": LfuPolicy,
+    "cost": CostAwarePolicy,
+}
+
+
+def create_policy(policy: Union[str, CachePolicy]) -> CachePolicy:
+    """
+    Create a cache policy by name (or pass an instance through).
+
+    Args:
+        policy: Policy name from CACHE_POLICIES or a CachePolicy instance
+
+    Returns:
+        CachePolicy instance
+
+    Raises:
+        ValueError: If the policy name is unknown
+    """
+    if isinstance(policy, CachePolicy):
+        return policy
+    if policy not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy: {policy} (available: {', '.join(CACHE_POLICIES)})")
+    return CACHE_POLICIES[policy]()
+
+
+def replay_trace(
+    policy: CachePolicy,
+    accesses: Iterable[Tuple[str, int, float]],
+    max_entries: int,
+    max_bytes: Optional[int] = None
+) -> Dict[str, Union[int, float]]:
+    """
+    Replay an access trace against a policy, without loading any files.
+
+    Uses the same admission/eviction rules as IfcCacheManager.
+
+    Args:
+        policy: Fresh policy instance
+        accesses: (key, memory bytes, load seconds) per request
+        max_entries: Maximum number of cached entries
+        max_bytes: Optional memory budget (sum of memory bytes)
+
+    Returns:
+        Dictionary with requests, hits, misses, hit_rate (%), evictions,
+        rejected_admissions and parse_seconds (load time spent on misses)
+    """
+    resident: Dict[str, int] = {}
+    stats = {"requests": 0, "hits": 0, "misses": 0, "evictions": 0, "rejected_admissions": 0}
+    parse_seconds = 0.0
+
+    for key, size_bytes, load_seconds in accesses:
+        stats["requests"] += 1
+        policy.record_access(key)
+
+        if key in resident:
+            stats["hits"] += 1
+            policy.on_hit(key)
+            continue
+
+        stats["misses"] += 1
+        parse_seconds += load_seconds
+
+        def over_budget() -> bool:
+            return len(resident) >= max_entries or (
+                max_bytes is not None and sum(resident.values()) + size_bytes > max_bytes
+            )
+
+        if resident and over_budget() and not policy.should_admit(key, size_bytes, load_seconds, policy.victim()):
+            stats["rejected_admissions"] += 1
+            continue
+
+        while resident and over_budget():
+            victim = policy.victim()
+            del resident[victim]
+            policy.on_remove(victim, evicted=True)
+            stats["evictions"] += 1
+
+        resident[key] = size_bytes
+        policy.on_insert(key, size_bytes, load_seconds)
+
+    stats["hit_rate"] = round(stats["hits"] / stats["requests"] * 100, 2) if stats["requests"] else 0
+    stats["parse_seconds"] = round(parse_seconds, 3)
+    return stats
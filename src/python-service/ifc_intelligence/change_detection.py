@@ -0,0 +1,170 @@
+"""
+Element Change Detection Between Revisions
+
+Computes a stable content hash per extracted element and classifies the
+elements of a new revision against the GUID → hash map of the previous
+revision as added, changed, unchanged or removed.
+
+The hash covers everything stored per element (type, name, description,
+building/storey/space, property sets, quantities and type properties). It is computed over
+canonical JSON (sorted keys, no whitespace), so it does not depend on
+dictionary order, STEP ids or the order elements appear in the file. Nested
+property values (complex, bounded and table properties) are cleaned of their
+'id'/'type' keys and IfcValue wrappers by PropertyExtractor before hashing.
+
+License: MIT
+"""
+
+import json
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# Bump when the hashed content or its encoding changes; hashes of different versions never match
+# (2: building/storey/space GlobalIds added; 3: nested property values without STEP ids;
+#  4: entity-valued properties reduced to class and scalar attributes)
+CONTENT_HASH_VERSION = 4
+
+# Change classifications
+ADDED = "added"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+REMOVED = "removed"
+
+
+def element_content_hash(element: Dict[str, Any]) -> str:
+    """
+    Compute the content hash of an extracted element.
+
+    Args:
+        element: Element dictionary from BulkElementExtractor (without "content_hash")
+
+    Returns:
+        32-character hex digest (BLAKE2b, 128 bit)
+    """
+    content = {
+        "v": CONTENT_HASH_VERSION,
+        "element_type": element.get("element_type"),
+        "name": element.get("name"),
+        "description": element.get("description"),
+        "building_global_id": element.get("building_global_id"),
+        "storey_global_id": element.get("storey_global_id"),
+        "space_global_id": element.get("space_global_id"),
+        "properties": element.get("properties") or {},
+    }
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RevisionDiff:
+    """
+    Classify the elements of a new revision against the previous revision.
+
+    Usage:
+        diff = RevisionDiff(previous_hashes)
+        for element in extractor.iter_elements():
+            if diff.classify(element) != UNCHANGED:
+                store(element)
+        delete(diff.removed())
+    """
+
+    def __init__(self, previous_hashes: Dict[str, str]):
+        """
+        Initialize the diff.
+
+        Args:
+            previous_hashes: GUID → content hash map of the previous revision
+        """
+        self.previous_hashes = previous_hashes
+        self.current_hashes: Dict[str, str] = {}
+        self.counts = {ADDED: 0, CHANGED: 0, UNCHANGED: 0}
+
+    def classify(self, element: Dict[str, Any]) -> str:
+        """
+        Classify one element of the new revision.
+
+        Args:
+            element: Element dictionary (hash is computed if "content_hash" is missing)
+
+        Returns:
+            ADDED, CHANGED or UNCHANGED
+        """
+        global_id = element["global_id"]
+        content_hash = element.get("content_hash") or element_content_hash(element)
+        self.current_hashes[global_id] = content_hash
+
+        previous_hash = self.previous_hashes.get(global_id)
+        if previous_hash is None:
+            change = ADDED
+        elif previous_hash != content_hash:
+            change = CHANGED
+        else:
+            change = UNCHANGED
+
+        self.counts[change] += 1
+        return change
+
+    def removed(self) -> List[str]:
+        """
+        Get GUIDs of the previous revision that were not seen in the new one.
+
+        Call after all elements of the new revision have been classified.
+
+        Returns:
+            Sorted list of removed GUIDs
+        """
+        return sorted(set(self.previous_hashes) - set(self.current_hashes))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get change counts.
+
+        Returns:
+            Dictionary with added, changed, unchanged and removed counts
+        """
+        return {**self.counts, REMOVED: len(self.removed())}
+
+
+def iter_changed_elements(
+    elements: Iterable[Dict[str, Any]],
+    diff: RevisionDiff
+) -> Iterator[Dict[str, Any]]:
+    """
+    Filter elements down to the ones that were added or changed.
+
+    Args:
+        elements: Elements of the new revision
+        diff: RevisionDiff collecting the classification
+
+    Yields:
+        Added and changed elements, each with an additional "change" key
+    """
+    for element in elements:
+        change = diff.classify(element)
+        if change != UNCHANGED:
+            yield {**element, "change": change}
+
+
+def diff_elements(
+    elements: Iterable[Dict[str, Any]],
+    previous_hashes: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Compare a complete element list with the previous revision.
+
+    Args:
+        elements: Elements of the new revision
+        previous_hashes: GUID → content hash map of the previous revision (None = empty)
+
+    Returns:
+        {"added": [...], "changed": [...], "removed": [guid, ...], "statistics": {...}}
+    """
+    diff = RevisionDiff(previous_hashes or {})
+    result: Dict[str, Any] = {ADDED: [], CHANGED: []}
+
+    for element in iter_changed_elements(elements, diff):
+        result[element["change"]].append(element)
+
+    result[REMOVED] = diff.removed()
+    result["statistics"] = diff.get_stats()
+    return result
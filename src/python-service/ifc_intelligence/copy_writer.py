@@ -0,0 +1,264 @@
+"""
+PostgreSQL COPY Writer for IfcElements
+
+Writes extracted elements as a PostgreSQL COPY stream (text or binary format)
+that maps directly onto the "IfcElements" table, so the backend can load a
+whole revision with a single `COPY ... FROM STDIN` instead of inserting rows
+one by one through EF.
+
+Columns (see database/migrations/001_revision_control_schema.sql):
+    "RevisionId" INTEGER, "GlobalId" VARCHAR(22), "ElementType" VARCHAR(100),
+    "Name" VARCHAR(255), "Description" TEXT, "PropertiesJson" JSONB,
+    "BuildingGlobalId" VARCHAR(22), "StoreyGlobalId" VARCHAR(22), "SpaceGlobalId" VARCHAR(22)
+    (location columns: database/migrations/004_add_element_spatial_location.sql)
+"Id" and "CreatedAt" are filled by their column defaults.
+
+Format reference: https://www.postgresql.org/docs/current/sql-copy.html
+
+License: MIT
+"""
+
+import json
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+
+# Target table and columns, in stream order
+COPY_TABLE = "IfcElements"
+COPY_COLUMNS = (
+    "RevisionId", "GlobalId", "ElementType", "Name", "Description", "PropertiesJson",
+    "BuildingGlobalId", "StoreyGlobalId", "SpaceGlobalId",
+)
+
+# Binary COPY signature (11 bytes) + flags + header extension length
+_BINARY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_BINARY_HEADER = _BINARY_SIGNATURE + struct.pack("!ii", 0, 0)
+_BINARY_TRAILER = struct.pack("!h", -1)
+
+# jsonb binary representation starts with a format version byte
+_JSONB_VERSION = b"\x01"
+
+# Characters that must be escaped in text format
+_TEXT_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+_TEXT_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f", "v": "\v"}
+
+
+def copy_statement(binary: bool = False, table: str = COPY_TABLE) -> str:
+    """
+    Build the COPY statement matching the stream written by IfcElementCopyWriter.
+
+    Args:
+        binary: True for binary format, False for text format
+        table: Target table name
+
+    Returns:
+        SQL statement, e.g. COPY "IfcElements" ("RevisionId", ...) FROM STDIN
+    """
+    columns = ", ".join(f'"{column}"' for column in COPY_COLUMNS)
+    statement = f'COPY "{table}" ({columns}) FROM STDIN'
+    if binary:
+        statement += " WITH (FORMAT binary)"
+    return statement
+
+
+def element_to_row(element: Dict[str, Any], revision_id: int) -> Tuple[Any, ...]:
+    """
+    Map an extracted element dictionary onto the IfcElements columns.
+
+    Args:
+        element: Element dictionary from BulkElementExtractor
+        revision_id: Id of the revision the elements belong to
+
+    Returns:
+        Tuple of column values in COPY_COLUMNS order
+    """
+    properties_json = json.dumps(
+        element.get("properties") or {},
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return (
+        revision_id,
+        element["global_id"],
+        element["element_type"],
+        element.get("name"),
+        element.get("description"),
+        properties_json,
+        element.get("building_global_id"),
+        element.get("storey_global_id"),
+        element.get("space_global_id"),
+    )
+
+
+class IfcElementCopyWriter:
+    """
+    Stream elements into a COPY FROM STDIN payload.
+
+    Usage:
+        with open("elements.copy", "wb") as f:
+            writer = IfcElementCopyWriter(f, revision_id=42, binary=True)
+            for element in extractor.iter_elements():
+                writer.write_element(element)
+            writer.close()
+
+        # psql: \\copy "IfcElements" ("RevisionId", ...) FROM 'elements.copy' WITH (FORMAT binary)
+    """
+
+    def __init__(self, stream: BinaryIO, revision_id: int, binary: bool = False):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Binary output stream (e.g. sys.stdout.buffer)
+            revision_id: Id of the revision the elements belong to
+            binary: Write binary COPY format instead of text format
+        """
+        self.stream = stream
+        self.revision_id = revision_id
+        self.binary = binary
+        self.rows_written = 0
+        self._closed = False
+
+        if self.binary:
+            self.stream.write(_BINARY_HEADER)
+
+    def write_element(self, element: Dict[str, Any]) -> None:
+        """
+        Write one element as a COPY row.
+
+        Args:
+            element: Element dictionary from BulkElementExtractor
+
+        Raises:
+            RuntimeError: If the writer was already closed
+        """
+        if self._closed:
+            raise RuntimeError("COPY writer is closed")
+
+        row = element_to_row(element, self.revision_id)
+        if self.binary:
+            self.stream.write(self._encode_binary_row(row))
+        else:
+            self.stream.write(self._encode_text_row(row))
+        self.rows_written += 1
+
+    def close(self) -> None:
+        """Finish the stream (writes the binary trailer). Does not close the underlying stream."""
+        if self._closed:
+            return
+        if self.binary:
+            self.stream.write(_BINARY_TRAILER)
+        self.stream.flush()
+        self._closed = True
+
+    def _encode_text_row(self, row: tuple) -> bytes:
+        fields = []
+        for value in row:
+            if value is None:
+                fields.append("\\N")
+            else:
+                fields.append(str(value).translate(_TEXT_ESCAPES))
+        return ("\t".join(fields) + "\n").encode("utf-8")
+
+    def _encode_binary_row(self, row: tuple) -> bytes:
+        revision_id, global_id, element_type, name, description, properties_json = row[:6]
+
+        parts = [struct.pack("!h", len(row)), struct.pack("!ii", 4, revision_id)]
+        self._append_text_fields(parts, (global_id, element_type, name, description))
+
+        data = _JSONB_VERSION + properties_json.encode("utf-8")
+        parts.append(struct.pack("!i", len(data)))
+        parts.append(data)
+
+        # Building, storey and space GlobalIds
+        self._append_text_fields(parts, row[6:])
+
+        return b"".join(parts)
+
+    @staticmethod
+    def _append_text_fields(parts: List[bytes], values) -> None:
+        """Append length-prefixed UTF-8 fields (-1 for NULL)."""
+        for value in values:
+            if value is None:
+                parts.append(struct.pack("!i", -1))
+            else:
+                data = value.encode("utf-8")
+                parts.append(struct.pack("!i", len(data)))
+                parts.append(data)
+
+
+def read_copy_text(data: bytes) -> Iterator[List[Optional[str]]]:
+    """
+    Decode a text-format COPY payload (for tests and debugging).
+
+    Args:
+        data: Payload written by IfcElementCopyWriter(binary=False)
+
+    Yields:
+        Rows as lists of strings (None for NULL)
+    """
+    for line in data.decode("utf-8").split("\n"):
+        if not line:
+            continue
+        row = []
+        for field in line.split("\t"):
+            if field == "\\N":
+                row.append(None)
+                continue
+            chars = []
+            i = 0
+            while i < len(field):
+                if field[i] == "\\" and i + 1 < len(field):
+                    chars.append(_TEXT_UNESCAPES.get(field[i + 1], field[i + 1]))
+                    i += 2
+                else:
+                    chars.append(field[i])
+                    i += 1
+            row.append("".join(chars))
+        yield row
+
+
+def read_copy_binary(data: bytes) -> Iterator[List[Optional[bytes]]]:
+    """
+    Decode a binary-format COPY payload (for tests and debugging).
+
+    Args:
+        data: Payload written by IfcElementCopyWriter(binary=True)
+
+    Yields:
+        Rows as lists of raw field bytes (None for NULL)
+
+    Raises:
+        ValueError: If the payload has no valid COPY header or is truncated
+    """
+    if not data.startswith(_BINARY_SIGNATURE):
+        raise ValueError("Not a binary COPY payload")
+
+    offset = len(_BINARY_SIGNATURE)
+    _flags, extension_length = struct.unpack_from("!ii", data, offset)
+    offset += 8 + extension_length
+
+    while True:
+        if offset + 2 > len(data):
+            raise ValueError("Binary COPY payload is truncated")
+        (field_count,) = struct.unpack_from("!h", data, offset)
+        offset += 2
+        if field_count == -1:
+            return
+
+        row = []
+        for _ in range(field_count):
+            (length,) = struct.unpack_from("!i", data, offset)
+            offset += 4
+            if length == -1:
+                row.append(None)
+            else:
+                row.append(data[offset:offset + length])
+                offset += length
+        yield row
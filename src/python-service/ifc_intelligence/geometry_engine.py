@@ -0,0 +1,372 @@
+"""
+In-Process Geometry Engine
+
+Tessellates an IFC model with ifcopenshell.geom iterators and streams the
+meshes into a GLB/glTF file (GlbWriter), as an alternative to running the
+IfcConvert binary.
+
+IfcConvert opens the IFC file in its own process, so a model the worker
+already holds in IfcCacheManager is parsed a second time, and the export
+reports nothing until it exits. This engine works on the cached model,
+tessellates with several threads (the iterator runs its own C++ thread
+pool) and reports progress per element.
+
+GltfExportOptions keep their IfcConvert meaning:
+- use_element_names / use_element_guids: node names (names win over GUIDs)
+- use_material_names: IfcSurfaceStyle names instead of generated style ids
+- center_model: offset by the center of all placements (IfcConvert --center-model)
+- y_up: rotate Z-up model coordinates to Y-up
+- no_normals: omit normals and weld vertices
+
+IfcOpeningElement and IfcSpace are skipped, as IfcConvert does by default.
+
+options.timeout_seconds and a cancel event are checked between elements;
+an interrupted export discards its partial output.
+
+With options.instancing, elements are tessellated in local coordinates and
+every distinct geometry (the iterator shares one geometry id between all
+occurrences of a representation map / IfcMappedItem) is written as one mesh.
+Each element stays a node of its own (named by GUID, so viewers can still
+pick it) that references the shared mesh with its placement as node matrix.
+Centering and Y-up go into the node matrices instead of the vertices.
+
+License: MIT (our code) + LGPL (IfcOpenShell library)
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import numpy as np
+import ifcopenshell
+import ifcopenshell.geom
+
+from .cache_manager import IfcCacheManager, get_global_cache
+from .glb_writer import GlbWriter
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    from .gltf_exporter import GltfExportOptions
+
+logger = get_logger(__name__)
+
+
+# Entity types IfcConvert leaves out of its output by default
+DEFAULT_EXCLUDED_TYPES = ("IfcOpeningElement", "IfcSpace")
+
+# Elements between two progress log events
+PROGRESS_LOG_INTERVAL = 1000
+
+
+class NoGeometryError(RuntimeError):
+    """The model has no elements with a tessellatable representation."""
+
+
+class ExportCancelledError(RuntimeError):
+    """The export was stopped through its cancel event."""
+
+
+def create_geometry_settings(options: "GltfExportOptions") -> ifcopenshell.geom.settings:
+    """
+    Build iterator settings for a set of export options.
+
+    Args:
+        options: Export options
+
+    Returns:
+        ifcopenshell.geom settings (triangulated; world coordinates unless instancing)
+    """
+    settings = ifcopenshell.geom.settings()
+    # Instancing keeps shapes in local coordinates, so occurrences can share them
+    settings.set("use-world-coords", not options.instancing)
+    settings.set("use-material-names", bool(options.use_material_names))
+    settings.set("apply-default-materials", True)
+    # Welding shares vertices between faces, which loses per-face normals
+    settings.set("no-normals", bool(options.no_normals))
+    settings.set("weld-vertices", bool(options.no_normals))
+    return settings
+
+
+class GeometryEngine:
+    """
+    Export IFC models to glTF/GLB with ifcopenshell.geom, without IfcConvert.
+
+    Usage:
+        engine = GeometryEngine()
+        stats = engine.export("model.ifc", "model.glb", options=GltfExportOptions(y_up=True))
+    """
+
+    def __init__(self, cache_manager: Optional[IfcCacheManager] = None):
+        """
+        Initialize the geometry engine.
+
+        Args:
+            cache_manager: Optional cache manager instance (uses global cache if None)
+        """
+        self.cache = cache_manager or get_global_cache()
+
+    def export(
+        self,
+        ifc_file_path: str,
+        output_path: str,
+        options: "GltfExportOptions",
+        format: str = "glb",
+        progress: Optional[Callable[[int, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Tessellate an IFC file and write it as glTF/GLB.
+
+        Args:
+            ifc_file_path: Path to input IFC file (loaded through the cache)
+            output_path: Path to output glTF/GLB file
+            options: Export options
+            format: Output format ('glb' for binary, 'gltf' for JSON + .bin)
+            progress: Optional callback(elements_written, percent) after every element
+            cancel_event: Optional event that stops the export when set
+
+        Returns:
+            Export statistics (element, instanced element, triangle, mesh and material
+            counts, threads); triangles count every element, vertices only stored meshes
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If file cannot be opened
+            NoGeometryError: If the model has nothing to tessellate
+            TimeoutError: If options.timeout_seconds expired
+            ExportCancelledError: If cancel_event was set
+        """
+        ifc_file = self.cache.get_or_load(ifc_file_path)
+        return self.export_model(ifc_file, output_path, options, format, progress, cancel_event)
+
+    def export_model(
+        self,
+        ifc_file: ifcopenshell.file,
+        output_path: str,
+        options: "GltfExportOptions",
+        format: str = "glb",
+        progress: Optional[Callable[[int, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Tessellate an opened IFC model and write it as glTF/GLB.
+
+        Args:
+            ifc_file: Opened IfcOpenShell file object
+            output_path: Path to output glTF/GLB file
+            options: Export options
+            format: Output format ('glb' or 'gltf')
+            progress: Optional callback(elements_written, percent)
+            cancel_event: Optional event that stops the export when set
+
+        Returns:
+            Export statistics
+
+        Raises:
+            NoGeometryError: If the model has nothing to tessellate
+            TimeoutError: If options.timeout_seconds expired
+            ExportCancelledError: If cancel_event was set
+        """
+        deadline = None
+        if options.timeout_seconds is not None:
+            deadline = time.monotonic() + options.timeout_seconds
+
+        threads = options.threads or os.cpu_count() or 1
+        iterator = ifcopenshell.geom.iterator(
+            create_geometry_settings(options), ifc_file, threads, exclude=DEFAULT_EXCLUDED_TYPES
+        )
+
+        offset = np.zeros(3)
+        if options.center_model:
+            # Center of all placements (not of the tessellated geometry), like IfcConvert
+            iterator.compute_bounds(False)
+            offset = (
+                np.array(iterator.bounds_min().components) + np.array(iterator.bounds_max().components)
+            ) / 2.0
+
+        if not iterator.initialize():
+            raise NoGeometryError("No elements with geometry to export")
+
+        # Instancing: geometry id -> mesh index, and the transform applied on top of every placement
+        instances: Optional[Dict[str, int]] = {} if options.instancing else None
+        root_transform = self._root_transform(offset, options.y_up)
+
+        stats = {
+            "elements": 0, "skipped_elements": 0, "instanced_elements": 0,
+            "triangles": 0, "vertices": 0, "threads": threads
+        }
+        with GlbWriter(output_path, format=format) as writer:
+            while True:
+                self._check_interrupted(deadline, cancel_event, options)
+                shape = iterator.get()
+                if instances is not None:
+                    added = self._write_instance(writer, shape, options, root_transform, instances, stats)
+                else:
+                    added = self._write_shape(writer, shape, options, offset, stats)
+
+                if added:
+                    stats["elements"] += 1
+                else:
+                    stats["skipped_elements"] += 1
+
+                written = stats["elements"]
+                if progress is not None:
+                    progress(written, iterator.progress())
+                if written and written % PROGRESS_LOG_INTERVAL == 0:
+                    logger.info("gltf_export_progress", elements_written=written,
+                                percent=iterator.progress())
+
+                if not iterator.next():
+                    break
+
+            if stats["elements"] == 0:
+                raise NoGeometryError("No elements with geometry to export")
+
+            stats["meshes"] = writer.mesh_count
+            stats["materials"] = writer.material_count
+
+        if progress is not None:
+            progress(stats["elements"], 100)
+
+        logger.info("gltf_export_completed", output_path=output_path, **stats)
+        return stats
+
+    @staticmethod
+    def _check_interrupted(
+        deadline: Optional[float],
+        cancel_event: Optional[threading.Event],
+        options: "GltfExportOptions"
+    ) -> None:
+        """Raise if the export was cancelled or ran out of time."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelledError("Export cancelled")
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Export timed out after {options.timeout_seconds} seconds")
+
+    def _write_shape(
+        self,
+        writer: GlbWriter,
+        shape,
+        options: "GltfExportOptions",
+        offset: np.ndarray,
+        stats: Dict[str, Any]
+    ) -> bool:
+        """Add one tessellated element as mesh + node. Returns False for empty shapes."""
+        geometry = shape.geometry
+        positions = np.frombuffer(geometry.verts_buffer, dtype=np.float64).reshape(-1, 3)
+        triangles = np.frombuffer(geometry.faces_buffer, dtype=np.int32).reshape(-1, 3)
+        if not len(positions) or not len(triangles):
+            return False
+
+        positions = positions - offset
+        normals = None
+        if not options.no_normals:
+            normals = np.frombuffer(geometry.normals_buffer, dtype=np.float64).reshape(-1, 3)
+            if len(normals) != len(positions):
+                normals = None
+
+        if options.y_up:
+            # (x, y, z) Z-up -> (x, z, -y) Y-up
+            positions = positions[:, [0, 2, 1]] * (1.0, 1.0, -1.0)
+            if normals is not None:
+                normals = normals[:, [0, 2, 1]] * (1.0, 1.0, -1.0)
+
+        name = self._node_name(shape, options)
+        mesh = writer.add_mesh(name, positions, normals, self._primitives(writer, geometry, triangles))
+        writer.add_node(name, mesh=mesh, extras={"ifc_type": shape.type, "global_id": shape.guid})
+
+        stats["triangles"] += len(triangles)
+        stats["vertices"] += len(positions)
+        return True
+
+    def _write_instance(
+        self,
+        writer: GlbWriter,
+        shape,
+        options: "GltfExportOptions",
+        root_transform: np.ndarray,
+        instances: Dict[str, int],
+        stats: Dict[str, Any]
+    ) -> bool:
+        """Add one element as node referencing the (shared) mesh of its geometry. Returns False for empty shapes."""
+        geometry = shape.geometry
+        mesh = instances.get(geometry.id)
+        triangle_count = len(geometry.faces_buffer) // (3 * 4)
+
+        if mesh is None:
+            positions = np.frombuffer(geometry.verts_buffer, dtype=np.float64).reshape(-1, 3)
+            triangles = np.frombuffer(geometry.faces_buffer, dtype=np.int32).reshape(-1, 3)
+            if not len(positions) or not len(triangles):
+                return False
+
+            normals = None
+            if not options.no_normals:
+                normals = np.frombuffer(geometry.normals_buffer, dtype=np.float64).reshape(-1, 3)
+                if len(normals) != len(positions):
+                    normals = None
+
+            mesh = writer.add_mesh(
+                f"geometry-{geometry.id}", positions, normals, self._primitives(writer, geometry, triangles)
+            )
+            instances[geometry.id] = mesh
+            stats["vertices"] += len(positions)
+        else:
+            stats["instanced_elements"] += 1
+
+        # transformation.matrix is column-major, like glTF node matrices
+        placement = np.array(shape.transformation.matrix, dtype=np.float64).reshape(4, 4).T
+        matrix = root_transform @ placement
+        writer.add_node(
+            self._node_name(shape, options),
+            mesh=mesh,
+            matrix=matrix.T.reshape(-1),
+            extras={"ifc_type": shape.type, "global_id": shape.guid}
+        )
+
+        stats["triangles"] += triangle_count
+        return True
+
+    @staticmethod
+    def _primitives(writer: GlbWriter, geometry, triangles: np.ndarray) -> list:
+        """One primitive per style; the vertex arrays are shared."""
+        material_ids = np.frombuffer(geometry.material_ids_buffer, dtype=np.int32)
+        styles = geometry.materials
+        primitives = []
+        for material_id in np.unique(material_ids):
+            material = None
+            if 0 <= material_id < len(styles):
+                style = styles[material_id]
+                transparency = style.transparency
+                material = writer.add_material(
+                    style.name,
+                    style.diffuse.components,
+                    0.0 if np.isnan(transparency) else transparency
+                )
+            primitives.append((material, triangles[material_ids == material_id]))
+        return primitives
+
+    @staticmethod
+    def _root_transform(offset: np.ndarray, y_up: bool) -> np.ndarray:
+        """Row-major 4x4 transform for centering (translate by -offset) and Z-up -> Y-up."""
+        transform = np.identity(4)
+        transform[:3, 3] = -offset
+        if y_up:
+            # (x, y, z) -> (x, z, -y)
+            rotation = np.array([
+                [1.0, 0.0, 0.0, 0.0],
+                [0.0, 0.0, 1.0, 0.0],
+                [0.0, -1.0, 0.0, 0.0],
+                [0.0, 0.0, 0.0, 1.0],
+            ])
+            transform = rotation @ transform
+        return transform
+
+    @staticmethod
+    def _node_name(shape, options: "GltfExportOptions") -> str:
+        """Node name: element Name, GlobalId or STEP id."""
+        if options.use_element_names and shape.name:
+            return shape.name
+        if options.use_element_guids or options.use_element_names:
+            return shape.guid
+        return f"product-{shape.id}"
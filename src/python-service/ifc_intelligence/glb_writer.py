@@ -0,0 +1,378 @@
+"""
+Streaming glTF 2.0 Writer
+
+Writes meshes to a glTF 2.0 binary (GLB) or JSON + .bin file while they are
+produced. Vertex and index data go straight to a temporary file next to the
+output, so only the (small) glTF JSON document is kept in memory; close()
+writes the header, the JSON chunk and copies the binary chunk behind it.
+
+Every accessor gets its own buffer view, aligned to 4 bytes as required by
+the specification. Materials are deduplicated by name, colour and
+transparency.
+
+License: MIT
+"""
+
+import json
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+GLB_MAGIC = b"glTF"
+GLB_VERSION = 2
+GLB_CHUNK_JSON = b"JSON"
+GLB_CHUNK_BIN = b"BIN\x00"
+
+# glTF accessor component types and buffer view targets
+COMPONENT_UNSIGNED_SHORT = 5123
+COMPONENT_UNSIGNED_INT = 5125
+COMPONENT_FLOAT = 5126
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+_COMPONENT_TYPES = {
+    np.dtype(np.uint16): COMPONENT_UNSIGNED_SHORT,
+    np.dtype(np.uint32): COMPONENT_UNSIGNED_INT,
+    np.dtype(np.float32): COMPONENT_FLOAT,
+}
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _pad4(length: int) -> int:
+    """Number of bytes needed to pad a length to a multiple of 4."""
+    return (4 - length % 4) % 4
+
+
+class GlbWriter:
+    """
+    Incremental glTF 2.0 writer.
+
+    Usage:
+        with GlbWriter("model.glb") as writer:
+            material = writer.add_material("Concrete", (0.8, 0.8, 0.8))
+            mesh = writer.add_mesh("wall", positions, normals, [(material, triangles)])
+            writer.add_node("2O2Fr$t4X7Zf8NOew3FKau", mesh=mesh)
+        # close() on exit writes model.glb; an exception discards it
+    """
+
+    def __init__(self, output_path: str, format: str = "glb", generator: str = "ifc_intelligence"):
+        """
+        Initialize the writer.
+
+        Args:
+            output_path: Path of the file to write
+            format: 'glb' (single binary file) or 'gltf' (JSON plus <name>.bin)
+            generator: Value of asset.generator
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if format not in ("glb", "gltf"):
+            raise ValueError(f"Unknown glTF format: {format}")
+
+        self.output_path = Path(output_path)
+        self.format = format
+
+        self.document: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": generator},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self._materials: Dict[Tuple, int] = {}
+        self._byte_length = 0
+        self._closed = False
+
+        # Binary chunk, spooled to disk next to the output while meshes are added
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._bin = tempfile.TemporaryFile(dir=self.output_path.parent, suffix=".bin.tmp")
+
+    def __enter__(self) -> "GlbWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def node_count(self) -> int:
+        """Number of nodes added so far."""
+        return len(self.document["nodes"])
+
+    @property
+    def mesh_count(self) -> int:
+        """Number of meshes added so far."""
+        return len(self.document["meshes"])
+
+    @property
+    def material_count(self) -> int:
+        """Number of distinct materials added so far."""
+        return len(self.document["materials"])
+
+    def add_material(
+        self,
+        name: str,
+        color: Sequence[float],
+        transparency: float = 0.0
+    ) -> int:
+        """
+        Add a PBR material, or return the index of an identical one.
+
+        Args:
+            name: Material name
+            color: Diffuse RGB colour (0..1)
+            transparency: Transparency (0 = opaque, 1 = invisible)
+
+        Returns:
+            Material index
+        """
+        key = (name, tuple(round(float(c), 6) for c in color[:3]), round(float(transparency), 6))
+        index = self._materials.get(key)
+        if index is not None:
+            return index
+
+        alpha = 1.0 - key[2]
+        material: Dict[str, Any] = {
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [*key[1], alpha],
+                "metallicFactor": 0.0,
+                "roughnessFactor": 1.0,
+            },
+            "doubleSided": True,
+        }
+        if alpha < 1.0:
+            material["alphaMode"] = "BLEND"
+
+        index = len(self.document["materials"])
+        self.document["materials"].append(material)
+        self._materials[key] = index
+        return index
+
+    def add_mesh(
+        self,
+        name: str,
+        positions: np.ndarray,
+        normals: Optional[np.ndarray],
+        primitives: List[Tuple[Optional[int], np.ndarray]]
+    ) -> int:
+        """
+        Add a triangle mesh whose primitives share one vertex array.
+
+        Args:
+            name: Mesh name
+            positions: (n, 3) vertex positions
+            normals: (n, 3) vertex normals, or None
+            primitives: (material index or None, (m, 3) vertex indices) per primitive
+
+        Returns:
+            Mesh index
+        """
+        positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+        attributes = {"POSITION": self._add_accessor(positions, "VEC3", TARGET_ARRAY_BUFFER, bounds=True)}
+        if normals is not None and len(normals):
+            normals = np.ascontiguousarray(normals, dtype=np.float32).reshape(-1, 3)
+            attributes["NORMAL"] = self._add_accessor(normals, "VEC3", TARGET_ARRAY_BUFFER)
+
+        index_type = np.uint16 if len(positions) <= 0xFFFF else np.uint32
+        mesh_primitives = []
+        for material, triangles in primitives:
+            indices = np.ascontiguousarray(triangles, dtype=index_type).reshape(-1)
+            primitive: Dict[str, Any] = {
+                "attributes": attributes,
+                "indices": self._add_accessor(indices, "SCALAR", TARGET_ELEMENT_ARRAY_BUFFER),
+                "mode": 4,
+            }
+            if material is not None:
+                primitive["material"] = material
+            mesh_primitives.append(primitive)
+
+        index = len(self.document["meshes"])
+        self.document["meshes"].append({"name": name, "primitives": mesh_primitives})
+        return index
+
+    def add_node(
+        self,
+        name: str,
+        mesh: Optional[int] = None,
+        matrix: Optional[Sequence[float]] = None,
+        extras: Optional[Dict[str, Any]] = None,
+        root: bool = True
+    ) -> int:
+        """
+        Add a node.
+
+        Args:
+            name: Node name
+            mesh: Mesh index, or None for an empty node (several nodes may share a mesh)
+            matrix: Optional column-major 4x4 transform (16 values)
+            extras: Optional application-specific data
+            root: Add the node to the scene (False for nodes that become children)
+
+        Returns:
+            Node index
+        """
+        node: Dict[str, Any] = {"name": name}
+        if mesh is not None:
+            node["mesh"] = mesh
+        if matrix is not None:
+            node["matrix"] = [float(value) for value in matrix]
+        if extras:
+            node["extras"] = extras
+
+        index = len(self.document["nodes"])
+        self.document["nodes"].append(node)
+        if root:
+            self.document["scenes"][0]["nodes"].append(index)
+        return index
+
+    def close(self) -> int:
+        """
+        Write the output file.
+
+        Returns:
+            Size of the written file in bytes (GLB, or the JSON file for 'gltf')
+        """
+        if self._closed:
+            return self.output_path.stat().st_size
+        self._closed = True
+
+        document = {key: value for key, value in self.document.items() if value != []}
+        try:
+            if self._byte_length:
+                document["buffers"] = [{"byteLength": self._byte_length}]
+
+            self._bin.seek(0)
+            if self.format == "glb":
+                self._write_glb(document)
+            else:
+                self._write_gltf(document)
+        finally:
+            self._bin.close()
+
+        return self.output_path.stat().st_size
+
+    def abort(self) -> None:
+        """Discard everything written so far (the output file is not created)."""
+        if not self._closed:
+            self._closed = True
+            self._bin.close()
+
+    def _add_accessor(
+        self,
+        data: np.ndarray,
+        accessor_type: str,
+        target: int,
+        bounds: bool = False
+    ) -> int:
+        """Append data to the binary chunk and create its buffer view and accessor."""
+        raw = data.tobytes()
+        padding = _pad4(len(raw))
+
+        view_index = len(self.document["bufferViews"])
+        self.document["bufferViews"].append({
+            "buffer": 0,
+            "byteOffset": self._byte_length,
+            "byteLength": len(raw),
+            "target": target,
+        })
+        self._bin.write(raw)
+        if padding:
+            self._bin.write(b"\x00" * padding)
+        self._byte_length += len(raw) + padding
+
+        components = 3 if accessor_type == "VEC3" else 1
+        accessor: Dict[str, Any] = {
+            "bufferView": view_index,
+            "componentType": _COMPONENT_TYPES[data.dtype],
+            "count": len(data) if components > 1 else data.size,
+            "type": accessor_type,
+        }
+        if bounds and data.size:
+            # Required for POSITION
+            accessor["min"] = data.min(axis=0).tolist()
+            accessor["max"] = data.max(axis=0).tolist()
+
+        index = len(self.document["accessors"])
+        self.document["accessors"].append(accessor)
+        return index
+
+    def _write_glb(self, document: Dict[str, Any]) -> None:
+        """Header, JSON chunk (space padded) and BIN chunk in one file."""
+        json_bytes = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        json_bytes += b" " * _pad4(len(json_bytes))
+
+        total_length = 12 + 8 + len(json_bytes)
+        if self._byte_length:
+            total_length += 8 + self._byte_length
+
+        with open(self.output_path, "wb") as f:
+            f.write(struct.pack("<4sII", GLB_MAGIC, GLB_VERSION, total_length))
+            f.write(struct.pack("<I4s", len(json_bytes), GLB_CHUNK_JSON))
+            f.write(json_bytes)
+            if self._byte_length:
+                f.write(struct.pack("<I4s", self._byte_length, GLB_CHUNK_BIN))
+                shutil.copyfileobj(self._bin, f, _COPY_CHUNK_SIZE)
+
+    def _write_gltf(self, document: Dict[str, Any]) -> None:
+        """JSON file plus a .bin file with the same stem."""
+        if self._byte_length:
+            bin_path = self.output_path.with_suffix(".bin")
+            document["buffers"][0]["uri"] = bin_path.name
+            with open(bin_path, "wb") as f:
+                shutil.copyfileobj(self._bin, f, _COPY_CHUNK_SIZE)
+
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+
+
+def read_glb(path: str) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Read the JSON document and binary chunk of a GLB file.
+
+    Args:
+        path: Path to the GLB file
+
+    Returns:
+        Tuple (glTF JSON document, binary chunk)
+
+    Raises:
+        ValueError: If the file is not a valid GLB file
+    """
+    data = Path(path).read_bytes()
+    if len(data) < 20:
+        raise ValueError("Truncated GLB file")
+
+    magic, version, length = struct.unpack_from("<4sII", data)
+    if magic != GLB_MAGIC or version != GLB_VERSION:
+        raise ValueError("Not a glTF 2.0 binary file")
+    if length != len(data):
+        raise ValueError("GLB length mismatch")
+
+    json_length, chunk_type = struct.unpack_from("<I4s", data, 12)
+    if chunk_type != GLB_CHUNK_JSON:
+        raise ValueError("First GLB chunk is not JSON")
+    document = json.loads(data[20:20 + json_length].decode("utf-8"))
+
+    binary = b""
+    offset = 20 + json_length
+    if offset < len(data):
+        bin_length, chunk_type = struct.unpack_from("<I4s", data, offset)
+        if chunk_type != GLB_CHUNK_BIN:
+            raise ValueError("Second GLB chunk is not BIN")
+        binary = data[offset + 8:offset + 8 + bin_length]
+
+    return document, binary
@@ -1,7 +1,12 @@
 """
 IFC to glTF Exporter
 
-Converts IFC files to glTF/GLB format using IfcConvert binary.
+Converts IFC files to glTF/GLB format using IfcConvert binary, or in process
+with the ifcopenshell.geom based GeometryEngine (options.engine).
+
+IfcConvert runs through ProcessRunner: an explicit thread count, a
+wall-clock timeout, an optional memory limit, cancellation and progress
+parsed from its progress bar.
 
 This is an independent implementation inspired by Bonsai concepts but
 implemented from scratch using IfcConvert CLI.
@@ -9,12 +14,21 @@
 License: MIT (our code) + LGPL (IfcOpenShell/IfcConvert binary)
 """
 
-import subprocess
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Any, Callable, Dict, Optional, Literal
 from dataclasses import dataclass
 
+from .cache_manager import IfcCacheManager
+from .geometry_engine import ExportCancelledError, GeometryEngine, NoGeometryError
+from .process_runner import ProcessRunner
+
+
+# Export engines: IfcConvert subprocess, or ifcopenshell.geom in this process
+GLTF_ENGINES = ("ifcconvert", "ifcopenshell")
+
 
 @dataclass
 class GltfExportOptions:
@@ -28,6 +42,12 @@ class GltfExportOptions:
         center_model: Center the model at origin
         no_normals: Disable normal computation (faster but no lighting)
         y_up: Use Y-up coordinate system (default is Z-up)
+        engine: 'ifcconvert' (IfcConvert binary) or 'ifcopenshell' (in process, cached model)
+        threads: Tessellation threads, IfcConvert --threads or in-process iterator (None = one per CPU)
+        timeout_seconds: Wall-clock limit of the export (None = no limit)
+        memory_limit_mb: Address-space limit of the IfcConvert process (None = no limit, Linux only)
+        instancing: Write one mesh per shared geometry, referenced by every occurrence
+                    (requires engine 'ifcopenshell')
     """
     use_element_guids: bool = True
     use_element_names: bool = False
@@ -35,6 +55,11 @@ class GltfExportOptions:
     center_model: bool = False
     no_normals: bool = False
     y_up: bool = False
+    engine: str = "ifcconvert"
+    threads: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    memory_limit_mb: Optional[int] = None
+    instancing: bool = False
 
 
 @dataclass
@@ -49,6 +74,10 @@ class GltfExportResult:
         error_message: Error message if export failed
         stdout: Standard output from IfcConvert
         stderr: Standard error from IfcConvert
+        statistics: Element/triangle/material counts (in-process engine only)
+        timed_out: Export was stopped because options.timeout_seconds expired
+        cancelled: Export was stopped through the cancel event
+        duration_ms: Wall-clock export time
     """
     success: bool
     output_path: Optional[str] = None
@@ -56,31 +85,40 @@ class GltfExportResult:
     error_message: Optional[str] = None
     stdout: Optional[str] = None
     stderr: Optional[str] = None
+    statistics: Optional[Dict[str, Any]] = None
+    timed_out: bool = False
+    cancelled: bool = False
+    duration_ms: Optional[int] = None
 
 
 class GltfExporter:
     """
     Export IFC files to glTF/GLB format using IfcConvert.
 
-    Uses IfcConvert binary (LGPL) from IfcOpenShell.
+    Uses IfcConvert binary (LGPL) from IfcOpenShell, or GeometryEngine
+    (ifcopenshell.geom) on the cached model with options.engine="ifcopenshell".
     Strategy inspired by Bonsai's geometry export approach.
     """
 
-    def __init__(self, ifcconvert_path: str = "IfcConvert"):
+    def __init__(self, ifcconvert_path: str = "IfcConvert", cache_manager: Optional[IfcCacheManager] = None):
         """
         Initialize the glTF exporter.
 
         Args:
             ifcconvert_path: Path to IfcConvert binary (default: searches PATH)
+            cache_manager: Cache the in-process engine loads models from (uses global cache if None)
         """
         self.ifcconvert_path = ifcconvert_path
+        self.geometry_engine = GeometryEngine(cache_manager=cache_manager)
 
     def export(
         self,
         ifc_file_path: str,
         output_path: str,
         format: Literal["glb", "gltf"] = "glb",
-        options: Optional[GltfExportOptions] = None
+        options: Optional[GltfExportOptions] = None,
+        progress: Optional[Callable[[Optional[int], float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> GltfExportResult:
         """
         Export IFC file to glTF/GLB format.
@@ -90,12 +128,16 @@ def export(
             output_path: Path to output glTF/GLB file
             format: Output format ('glb' for binary, 'gltf' for JSON)
             options: Export options (uses defaults if None)
+            progress: Optional callback(elements_written, percent) while the export runs
+                      (elements_written is None for IfcConvert, which only reports percent)
+            cancel_event: Optional event that stops the export when set (from another thread)
 
         Returns:
             GltfExportResult with success status and details
 
         Raises:
             FileNotFoundError: If IFC file doesn't exist
+            ValueError: If options.engine is unknown, or instancing is requested from IfcConvert
         """
         # Validate input file
         if not os.path.exists(ifc_file_path):
@@ -105,21 +147,32 @@ def export(
         if options is None:
             options = GltfExportOptions()
 
+        if options.engine not in GLTF_ENGINES:
+            raise ValueError(f"Unknown glTF engine: {options.engine} (expected one of {', '.join(GLTF_ENGINES)})")
+
+        if options.instancing and options.engine != "ifcopenshell":
+            # IfcConvert writes a separate mesh for every occurrence
+            raise ValueError("Instancing requires the 'ifcopenshell' engine")
+
         # Ensure output has correct extension
         output_path = self._ensure_extension(output_path, format)
 
+        if options.engine == "ifcopenshell":
+            return self._export_in_process(ifc_file_path, output_path, format, options, progress, cancel_event)
+
         # Build IfcConvert command
         command = self._build_command(ifc_file_path, output_path, options)
 
         # Execute IfcConvert
         try:
-            result = subprocess.run(
+            runner = ProcessRunner(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=False  # Don't raise exception, we'll handle errors manually
+                timeout=options.timeout_seconds,
+                memory_limit_mb=options.memory_limit_mb,
+                progress=(lambda percent: progress(None, percent)) if progress is not None else None,
+                cancel_event=cancel_event
             )
+            result = runner.run()
 
             # Check if export succeeded
             if result.returncode == 0 and os.path.exists(output_path):
@@ -129,15 +182,31 @@ def export(
                     output_path=output_path,
                     file_size=file_size,
                     stdout=result.stdout,
-                    stderr=result.stderr
+                    stderr=result.stderr,
+                    duration_ms=result.duration_ms
                 )
             else:
-                error_msg = result.stderr or result.stdout or f"IfcConvert exited with code {result.returncode}"
+                if result.timed_out:
+                    error_msg = f"IfcConvert timed out after {options.timeout_seconds} seconds"
+                elif result.cancelled:
+                    error_msg = "Export cancelled"
+                elif result.returncode < 0:
+                    error_msg = f"IfcConvert terminated by signal {-result.returncode}"
+                else:
+                    error_msg = result.stderr or result.stdout or f"IfcConvert exited with code {result.returncode}"
+
+                if result.timed_out or result.cancelled:
+                    # Don't leave a half-written file behind
+                    self._remove_partial_output(output_path)
+
                 return GltfExportResult(
                     success=False,
                     error_message=error_msg,
                     stdout=result.stdout,
-                    stderr=result.stderr
+                    stderr=result.stderr,
+                    timed_out=result.timed_out,
+                    cancelled=result.cancelled,
+                    duration_ms=result.duration_ms
                 )
 
         except FileNotFoundError:
@@ -151,6 +220,65 @@ def export(
                 error_message=f"Unexpected error during export: {str(e)}"
             )
 
+    def _export_in_process(
+        self,
+        ifc_file_path: str,
+        output_path: str,
+        format: str,
+        options: GltfExportOptions,
+        progress: Optional[Callable[[Optional[int], float], None]],
+        cancel_event: Optional[threading.Event]
+    ) -> GltfExportResult:
+        """
+        Export with GeometryEngine on the cached model.
+
+        Args:
+            ifc_file_path: Path to input IFC file
+            output_path: Path to output file (extension already corrected)
+            format: Output format
+            options: Export options
+            progress: Optional progress callback
+            cancel_event: Optional cancel event
+
+        Returns:
+            GltfExportResult with export statistics
+        """
+        start_time = time.monotonic()
+        try:
+            statistics = self.geometry_engine.export(
+                ifc_file_path, output_path, options, format=format,
+                progress=progress, cancel_event=cancel_event
+            )
+        except NoGeometryError as e:
+            return GltfExportResult(success=False, error_message=str(e))
+        except TimeoutError:
+            return GltfExportResult(
+                success=False,
+                error_message=f"Export timed out after {options.timeout_seconds} seconds",
+                timed_out=True,
+                duration_ms=int((time.monotonic() - start_time) * 1000)
+            )
+        except ExportCancelledError:
+            return GltfExportResult(
+                success=False,
+                error_message="Export cancelled",
+                cancelled=True,
+                duration_ms=int((time.monotonic() - start_time) * 1000)
+            )
+        except Exception as e:
+            return GltfExportResult(
+                success=False,
+                error_message=f"Unexpected error during export: {str(e)}"
+            )
+
+        return GltfExportResult(
+            success=True,
+            output_path=output_path,
+            file_size=os.path.getsize(output_path),
+            statistics=statistics,
+            duration_ms=int((time.monotonic() - start_time) * 1000)
+        )
+
     def _build_command(
         self,
         ifc_file_path: str,
@@ -189,12 +317,23 @@ def _build_command(
         if options.y_up:
             command.append("--y-up")
 
+        # IfcConvert defaults to a single thread
+        command.extend(["--threads", str(options.threads or os.cpu_count() or 1)])
+
         # Add input and output files
         command.append(ifc_file_path)
         command.append(output_path)
 
         return command
 
+    @staticmethod
+    def _remove_partial_output(output_path: str) -> None:
+        """Delete an output file left behind by an interrupted export."""
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+
     def _ensure_extension(self, output_path: str, format: str) -> str:
         """
         Ensure output path has correct file extension.
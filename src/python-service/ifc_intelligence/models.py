@@ -5,7 +5,7 @@
 Independent implementation using IfcOpenShell API (LGPL).
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 
@@ -21,10 +21,15 @@ class IfcMetadata:
         model_id: GlobalId of the IfcProject
         project_name: Name of the IfcProject
         schema: IFC schema version (IFC2X3, IFC4, IFC4X3, etc.)
-        entity_counts: Count of each IFC entity type
+        entity_counts: Count of common IFC entity types (including subtypes)
         author: Author name from IfcOwnerHistory (optional)
         organization: Organization from IfcOwnerHistory (optional)
         application: Application that created the file (optional)
+        entity_histogram: Exact instance count of every entity class in the file
+        entity_rollups: Instance count of every class including its subtypes
+            (also abstract supertypes such as IfcBuildingElement)
+        entity_counts_approximate: True if entity_counts were extrapolated from
+            a sample of the file (IfcParser.parse_header())
     """
     model_id: str
     project_name: str
@@ -33,3 +38,6 @@ class IfcMetadata:
     author: Optional[str] = None
     organization: Optional[str] = None
     application: Optional[str] = None
+    entity_histogram: Dict[str, int] = field(default_factory=dict)
+    entity_rollups: Dict[str, int] = field(default_factory=dict)
+    entity_counts_approximate: bool = False
@@ -10,9 +10,46 @@
 """
 
 import ifcopenshell
+from dataclasses import asdict
 from typing import Dict, Optional
 from .models import IfcMetadata
 from .cache_manager import IfcCacheManager, get_global_cache
+from .artifact_cache import ArtifactCache, get_global_artifact_cache
+from .entity_histogram import count_entity_classes, rollup_entity_counts
+from .step_scanner import DEFAULT_SAMPLE_BYTES, StepFile, expand_subtypes
+
+
+# Common IFC entity types reported in entity_counts (counts include subtypes)
+# Selection based on typical BIM usage (not copied from Bonsai)
+COMMON_ENTITY_TYPES = [
+    # Building elements
+    "IfcWall",
+    "IfcWallStandardCase",
+    "IfcDoor",
+    "IfcWindow",
+    "IfcSlab",
+    "IfcBeam",
+    "IfcColumn",
+    "IfcStair",
+    "IfcRoof",
+    "IfcRailing",
+
+    # Spatial structure
+    "IfcSpace",
+    "IfcBuildingStorey",
+    "IfcBuilding",
+    "IfcSite",
+
+    # Furniture & Equipment
+    "IfcFurnishingElement",
+    "IfcFurniture",
+
+    # MEP elements (IFC4+)
+    "IfcPipeFitting",
+    "IfcPipeSegment",
+    "IfcDuctFitting",
+    "IfcDuctSegment",
+]
 
 
 class IfcParser:
@@ -25,14 +62,23 @@ class IfcParser:
     Supports caching for performance optimization.
     """
 
-    def __init__(self, cache_manager: Optional[IfcCacheManager] = None):
+    # Version of the metadata artifact; bump when the extracted metadata changes
+    ARTIFACT_VERSION = 2
+
+    def __init__(
+        self,
+        cache_manager: Optional[IfcCacheManager] = None,
+        artifact_cache: Optional[ArtifactCache] = None
+    ):
         """
         Initialize parser with optional cache.
 
         Args:
             cache_manager: Optional cache manager instance (uses global cache if None)
+            artifact_cache: Optional on-disk artifact cache (uses IFC_ARTIFACT_CACHE_DIR if None)
         """
         self.cache = cache_manager or get_global_cache()
+        self.artifacts = artifact_cache or get_global_artifact_cache()
 
     def parse_file(self, file_path: str) -> IfcMetadata:
         """
@@ -48,6 +94,12 @@ def parse_file(self, file_path: str) -> IfcMetadata:
             FileNotFoundError: If file doesn't exist
             RuntimeError: If IFC file is invalid
         """
+        # Metadata derived from the same file content earlier (no parsing needed)
+        if self.artifacts is not None:
+            cached = self.artifacts.get(file_path, "metadata", self.ARTIFACT_VERSION)
+            if cached is not None:
+                return IfcMetadata(**cached)
+
         # Open IFC file using cache (LGPL library)
         try:
             ifc_file = self.cache.get_or_load(file_path)
@@ -62,89 +114,145 @@ def parse_file(self, file_path: str) -> IfcMetadata:
         except (IndexError, KeyError):
             raise RuntimeError("No IfcProject found in file")
 
-        # Count entities by type
-        entity_counts = self._count_entities(ifc_file)
+        # Count all entity classes in one pass, then roll counts up the schema
+        entity_histogram = count_entity_classes(ifc_file)
+        entity_rollups = rollup_entity_counts(entity_histogram, self._schema_identifier(ifc_file))
+        entity_counts = self._count_entities(entity_rollups)
 
         # Extract authoring information
         author, org, app = self._extract_authoring_info(ifc_file)
 
-        return IfcMetadata(
+        metadata = IfcMetadata(
             model_id=project.GlobalId,
             project_name=project.Name or "Unnamed Project",
             schema=ifc_file.schema,
             entity_counts=entity_counts,
             author=author,
             organization=org,
-            application=app
+            application=app,
+            entity_histogram=entity_histogram,
+            entity_rollups=entity_rollups
         )
 
-    def _count_entities(self, ifc_file) -> Dict[str, int]:
+        if self.artifacts is not None:
+            self.artifacts.put(file_path, "metadata", self.ARTIFACT_VERSION, asdict(metadata))
+
+        return metadata
+
+    def parse_header(self, file_path: str, sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> IfcMetadata:
         """
-        Count common IFC entity types.
+        Extract metadata without parsing the model (fast path).
 
-        Strategy: Count frequently used building elements.
-        This is our own selection of relevant types.
-        Schema-aware: Only counts entity types that exist in the file's IFC schema version.
+        Memory-maps the file and reads only the HEADER section, the IfcProject
+        and the IfcOwnerHistory records. Entity counts are taken from a sample
+        of the DATA section and extrapolated, so they are approximate for files
+        with a DATA section larger than sample_bytes (entity_counts_approximate).
+        entity_histogram and entity_rollups are left empty; use parse_file()
+        for complete counts.
 
         Args:
-            ifc_file: Opened IfcOpenShell file object
+            file_path: Path to .ifc file
+            sample_bytes: Bytes of the DATA section scanned for entity counts
+
+        Returns:
+            IfcMetadata object with project info and (approximate) entity counts
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If the file is not a STEP file or has no IfcProject
+        """
+        with StepFile(file_path) as step:
+            header = step.read_header()
+
+            project = step.find_instance("IfcProject")
+            if project is None:
+                raise RuntimeError("No IfcProject found in file")
+            _, project_params = project
+
+            author, org, app = self._extract_header_authoring_info(step)
+
+            # Common types and their subtypes, counted as exact classes, then rolled up
+            schema_identifier = header.schema_identifier
+            entity_types = expand_subtypes(schema_identifier, COMMON_ENTITY_TYPES)
+            sampled, exact = step.sample_entity_counts(entity_types, sample_bytes)
+            entity_counts = self._count_entities(rollup_entity_counts(sampled, schema_identifier))
+
+        return IfcMetadata(
+            model_id=project_params[0],
+            project_name=(project_params[2] if len(project_params) > 2 else None) or "Unnamed Project",
+            schema=header.schema,
+            entity_counts=entity_counts,
+            author=author,
+            organization=org,
+            application=app,
+            entity_counts_approximate=not exact
+        )
+
+    def _extract_header_authoring_info(self, step: StepFile) -> tuple[str | None, str | None, str | None]:
+        """
+        Extract author, organization, and application from raw STEP records.
+
+        Same result as _extract_authoring_info() for the first IfcOwnerHistory.
+
+        Args:
+            step: Opened StepFile
+
+        Returns:
+            Tuple of (author_name, organization_name, application_name)
+        """
+        owner_history = step.find_instance("IfcOwnerHistory")
+        if owner_history is None:
+            return None, None, None
+        _, history = owner_history
+
+        author_name = None
+        org_name = None
+        app_name = None
+
+        # IfcOwnerHistory(OwningUser, OwningApplication, ...)
+        user = step.resolve(history[0] if history else None, "IfcPersonAndOrganization")
+        if user:
+            # IfcPersonAndOrganization(ThePerson, TheOrganization, Roles)
+            person = step.resolve(user[0], "IfcPerson")
+            if person and len(person) > 2 and (person[1] or person[2]):
+                # IfcPerson(Identification, FamilyName, GivenName, ...)
+                author_name = f"{person[2] or ''} {person[1] or ''}".strip()
+
+            organization = step.resolve(user[1] if len(user) > 1 else None, "IfcOrganization")
+            if organization and len(organization) > 1:
+                # IfcOrganization(Identification, Name, ...)
+                org_name = organization[1]
+
+        application = step.resolve(history[1] if len(history) > 1 else None, "IfcApplication")
+        if application and len(application) > 2:
+            # IfcApplication(ApplicationDeveloper, Version, ApplicationFullName, ApplicationIdentifier)
+            app_name = application[2]
+
+        return author_name, org_name, app_name
+
+    def _count_entities(self, entity_rollups: Dict[str, int]) -> Dict[str, int]:
+        """
+        Select the counts of common IFC entity types.
+
+        Counts include subtypes (like by_type()); types that don't exist in the
+        file or its schema version are left out.
+
+        Args:
+            entity_rollups: Per-class counts including subtypes
 
         Returns:
             Dictionary mapping entity type names to counts
         """
-        # Common IFC entity types to count (compatible with IFC2X3 and IFC4)
-        # Selection based on typical BIM usage (not copied from Bonsai)
-        types_to_count = [
-            # Building elements (IFC2X3+)
-            "IfcWall",
-            "IfcWallStandardCase",
-            "IfcDoor",
-            "IfcWindow",
-            "IfcSlab",
-            "IfcBeam",
-            "IfcColumn",
-            "IfcStair",
-            "IfcRoof",
-            "IfcRailing",
-
-            # Spatial structure (IFC2X3+)
-            "IfcSpace",
-            "IfcBuildingStorey",
-            "IfcBuilding",
-            "IfcSite",
-
-            # Furniture & Equipment (IFC2X3+)
-            "IfcFurnishingElement",
-            "IfcFurniture",
-        ]
-
-        # IFC4-specific entity types (not available in IFC2X3)
-        ifc4_specific_types = [
-            # MEP elements (IFC4+)
-            "IfcPipeFitting",
-            "IfcPipeSegment",
-            "IfcDuctFitting",
-            "IfcDuctSegment",
-        ]
-
-        # Get schema version
-        schema = ifc_file.schema
-
-        # Add IFC4-specific types if schema supports them
-        if schema.startswith('IFC4') or schema.startswith('IFC5'):
-            types_to_count.extend(ifc4_specific_types)
-
-        counts = {}
-        for entity_type in types_to_count:
-            try:
-                entities = ifc_file.by_type(entity_type)
-                if entities:
-                    counts[entity_type] = len(entities)
-            except RuntimeError:
-                # Entity type doesn't exist in this schema version, skip it
-                pass
-
-        return counts
+        return {
+            entity_type: entity_rollups[entity_type]
+            for entity_type in COMMON_ENTITY_TYPES
+            if entity_rollups.get(entity_type)
+        }
+
+    @staticmethod
+    def _schema_identifier(ifc_file) -> str:
+        """Full schema identifier (e.g. IFC4X3_ADD2) for schema lookups."""
+        return getattr(ifc_file, "schema_identifier", None) or ifc_file.schema
 
     def _extract_authoring_info(self, ifc_file) -> tuple[str | None, str | None, str | None]:
         """
@@ -0,0 +1,261 @@
+"""
+Revision Processing Pipeline
+
+Runs all upload stages (metadata, spatial tree, bulk elements, glTF export)
+against a single opened IFC file.
+
+The file is opened once through IfcCacheManager; every in-process stage then
+gets the already parsed model from the cache instead of parsing it again.
+The glTF export runs IfcConvert as a subprocess, so it is started first and
+runs concurrently with the in-process stages. The in-process stages share
+the parsed model (and the GIL) and therefore run one after another. With
+options.engine="ifcopenshell" the export tessellates the cached model
+instead. ifcopenshell.file is not thread-safe, so this export is started
+only after the other stages have finished and never overlaps them.
+
+License: MIT (our code) + LGPL (IfcOpenShell library)
+"""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Literal, Optional
+
+from .cache_manager import IfcCacheManager, get_global_cache
+from .parser import IfcParser
+from .spatial_tree_extractor import SpatialTreeExtractor
+from .bulk_element_extractor import BulkElementExtractor
+from .gltf_exporter import GltfExporter, GltfExportOptions
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# All pipeline stages, in execution order
+PIPELINE_STAGES = ("metadata", "spatial_tree", "elements", "gltf")
+
+
+class RevisionPipeline:
+    """
+    Process a revision upload with a single IFC parse.
+
+    Usage:
+        pipeline = RevisionPipeline()
+        result = pipeline.process("model.ifc", gltf_output_path="model.glb")
+        print(result["metrics"]["timings"])
+    """
+
+    def __init__(self, cache_manager: Optional[IfcCacheManager] = None, ifcconvert_path: str = "IfcConvert"):
+        """
+        Initialize the pipeline.
+
+        Args:
+            cache_manager: Optional cache manager instance (uses global cache if None)
+            ifcconvert_path: Path to IfcConvert binary used for glTF export
+        """
+        self.cache = cache_manager or get_global_cache()
+        self.parser = IfcParser(cache_manager=self.cache)
+        self.spatial_extractor = SpatialTreeExtractor(cache_manager=self.cache)
+        self.bulk_extractor = BulkElementExtractor(cache_manager=self.cache)
+        self.gltf_exporter = GltfExporter(ifcconvert_path=ifcconvert_path, cache_manager=self.cache)
+
+    def process(
+        self,
+        file_path: str,
+        gltf_output_path: Optional[str] = None,
+        gltf_format: Literal["glb", "gltf"] = "glb",
+        gltf_options: Optional[GltfExportOptions] = None,
+        stages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline stages for one IFC file.
+
+        Args:
+            file_path: Path to the IFC file
+            gltf_output_path: Output path for the glTF/GLB file (glTF stage is skipped if None)
+            gltf_format: Output format ('glb' or 'gltf')
+            gltf_options: Export options (uses defaults if None)
+            stages: Stages to run (default: all of PIPELINE_STAGES)
+
+        Returns:
+            Combined result with one key per stage plus "metrics":
+            {
+                "metadata": {...},
+                "spatial_tree": {...},
+                "elements": [...],
+                "gltf": {...},
+                "metrics": {"start_time": ..., "timings": {...}, "statistics": {...}, "warnings": [...], "end_time": ...}
+            }
+            Stages that were skipped or failed are None; failures are listed in metrics["warnings"].
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If file cannot be opened
+            ValueError: If an unknown stage is requested
+        """
+        stages = set(stages) if stages is not None else set(PIPELINE_STAGES)
+        unknown = stages - set(PIPELINE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stage(s): {', '.join(sorted(unknown))}")
+
+        if gltf_output_path is None:
+            stages.discard("gltf")
+
+        start_time = time.time()
+        metrics = {
+            "start_time": datetime.utcnow().isoformat(),
+            "timings": {},
+            "statistics": {},
+            "warnings": []
+        }
+        result: Dict[str, Any] = {stage: None for stage in PIPELINE_STAGES}
+
+        logger.info("pipeline_started", file_path=file_path, stages=sorted(stages))
+
+        # The in-process engine walks the shared model, so it must not overlap the other stages
+        in_process_gltf = gltf_options is not None and gltf_options.engine == "ifcopenshell"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # IfcConvert parses the file in its own process, start it right away
+            gltf_future = None
+            if "gltf" in stages and not in_process_gltf:
+                gltf_future = executor.submit(
+                    self._run_gltf, file_path, gltf_output_path, gltf_format, gltf_options
+                )
+
+            # Single parse, shared by all in-process stages via the cache. Holding
+            # the model keeps it reachable for the stages even if the cache policy
+            # declines to cache it (it is pinned while referenced)
+            parse_start = time.time()
+            ifc_file = self.cache.get_or_load(file_path)
+            metrics["timings"]["parse_ms"] = int((time.time() - parse_start) * 1000)
+
+            if "metadata" in stages:
+                result["metadata"] = self._run_stage(
+                    "metadata", "metadata_ms", metrics,
+                    lambda: asdict(self.parser.parse_file(file_path))
+                )
+
+            if "spatial_tree" in stages:
+                result["spatial_tree"] = self._run_stage(
+                    "spatial_tree", "spatial_tree_ms", metrics,
+                    lambda: self.spatial_extractor.extract_tree(file_path).to_dict()
+                )
+
+            if "elements" in stages:
+                result["elements"] = self._run_stage(
+                    "elements", "element_extraction_ms", metrics,
+                    lambda: self.bulk_extractor.extract_all_elements(file_path)
+                )
+
+            if "gltf" in stages and in_process_gltf:
+                gltf_future = executor.submit(
+                    self._run_gltf, file_path, gltf_output_path, gltf_format, gltf_options
+                )
+
+            if gltf_future is not None:
+                gltf_result, gltf_time_ms = gltf_future.result()
+                result["gltf"] = gltf_result
+                metrics["timings"]["gltf_export_ms"] = gltf_time_ms
+                if not gltf_result["success"]:
+                    metrics["warnings"].append(f"Stage 'gltf' failed: {gltf_result['error_message']}")
+
+        metrics["statistics"] = self._collect_statistics(result)
+        metrics["timings"]["total_ms"] = int((time.time() - start_time) * 1000)
+        metrics["end_time"] = datetime.utcnow().isoformat()
+        result["metrics"] = metrics
+
+        logger.info("pipeline_completed", file_path=file_path,
+                    total_ms=metrics["timings"]["total_ms"], warnings=len(metrics["warnings"]))
+
+        return result
+
+    def _run_stage(self, stage: str, timing_key: str, metrics: Dict[str, Any], func) -> Any:
+        """
+        Run one in-process stage, recording its timing and any failure.
+
+        Args:
+            stage: Stage name (for warnings and logging)
+            timing_key: Key in metrics["timings"]
+            metrics: Metrics dictionary to update
+            func: Callable producing the stage result
+
+        Returns:
+            Stage result, or None if the stage failed
+        """
+        stage_start = time.time()
+        try:
+            return func()
+        except Exception as e:
+            logger.warning("pipeline_stage_failed", stage=stage, error=str(e))
+            metrics["warnings"].append(f"Stage '{stage}' failed: {str(e)}")
+            return None
+        finally:
+            metrics["timings"][timing_key] = int((time.time() - stage_start) * 1000)
+
+    def _run_gltf(
+        self,
+        file_path: str,
+        output_path: str,
+        format: str,
+        options: Optional[GltfExportOptions]
+    ) -> tuple[Dict[str, Any], int]:
+        """Run the glTF export and return (result dict, time in ms)."""
+        export_start = time.time()
+        result = self.gltf_exporter.export(
+            ifc_file_path=file_path,
+            output_path=output_path,
+            format=format,
+            options=options
+        )
+        export_time_ms = int((time.time() - export_start) * 1000)
+
+        # Omit stdout/stderr (can be large), same as scripts/export_gltf.py
+        return {
+            "success": result.success,
+            "output_path": result.output_path,
+            "file_size": result.file_size,
+            "error_message": result.error_message,
+            "statistics": result.statistics,
+            "timed_out": result.timed_out,
+            "cancelled": result.cancelled
+        }, export_time_ms
+
+    def _collect_statistics(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build metrics["statistics"] from the stage results."""
+        statistics: Dict[str, Any] = {}
+
+        if result["elements"] is not None:
+            elements = result["elements"]
+            statistics["total_elements"] = len(elements)
+            statistics["element_type_counts"] = dict(Counter(elem["element_type"] for elem in elements))
+            statistics["duplicates_avoided"] = self.bulk_extractor.enumeration_stats.get("duplicates_avoided", 0)
+            statistics["type_pset_cache"] = self.bulk_extractor.get_type_pset_cache_stats()
+
+        if result["spatial_tree"] is not None:
+            tree_depth, node_count = _tree_stats(result["spatial_tree"])
+            statistics["tree_depth"] = tree_depth
+            statistics["node_count"] = node_count
+
+        if result["gltf"] is not None:
+            statistics["gltf_file_size_bytes"] = result["gltf"]["file_size"]
+
+        return statistics
+
+
+def _tree_stats(tree: Dict[str, Any]) -> tuple[int, int]:
+    """Calculate max depth and total node count of a serialized spatial tree."""
+    max_depth = 0
+    node_count = 0
+    stack = [(tree, 0)]
+
+    while stack:
+        node, depth = stack.pop()
+        node_count += 1
+        max_depth = max(max_depth, depth)
+        for child in node.get("children") or []:
+            stack.append((child, depth + 1))
+
+    return max_depth, node_count
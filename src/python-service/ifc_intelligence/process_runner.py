@@ -0,0 +1,299 @@
+"""
+Cancellable Subprocess Runner
+
+Runs an external converter (IfcConvert) with a wall-clock timeout, an
+optional address-space limit and cancellation, and reports progress parsed
+from its output while it runs.
+
+subprocess.run() blocks until the child exits: a model that makes IfcConvert
+loop or swap would hang the worker forever, and nothing is known about the
+export until it finishes. ProcessRunner reads stdout/stderr on background
+threads, feeds every output line (IfcConvert redraws its progress bar with
+carriage returns) to a progress parser, and polls the child so a timeout or
+a cancel request terminates it (SIGTERM, then SIGKILL after a grace period).
+
+The child runs in its own session, so the whole process group is terminated.
+The memory limit is set with setrlimit(RLIMIT_AS) in the child before it
+execs the command (POSIX), so the command never runs without it; allocations
+beyond it fail inside the child, which then exits with an error instead of
+pushing the host into swap.
+
+License: MIT
+"""
+
+import os
+import re
+import codecs
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Seconds between checks for timeout/cancellation
+POLL_INTERVAL = 0.1
+
+# Seconds between SIGTERM and SIGKILL
+TERMINATE_GRACE_PERIOD = 5.0
+
+_READ_CHUNK_SIZE = 4096
+
+# IfcConvert progress bar: "[#########                    ]" (one '#' per 2%)
+_PROGRESS_BAR = re.compile(r"\[(#*)( *)\]")
+# Plain percentages ("Creating geometry... 42%")
+_PROGRESS_PERCENT = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*%")
+_LINE_BREAK = re.compile(r"[\r\n]")
+
+
+def parse_progress(line: str) -> Optional[float]:
+    """
+    Extract the percent complete from one line of IfcConvert output.
+
+    Args:
+        line: Output line (without line break)
+
+    Returns:
+        Percent complete (0..100), or None if the line carries no progress
+    """
+    bar = _PROGRESS_BAR.search(line)
+    if bar is not None:
+        width = len(bar.group(1)) + len(bar.group(2))
+        if width:
+            return len(bar.group(1)) * 100.0 / width
+
+    percent = _PROGRESS_PERCENT.search(line)
+    if percent is not None:
+        return min(float(percent.group(1)), 100.0)
+
+    return None
+
+
+@dataclass
+class ProcessResult:
+    """
+    Result of a ProcessRunner run.
+
+    Attributes:
+        returncode: Exit code (negative: terminated by that signal)
+        stdout: Captured standard output
+        stderr: Captured standard error
+        timed_out: Terminated because the timeout expired
+        cancelled: Terminated because of a cancel request
+        duration_ms: Wall-clock run time
+    """
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    cancelled: bool = False
+    duration_ms: int = 0
+
+
+class ProcessRunner:
+    """
+    Run a command with timeout, memory limit, cancellation and progress reporting.
+
+    Usage:
+        runner = ProcessRunner(["IfcConvert", "--threads", "4", "model.ifc", "model.glb"],
+                               timeout=600, memory_limit_mb=4096,
+                               progress=lambda percent: logger.info("export_progress", percent=percent))
+        result = runner.run()            # runner.cancel() from another thread stops it
+        if result.timed_out: ...
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        progress: Optional[Callable[[float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            command: Command and arguments
+            timeout: Wall-clock limit in seconds (None = no limit)
+            memory_limit_mb: Address-space limit of the child in MB (None = no limit)
+            progress: Optional callback(percent) whenever the parsed progress increases
+            cancel_event: Optional event that cancels the run when set
+        """
+        self.command = command
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.progress = progress
+        self.cancel_event = cancel_event or threading.Event()
+
+        self.percent = 0.0
+        self._progress_lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Request termination of the running command (thread-safe)."""
+        self.cancel_event.set()
+
+    def run(self) -> ProcessResult:
+        """
+        Run the command to completion, timeout or cancellation.
+
+        Returns:
+            ProcessResult with exit code and captured output
+
+        Raises:
+            FileNotFoundError: If the executable doesn't exist
+        """
+        start_time = time.monotonic()
+        deadline = start_time + self.timeout if self.timeout is not None else None
+
+        process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+            preexec_fn=self._memory_limit_preexec()
+        )
+
+        stdout_chunks: List[str] = []
+        stderr_chunks: List[str] = []
+        readers = [
+            threading.Thread(target=self._read_stream, args=(process.stdout, stdout_chunks), daemon=True),
+            threading.Thread(target=self._read_stream, args=(process.stderr, stderr_chunks), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        cancelled = False
+        while True:
+            try:
+                process.wait(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            if self.cancel_event.is_set():
+                cancelled = True
+            elif deadline is not None and time.monotonic() >= deadline:
+                timed_out = True
+            else:
+                continue
+
+            logger.warning("process_terminating", command=self.command[0], pid=process.pid,
+                           reason="timeout" if timed_out else "cancelled")
+            self._terminate(process)
+            break
+
+        for reader in readers:
+            reader.join()
+
+        result = ProcessResult(
+            returncode=process.returncode,
+            stdout="".join(stdout_chunks),
+            stderr="".join(stderr_chunks),
+            timed_out=timed_out,
+            cancelled=cancelled,
+            duration_ms=int((time.monotonic() - start_time) * 1000)
+        )
+        logger.debug("process_finished", command=self.command[0], returncode=result.returncode,
+                     duration_ms=result.duration_ms, timed_out=timed_out, cancelled=cancelled)
+        return result
+
+    def _read_stream(self, stream, chunks: List[str]) -> None:
+        """Collect a pipe's output and parse progress from it as it arrives."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        with stream:
+            while True:
+                data = stream.read1(_READ_CHUNK_SIZE)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                chunks.append(text)
+
+                lines = _LINE_BREAK.split(pending + text)
+                pending = lines.pop()
+                for line in lines:
+                    self._report_progress(line)
+                # The progress bar is redrawn after "\r" without a line break, so
+                # the unterminated rest is parsed too (a partial bar never matches)
+                self._report_progress(pending)
+
+        chunks.append(decoder.decode(b"", final=True))
+
+    def _report_progress(self, line: str) -> None:
+        """Forward increased progress to the callback."""
+        percent = parse_progress(line)
+        if percent is None:
+            return
+        with self._progress_lock:
+            if percent <= self.percent:
+                return
+            self.percent = percent
+        if self.progress is not None:
+            self.progress(percent)
+
+    def _memory_limit_preexec(self) -> Optional[Callable[[], None]]:
+        """
+        Function that limits the child's address space between fork and exec.
+
+        The limit is computed here, in the parent: the function only calls
+        setrlimit(), which is safe to run in the forked child.
+
+        Returns:
+            preexec_fn for Popen, or None without a limit (or on platforms without setrlimit)
+        """
+        if self.memory_limit_mb is None:
+            return None
+        if resource is None:
+            logger.warning("memory_limit_unsupported", memory_limit_mb=self.memory_limit_mb)
+            return None
+
+        limit = int(self.memory_limit_mb * 1024 * 1024)
+        # An unprivileged process cannot raise its hard limit
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY and limit > hard:
+            logger.warning("memory_limit_above_hard_limit", memory_limit_mb=self.memory_limit_mb, hard_limit=hard)
+            limit = hard
+
+        def set_limit() -> None:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+        return set_limit
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen) -> None:
+        """SIGTERM the child's process group, SIGKILL it if it doesn't exit in time."""
+        ProcessRunner._signal(process, signal.SIGTERM)
+        try:
+            process.wait(timeout=TERMINATE_GRACE_PERIOD)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+
+        ProcessRunner._signal(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        process.wait()
+
+    @staticmethod
+    def _signal(process: subprocess.Popen, sig: int) -> None:
+        """Send a signal to the child's process group (the child itself without killpg)."""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)
+            elif sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
@@ -11,9 +11,37 @@
 
 import ifcopenshell
 import ifcopenshell.util.element
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Mapping
+from dataclasses import asdict, dataclass, field
 from .cache_manager import IfcCacheManager, get_global_cache
+from .artifact_cache import ArtifactCache, get_global_artifact_cache
+from .property_index import PropertySetIndex
+
+
+class FrozenPropertyDict(dict):
+    """
+    Read-only dictionary for property data shared between elements.
+
+    Cleaned type-object property sets are computed once and shared by every
+    occurrence of the type, so they must not be modified in place.
+    Still a dict subclass, so json.dumps() and dataclasses.asdict() work as usual.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared property data is read-only; copy it with dict() before modifying")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle would otherwise rebuild the dict via __setitem__
+        return (type(self), (dict(self),))
 
 
 @dataclass
@@ -49,16 +77,39 @@ class PropertyExtractor:
     Supports caching for performance optimization.
     """
 
-    def __init__(self, ifc_file_path: Optional[str] = None, cache_manager: Optional[IfcCacheManager] = None):
+    # Version of the per-element properties artifact; bump when the extracted properties change
+    # (2: nested values of complex/bounded/table properties cleaned recursively;
+    #  3: referenced entities reduced to class and scalar attributes)
+    ARTIFACT_VERSION = 3
+
+    def __init__(
+        self,
+        ifc_file_path: Optional[str] = None,
+        cache_manager: Optional[IfcCacheManager] = None,
+        artifact_cache: Optional[ArtifactCache] = None
+    ):
         """
         Initialize the property extractor.
 
         Args:
             ifc_file_path: Optional path to IFC file to open immediately
             cache_manager: Optional cache manager instance (uses global cache if None)
+            artifact_cache: Optional on-disk artifact cache (uses IFC_ARTIFACT_CACHE_DIR if None)
         """
         self.ifc_file = None
         self.cache = cache_manager or get_global_cache()
+        self.artifacts = artifact_cache or get_global_artifact_cache()
+        self.property_index: Optional[PropertySetIndex] = None
+
+        # Cleaned property sets per IfcTypeObject id, shared by all occurrences
+        self._type_pset_cache: Dict[int, Mapping[str, Mapping[str, Any]]] = {}
+        self._type_pset_cache_file = None
+        self.type_pset_cache_hits = 0
+        self.type_pset_cache_misses = 0
+
+        # Drop the model and everything built on it when the cache evicts it
+        self.cache.add_release_listener(self._release_file)
+
         if ifc_file_path:
             self.open_file(ifc_file_path)
 
@@ -80,6 +131,16 @@ def open_file(self, ifc_file_path: str) -> None:
         except RuntimeError as e:
             raise RuntimeError(f"Failed to open IFC file: {str(e)}")
 
+    def _release_file(self, ifc_file: ifcopenshell.file) -> None:
+        """Forget a model that left the cache, so it can be freed."""
+        if self.ifc_file is ifc_file:
+            self.ifc_file = None
+        if self.property_index is not None and self.property_index.ifc_file is ifc_file:
+            self.property_index = None
+        if self._type_pset_cache_file is ifc_file:
+            self._type_pset_cache = {}
+            self._type_pset_cache_file = None
+
     def get_element_by_guid(self, global_id: str):
         """
         Get an IFC element by its GlobalId.
@@ -102,6 +163,28 @@ def get_element_by_guid(self, global_id: str):
             # Element not found
             return None
 
+    def build_property_index(self) -> PropertySetIndex:
+        """
+        Build a relationship index for the loaded file (bulk extraction).
+
+        Scans all IfcRelDefinesByProperties / IfcRelDefinesByType once so that
+        following extractions don't walk inverse relationships per element.
+        The index is rebuilt only if a different file was opened.
+
+        Returns:
+            PropertySetIndex for the loaded file
+
+        Raises:
+            RuntimeError: If no IFC file is loaded
+        """
+        if not self.ifc_file:
+            raise RuntimeError("No IFC file loaded. Call open_file() first.")
+
+        if self.property_index is None or self.property_index.ifc_file is not self.ifc_file:
+            self.property_index = PropertySetIndex(self.ifc_file)
+
+        return self.property_index
+
     def extract_properties(self, global_id: str) -> IfcElementProperties:
         """
         Extract all properties for an IFC element by GlobalId.
@@ -123,14 +206,28 @@ def extract_properties(self, global_id: str) -> IfcElementProperties:
         if not element:
             raise RuntimeError(f"Element not found with GlobalId: {global_id}")
 
+        return self.extract_element_properties(element)
+
+    def extract_element_properties(self, element: ifcopenshell.entity_instance) -> IfcElementProperties:
+        """
+        Extract all properties for an already resolved IFC element.
+
+        Args:
+            element: IFC element instance of the loaded file
+
+        Returns:
+            IfcElementProperties object with all property data
+        """
+        global_id = element.GlobalId
+
         # Extract basic attributes
         element_type = element.is_a()
         name = getattr(element, 'Name', None)
         description = getattr(element, 'Description', None)
 
-        # Extract PropertySets using IfcOpenShell utility
-        # This uses ifcopenshell.util.element.get_psets() which is the recommended approach
-        psets = ifcopenshell.util.element.get_psets(element)
+        # Extract PropertySets: from the relationship index if one was built for
+        # this file, otherwise via ifcopenshell.util.element.get_psets() (same result)
+        psets = self._get_cleaned_psets(element)
 
         # Separate PropertySets, Quantities, and Type properties
         property_sets = {}
@@ -140,12 +237,12 @@ def extract_properties(self, global_id: str) -> IfcElementProperties:
         for pset_name, pset_data in psets.items():
             # Check if this is a quantity set (starts with "Qto_")
             if pset_name.startswith("Qto_"):
-                quantities[pset_name] = self._clean_property_dict(pset_data)
+                quantities[pset_name] = pset_data
             # Check if this is from the element type
             elif pset_name.endswith("Type") or "Type." in pset_name:
-                type_properties[pset_name] = self._clean_property_dict(pset_data)
+                type_properties[pset_name] = pset_data
             else:
-                property_sets[pset_name] = self._clean_property_dict(pset_data)
+                property_sets[pset_name] = pset_data
 
         return IfcElementProperties(
             global_id=global_id,
@@ -157,6 +254,84 @@ def extract_properties(self, global_id: str) -> IfcElementProperties:
             type_properties=type_properties
         )
 
+    def get_type_pset_cache_stats(self) -> Dict[str, int]:
+        """
+        Get statistics of the type-object property set cache.
+
+        Returns:
+            Dictionary with hits, misses and number of cached types
+        """
+        return {
+            "hits": self.type_pset_cache_hits,
+            "misses": self.type_pset_cache_misses,
+            "cached_types": len(self._type_pset_cache),
+        }
+
+    def _get_cleaned_psets(self, element: ifcopenshell.entity_instance) -> Dict[str, Mapping[str, Any]]:
+        """
+        Get cleaned property sets of an element, including inherited type psets.
+
+        Type psets are cleaned once per IfcTypeObject and shared (read-only) by
+        all occurrences; only the occurrence's own psets are read per element.
+        The result equals cleaning every entry of get_psets(element).
+
+        Args:
+            element: IFC element instance
+
+        Returns:
+            Dictionary mapping pset name to cleaned property dictionary
+        """
+        use_index = self.property_index is not None and self.property_index.ifc_file is self.ifc_file
+
+        if element.is_a("IfcTypeObject") or not hasattr(element, "IsDefinedBy"):
+            psets = self.property_index.get_psets(element) if use_index else ifcopenshell.util.element.get_psets(element)
+            return {name: self._clean_property_dict(data) for name, data in psets.items()}
+
+        if use_index:
+            element_type = self.property_index.get_type(element)
+            occurrence_psets = self.property_index.get_occurrence_psets(element)
+        else:
+            element_type = ifcopenshell.util.element.get_type(element)
+            occurrence_psets = ifcopenshell.util.element.get_psets(element, should_inherit=False)
+
+        cleaned: Dict[str, Mapping[str, Any]] = {}
+        if element_type is not None:
+            cleaned.update(self._get_type_psets(element_type))
+
+        # Occurrence psets override / extend the inherited ones (same as get_psets)
+        for pset_name, pset_data in occurrence_psets.items():
+            occurrence_cleaned = self._clean_property_dict(pset_data)
+            if pset_name in cleaned:
+                merged = dict(cleaned[pset_name])
+                merged.update(occurrence_cleaned)
+                cleaned[pset_name] = merged
+            else:
+                cleaned[pset_name] = occurrence_cleaned
+
+        return cleaned
+
+    def _get_type_psets(self, element_type: ifcopenshell.entity_instance) -> Mapping[str, Mapping[str, Any]]:
+        """Get the cleaned, read-only property sets of a type object (memoized per file)."""
+        if self._type_pset_cache_file is not self.ifc_file:
+            self._type_pset_cache = {}
+            self._type_pset_cache_file = self.ifc_file
+
+        type_id = element_type.id()
+        cached = self._type_pset_cache.get(type_id)
+        if cached is not None:
+            self.type_pset_cache_hits += 1
+            return cached
+
+        self.type_pset_cache_misses += 1
+        use_index = self.property_index is not None and self.property_index.ifc_file is self.ifc_file
+        psets = self.property_index.get_psets(element_type) if use_index else ifcopenshell.util.element.get_psets(element_type)
+
+        cached = FrozenPropertyDict(
+            (name, FrozenPropertyDict(self._clean_property_dict(data))) for name, data in psets.items()
+        )
+        self._type_pset_cache[type_id] = cached
+        return cached
+
     def extract_properties_batch(self, global_ids: List[str]) -> Dict[str, IfcElementProperties]:
         """
         Extract properties for multiple elements in batch.
@@ -184,6 +359,53 @@ def extract_properties_batch(self, global_ids: List[str]) -> Dict[str, IfcElemen
 
         return results
 
+    def extract_properties_from_file(self, ifc_file_path: str, global_ids: List[str]) -> Dict[str, IfcElementProperties]:
+        """
+        Extract properties of elements of a file, using the artifact cache.
+
+        Elements whose properties were extracted from the same file content
+        before are read from the artifact cache; the IFC file is only opened
+        if at least one element is missing there.
+
+        Args:
+            ifc_file_path: Path to IFC file
+            global_ids: List of IFC GlobalIds
+
+        Returns:
+            Dictionary mapping GlobalId to IfcElementProperties (elements that
+            can't be found are skipped)
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If file cannot be opened
+        """
+        results = {}
+        missing = []
+        for global_id in global_ids:
+            cached = None
+            if self.artifacts is not None:
+                cached = self.artifacts.get(
+                    ifc_file_path, "properties", self.ARTIFACT_VERSION, {"global_id": global_id}
+                )
+            if cached is not None:
+                results[global_id] = IfcElementProperties(**cached)
+            else:
+                missing.append(global_id)
+
+        if not missing:
+            return results
+
+        self.open_file(ifc_file_path)
+        for global_id, properties in self.extract_properties_batch(missing).items():
+            results[global_id] = properties
+            if self.artifacts is not None:
+                self.artifacts.put(
+                    ifc_file_path, "properties", self.ARTIFACT_VERSION, asdict(properties), {"global_id": global_id}
+                )
+
+        # Keep the requested order
+        return {global_id: results[global_id] for global_id in global_ids if global_id in results}
+
     def get_all_elements_with_properties(self) -> List[str]:
         """
         Get GlobalIds of all elements that have properties.
@@ -222,15 +444,68 @@ def _clean_property_dict(self, pset_data: Dict[str, Any]) -> Dict[str, Any]:
             # Skip internal keys (starting with 'id' or containing metadata)
             if key in ['id', 'type']:
                 continue
-
-            # Convert non-serializable types to strings
-            if value is None:
-                cleaned[key] = None
-            elif isinstance(value, (str, int, float, bool)):
-                cleaned[key] = value
-            elif isinstance(value, (list, tuple)):
-                cleaned[key] = [str(v) if not isinstance(v, (str, int, float, bool)) else v for v in value]
-            else:
-                cleaned[key] = str(value)
+            cleaned[key] = self._clean_property_value(value)
 
         return cleaned
+
+    def _clean_property_value(self, value: Any) -> Any:
+        """
+        Convert a property value to JSON-serializable data without STEP ids.
+
+        Complex, bounded and table properties come back from get_psets() as
+        nested dictionaries holding 'id'/'type' keys and IfcValue instances;
+        they are cleaned recursively (nested dictionaries are read-only, as
+        they may be shared through the type pset cache). Other referenced
+        entities (units, the shape aspect of a predefined pset) are reduced
+        to a bounded reference, see _entity_reference().
+
+        Args:
+            value: Raw property value
+
+        Returns:
+            Cleaned value
+        """
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, dict):
+            return FrozenPropertyDict(self._clean_property_dict(value))
+        if isinstance(value, (list, tuple)):
+            return [self._clean_property_value(item) for item in value]
+        if isinstance(value, ifcopenshell.entity_instance):
+            # IfcValue select (IfcReal(2.), IfcLabel('x')): the wrapped value
+            if value.id() == 0 and hasattr(value, "wrappedValue"):
+                return self._clean_property_value(value.wrappedValue)
+            return self._entity_reference(value)
+
+        # Convert other non-serializable types to strings
+        return str(value)
+
+    @staticmethod
+    def _entity_reference(entity: ifcopenshell.entity_instance) -> FrozenPropertyDict:
+        """
+        Bounded, id-free description of an entity referenced by a property.
+
+        Only the entity class and its scalar attributes (one level, IfcValues
+        unwrapped) are kept. References to further entities are dropped, so a
+        shape aspect doesn't pull its representations into the properties.
+
+        Args:
+            entity: Referenced entity instance
+
+        Returns:
+            Read-only dictionary with "ifc_type" and the scalar attributes
+        """
+        reference = {"ifc_type": entity.is_a()}
+        for name, value in entity.get_info(recursive=False).items():
+            if name in ("id", "type"):
+                continue
+            if isinstance(value, ifcopenshell.entity_instance):
+                if value.id() != 0 or not hasattr(value, "wrappedValue"):
+                    continue
+                value = value.wrappedValue
+            if value is None or isinstance(value, (str, int, float, bool)):
+                reference[name] = value
+            elif isinstance(value, (list, tuple)) and all(isinstance(item, (str, int, float, bool)) for item in value):
+                reference[name] = list(value)
+
+        return FrozenPropertyDict(reference)
@@ -0,0 +1,156 @@
+"""
+Property Set Relationship Index
+
+Builds an element → property definitions index with one linear scan over
+IfcRelDefinesByProperties and IfcRelDefinesByType.
+
+ifcopenshell.util.element.get_psets() walks the inverse relationships of
+every element separately and re-reads shared property sets for every
+element they are attached to. For bulk extraction this index is built once
+per file; get_psets() then only looks up the element's definitions and
+reuses the already read property values.
+
+The returned dictionaries are identical to ifcopenshell.util.element.get_psets()
+(same keys, same values, same key order).
+
+License: MIT (our code) + LGPL (IfcOpenShell library)
+"""
+
+from typing import Any, Dict, List, Optional
+import ifcopenshell
+import ifcopenshell.util.element
+
+
+class PropertySetIndex:
+    """
+    Element → property set index for one IFC file.
+
+    Usage:
+        index = PropertySetIndex(ifc_file)
+        psets = index.get_psets(element)  # same result as util.element.get_psets(element)
+    """
+
+    def __init__(self, ifc_file: ifcopenshell.file):
+        """
+        Build the index for an opened IFC file.
+
+        Args:
+            ifc_file: Opened IfcOpenShell file object
+        """
+        self.ifc_file = ifc_file
+
+        # element id -> property definitions in IsDefinedBy order
+        self._definitions: Dict[int, List[ifcopenshell.entity_instance]] = {}
+        # element id -> IfcTypeObject
+        self._types: Dict[int, ifcopenshell.entity_instance] = {}
+        # definition id -> properties read via get_property_definition()
+        self._definition_props: Dict[int, Dict[str, Any]] = {}
+
+        self.relationship_count = 0
+        self._build()
+
+    def _build(self) -> None:
+        """Scan all IfcRelDefines relationships once."""
+        # Scanning the common parent IfcRelDefines in file order reproduces the
+        # order of the IsDefinedBy / IsTypedBy inverse attributes.
+        for rel in self.ifc_file.by_type("IfcRelDefines"):
+            if rel.is_a("IfcRelDefinesByProperties"):
+                definition = rel.RelatingPropertyDefinition
+                if definition is None:
+                    continue
+
+                # IfcPropertySetDefinitionSet wraps a list of definitions (IFC4+)
+                if definition.is_a("IfcPropertySetDefinitionSet"):
+                    definitions = list(definition.wrappedValue)
+                else:
+                    definitions = [definition]
+
+                for related in rel.RelatedObjects or []:
+                    self._definitions.setdefault(related.id(), []).extend(definitions)
+                self.relationship_count += 1
+
+            elif rel.is_a("IfcRelDefinesByType"):
+                relating_type = rel.RelatingType
+                for related in rel.RelatedObjects or []:
+                    # get_type() returns the first type relationship only
+                    self._types.setdefault(related.id(), relating_type)
+                self.relationship_count += 1
+
+    def get_type(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """
+        Get the type object of an element occurrence.
+
+        Args:
+            element: IFC element instance
+
+        Returns:
+            Related IfcTypeObject or None
+        """
+        if element.is_a("IfcTypeObject"):
+            return element
+        return self._types.get(element.id())
+
+    def get_psets(self, element: ifcopenshell.entity_instance) -> Dict[str, Dict[str, Any]]:
+        """
+        Get property sets and quantity sets of an element, including inherited type psets.
+
+        Args:
+            element: IFC element instance
+
+        Returns:
+            Dictionary in the same format as ifcopenshell.util.element.get_psets()
+        """
+        if element.is_a("IfcTypeObject"):
+            return self._merge({}, element.HasPropertySets or [])
+
+        if not hasattr(element, "IsDefinedBy"):
+            # Materials, profiles etc. are not indexed
+            return ifcopenshell.util.element.get_psets(element)
+
+        psets: Dict[str, Dict[str, Any]] = {}
+        element_type = self._types.get(element.id())
+        if element_type is not None:
+            psets = self._merge(psets, element_type.HasPropertySets or [])
+
+        return self._merge(psets, self._definitions.get(element.id(), []))
+
+    def get_occurrence_psets(self, element: ifcopenshell.entity_instance) -> Dict[str, Dict[str, Any]]:
+        """
+        Get property sets assigned to the element itself, without type inheritance.
+
+        Args:
+            element: IFC element occurrence
+
+        Returns:
+            Same format as ifcopenshell.util.element.get_psets(element, should_inherit=False)
+        """
+        return self._merge({}, self._definitions.get(element.id(), []))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with index sizes
+        """
+        return {
+            "relationships": self.relationship_count,
+            "indexed_elements": len(self._definitions),
+            "typed_elements": len(self._types),
+            "property_definitions_read": len(self._definition_props),
+        }
+
+    def _merge(self, psets: Dict[str, Dict[str, Any]], definitions) -> Dict[str, Dict[str, Any]]:
+        """Merge property definitions into psets (same semantics as get_psets)."""
+        for definition in definitions:
+            psets.setdefault(definition.Name, {}).update(self._read_definition(definition))
+        return psets
+
+    def _read_definition(self, definition: ifcopenshell.entity_instance) -> Dict[str, Any]:
+        """Read a property definition once and reuse it for all related elements."""
+        definition_id = definition.id()
+        props = self._definition_props.get(definition_id)
+        if props is None:
+            props = ifcopenshell.util.element.get_property_definition(definition)
+            self._definition_props[definition_id] = props
+        return props
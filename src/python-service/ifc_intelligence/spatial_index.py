@@ -0,0 +1,244 @@
+"""
+Spatial Containment Index
+
+Builds parent → children and element → container maps with one linear scan
+over IfcRelAggregates and IfcRelContainedInSpatialStructure (plus
+IfcRelVoidsElement / IfcRelFillsElement, so doors and windows that are only
+placed in an opening still find their storey).
+
+ifcopenshell.util.element.get_decomposition() walks the whole decomposition
+below an element every time it is called, so building a tree by calling it
+for every spatial node touches the contained elements once per ancestor.
+With this index each relationship is read once per file and every lookup is
+a dictionary access.
+
+Children are kept in file order of the relationships, followed by the order
+of their RelatedObjects / RelatedElements.
+
+get_spatial_location() resolves the building, storey and space of every
+element from these maps; locations of containers and hosts are memoized, so
+resolving all elements of a file stays linear.
+
+License: MIT (our code) + LGPL (IfcOpenShell library)
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import ifcopenshell
+
+
+# Spatial levels reported by get_spatial_location(), innermost last
+LOCATION_LEVELS = (
+    ("building", "IfcBuilding"),
+    ("storey", "IfcBuildingStorey"),
+    ("space", "IfcSpace"),
+)
+
+# (building, storey, space) GlobalIds
+_Location = Tuple[Optional[str], Optional[str], Optional[str]]
+_NO_LOCATION: _Location = (None, None, None)
+
+
+class SpatialIndex:
+    """
+    Spatial decomposition and containment index for one IFC file.
+
+    Usage:
+        index = SpatialIndex(ifc_file)
+        storeys = index.get_aggregated(building)
+        walls = index.get_contained(storey)
+        storey = index.get_container(wall)
+        location = index.get_spatial_location(door)  # {"building": ..., "storey": ..., "space": ...}
+    """
+
+    def __init__(self, ifc_file: ifcopenshell.file):
+        """
+        Build the index for an opened IFC file.
+
+        Args:
+            ifc_file: Opened IfcOpenShell file object
+        """
+        self.ifc_file = ifc_file
+
+        # parent id -> objects aggregated by it (IfcRelAggregates)
+        self._aggregated: Dict[int, List[ifcopenshell.entity_instance]] = {}
+        # spatial structure id -> elements contained in it (IfcRelContainedInSpatialStructure)
+        self._contained: Dict[int, List[ifcopenshell.entity_instance]] = {}
+        # element id -> spatial structure element containing it
+        self._container: Dict[int, ifcopenshell.entity_instance] = {}
+        # child id -> aggregating parent
+        self._aggregate_parent: Dict[int, ifcopenshell.entity_instance] = {}
+        # opening id -> voided element, filling element id -> opening
+        self._host: Dict[int, ifcopenshell.entity_instance] = {}
+        # element id -> location including the element itself (memo of get_spatial_location)
+        self._locations: Dict[int, _Location] = {}
+
+        self.relationship_count = 0
+        self._build()
+
+    def _build(self) -> None:
+        """Scan all aggregation and containment relationships once."""
+        for rel in self.ifc_file.by_type("IfcRelAggregates"):
+            parent = rel.RelatingObject
+            if parent is None:
+                continue
+            children = self._aggregated.setdefault(parent.id(), [])
+            for child in rel.RelatedObjects or []:
+                children.append(child)
+                self._aggregate_parent.setdefault(child.id(), parent)
+            self.relationship_count += 1
+
+        for rel in self.ifc_file.by_type("IfcRelContainedInSpatialStructure"):
+            structure = rel.RelatingStructure
+            if structure is None:
+                continue
+            elements = self._contained.setdefault(structure.id(), [])
+            for element in rel.RelatedElements or []:
+                elements.append(element)
+                # An element is contained in at most one spatial structure
+                self._container.setdefault(element.id(), structure)
+            self.relationship_count += 1
+
+        for rel in self.ifc_file.by_type("IfcRelVoidsElement"):
+            if rel.RelatingBuildingElement is not None and rel.RelatedOpeningElement is not None:
+                self._host.setdefault(rel.RelatedOpeningElement.id(), rel.RelatingBuildingElement)
+                self.relationship_count += 1
+
+        for rel in self.ifc_file.by_type("IfcRelFillsElement"):
+            if rel.RelatingOpeningElement is not None and rel.RelatedBuildingElement is not None:
+                self._host.setdefault(rel.RelatedBuildingElement.id(), rel.RelatingOpeningElement)
+                self.relationship_count += 1
+
+    def get_aggregated(self, element: ifcopenshell.entity_instance) -> List[ifcopenshell.entity_instance]:
+        """
+        Get the objects directly aggregated by an element (IsDecomposedBy).
+
+        Args:
+            element: IFC object instance
+
+        Returns:
+            List of child objects (empty if none)
+        """
+        return self._aggregated.get(element.id(), [])
+
+    def get_contained(self, element: ifcopenshell.entity_instance) -> List[ifcopenshell.entity_instance]:
+        """
+        Get the elements directly contained in a spatial structure element (ContainsElements).
+
+        Args:
+            element: IFC spatial structure element
+
+        Returns:
+            List of contained elements (empty if none)
+        """
+        return self._contained.get(element.id(), [])
+
+    def get_children(self, element: ifcopenshell.entity_instance) -> Iterator[ifcopenshell.entity_instance]:
+        """
+        Iterate over aggregated children followed by contained elements.
+
+        Args:
+            element: IFC object instance
+
+        Returns:
+            Iterator over direct children
+        """
+        yield from self.get_aggregated(element)
+        yield from self.get_contained(element)
+
+    def get_container(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """
+        Get the spatial structure element an element is contained in.
+
+        Args:
+            element: IFC element instance
+
+        Returns:
+            Containing spatial structure element, or None
+        """
+        return self._container.get(element.id())
+
+    def get_aggregate_parent(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """
+        Get the object that aggregates an element (Decomposes).
+
+        Args:
+            element: IFC object instance
+
+        Returns:
+            Aggregating parent, or None
+        """
+        return self._aggregate_parent.get(element.id())
+
+    def get_spatial_parent(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """
+        Get the next object up the spatial hierarchy.
+
+        Spatial containment wins over aggregation (a stair flight is aggregated
+        by its stair, which is contained in a storey), and elements that are
+        neither contained nor aggregated fall back to their opening's host.
+
+        Args:
+            element: IFC object instance
+
+        Returns:
+            Containing structure, aggregating parent, voided/filled host, or None
+        """
+        element_id = element.id()
+        return (
+            self._container.get(element_id)
+            or self._aggregate_parent.get(element_id)
+            or self._host.get(element_id)
+        )
+
+    def get_spatial_location(self, element: ifcopenshell.entity_instance) -> Dict[str, Optional[str]]:
+        """
+        Get the GlobalIds of the building, storey and space an element is located in.
+
+        The nearest enclosing element of each level wins. The element itself is
+        not part of its own location (a storey's "storey" is None).
+
+        Args:
+            element: IFC object instance
+
+        Returns:
+            Dictionary with "building", "storey" and "space" GlobalIds (None if not located)
+        """
+        parent = self.get_spatial_parent(element)
+        location = self._inclusive_location(parent) if parent is not None else _NO_LOCATION
+        return {level: guid for (level, _), guid in zip(LOCATION_LEVELS, location)}
+
+    def _inclusive_location(self, element: ifcopenshell.entity_instance) -> _Location:
+        """Location of an element, including the element itself (memoized)."""
+        # Walk up until a memoized ancestor (or the root), then fill in top-down
+        path = []
+        seen = set()
+        current: Optional[ifcopenshell.entity_instance] = element
+        while current is not None and current.id() not in self._locations and current.id() not in seen:
+            seen.add(current.id())
+            path.append(current)
+            current = self.get_spatial_parent(current)
+
+        location = self._locations.get(current.id(), _NO_LOCATION) if current is not None else _NO_LOCATION
+        for ancestor in reversed(path):
+            location = tuple(
+                ancestor.GlobalId if ancestor.is_a(entity_type) else guid
+                for (_, entity_type), guid in zip(LOCATION_LEVELS, location)
+            )
+            self._locations[ancestor.id()] = location
+        return location
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with index sizes
+        """
+        return {
+            "relationships": self.relationship_count,
+            "aggregating_parents": len(self._aggregated),
+            "spatial_containers": len(self._contained),
+            "contained_elements": len(self._container),
+            "hosted_elements": len(self._host),
+            "resolved_locations": len(self._locations),
+        }
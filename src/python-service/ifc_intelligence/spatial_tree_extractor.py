@@ -2,28 +2,41 @@
 Spatial Tree Extraction Module
 
 Extracts IFC spatial hierarchy (Project → Site → Building → Storey → Elements)
-using recursive traversal with IfcOpenShell API.
+from a one-pass containment index (see spatial_index.py) with IfcOpenShell API.
 
 This module is inspired by Bonsai's spatial tree concepts but independently implemented
 using the IfcOpenShell API (LGPL).
 
 Algorithm Concept:
 1. Start at IfcProject (root element)
-2. Recursively traverse via IfcRelAggregates (using get_decomposition helper)
-3. Build tree structure with parent-child relationships
+2. Index IfcRelAggregates and IfcRelContainedInSpatialStructure once
+3. Build tree structure iteratively from the index (no recursion limit)
 4. Include element metadata (GUID, name, type)
 
+Every spatial node carries a rollup of the elements below it (element count,
+count per type, summed quantities), computed bottom-up while the tree is
+built, so tree badges and dashboards don't need to scan elements.
+
+For viewers, get_root() / get_children() / get_node() page through a flat
+per-file index of the tree (SpatialTreeIndex) instead of shipping the whole
+hierarchy at once.
+
 References:
 - IfcOpenShell: https://ifcopenshell.org/
 - Bonsai concepts (inspiration only): https://bonsaibim.org/
 - IFC Standard: https://technical.buildingsmart.org/standards/ifc/
 """
 
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
 import ifcopenshell
 import ifcopenshell.util.element
 from .cache_manager import IfcCacheManager, get_global_cache
+from .artifact_cache import ArtifactCache, get_global_artifact_cache
+from .spatial_index import SpatialIndex
 
 
 # IFC spatial element types (from IFC standard)
@@ -36,6 +49,125 @@
     "IfcZone",
 }
 
+# Valid child types for each parent type
+# This enforces the correct hierarchy: Project → Site → Building → Storey → Space
+VALID_CHILD_TYPES = {
+    "IfcProject": {"IfcSite"},
+    "IfcSite": {"IfcBuilding"},
+    "IfcBuilding": {"IfcBuildingStorey"},
+    "IfcBuildingStorey": {"IfcSpace"},  # Spaces are leaf nodes
+    "IfcSpace": set(),  # Spaces have no spatial children
+}
+
+# Default number of children per page of the lazy tree API
+DEFAULT_PAGE_SIZE = 100
+
+# Decimal places of summed quantities in rollups
+ROLLUP_DIGITS = 6
+
+# Identification of SpatialNode.to_compact() output
+COMPACT_TREE_FORMAT = "spatial_tree_compact"
+COMPACT_TREE_VERSION = 1
+
+# Number of files whose tree index is kept in memory
+TREE_INDEX_CACHE_SIZE = 8
+
+
+def new_rollup() -> Dict[str, Any]:
+    """
+    Create an empty rollup of the elements below a spatial node.
+
+    Returns:
+        {"element_count": 0, "type_counts": {}, "quantities": {}} where
+        type_counts maps IFC type to count and quantities maps quantity set
+        name to summed quantity values (e.g. {"BaseQuantities": {"NetVolume": 12.5}})
+    """
+    return {"element_count": 0, "type_counts": {}, "quantities": {}}
+
+
+def add_element_to_rollup(
+    rollup: Dict[str, Any],
+    ifc_type: str,
+    quantity_sets: Iterable[Tuple[str, Dict[str, float]]]
+) -> None:
+    """
+    Count one element and add its quantities to a rollup.
+
+    Args:
+        rollup: Rollup to update (new_rollup())
+        ifc_type: IFC type of the element
+        quantity_sets: (quantity set name, {quantity name: value}) of the element
+    """
+    rollup["element_count"] += 1
+    rollup["type_counts"][ifc_type] = rollup["type_counts"].get(ifc_type, 0) + 1
+    for qto_name, values in quantity_sets:
+        sums = rollup["quantities"].setdefault(qto_name, {})
+        for name, value in values.items():
+            sums[name] = sums.get(name, 0) + value
+
+
+def merge_rollup(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """
+    Add the counts and sums of one rollup to another.
+
+    Args:
+        target: Rollup to update (parent node)
+        source: Rollup to add (child node)
+    """
+    target["element_count"] += source["element_count"]
+    for ifc_type, count in source["type_counts"].items():
+        target["type_counts"][ifc_type] = target["type_counts"].get(ifc_type, 0) + count
+    for qto_name, values in source["quantities"].items():
+        sums = target["quantities"].setdefault(qto_name, {})
+        for name, value in values.items():
+            sums[name] = sums.get(name, 0) + value
+
+
+def round_rollup(rollup: Dict[str, Any], digits: int = ROLLUP_DIGITS) -> None:
+    """Round summed quantities (removes floating point noise from the sums)."""
+    for values in rollup["quantities"].values():
+        for name, value in values.items():
+            values[name] = round(value, digits)
+
+
+def index_element_quantities(ifc_file: ifcopenshell.file) -> Dict[int, List[Tuple[str, Dict[str, float]]]]:
+    """
+    Read the quantity sets of all elements with one scan over IfcRelDefinesByProperties.
+
+    Only simple quantities (length, area, volume, count, weight, time) with a
+    value are read; quantity sets shared by several elements are read once.
+    Quantities inherited from type objects are not included.
+
+    Args:
+        ifc_file: Opened IfcOpenShell file object
+
+    Returns:
+        Dictionary mapping element id to (quantity set name, {quantity name: value}) tuples
+    """
+    element_quantities: Dict[int, List[Tuple[str, Dict[str, float]]]] = {}
+    # quantity set id -> values (shared definitions are read once)
+    read: Dict[int, Dict[str, float]] = {}
+
+    for rel in ifc_file.by_type("IfcRelDefinesByProperties"):
+        definition = rel.RelatingPropertyDefinition
+        if definition is None or not definition.is_a("IfcElementQuantity"):
+            continue
+
+        values = read.get(definition.id())
+        if values is None:
+            values = {}
+            for quantity in definition.Quantities or []:
+                # Simple quantities: Name, Description, Unit, <value>, ...
+                if quantity.is_a("IfcPhysicalSimpleQuantity") and isinstance(quantity[3], (int, float)):
+                    values[quantity.Name] = quantity[3]
+            read[definition.id()] = values
+
+        if values:
+            for related in rel.RelatedObjects or []:
+                element_quantities.setdefault(related.id(), []).append((definition.Name, values))
+
+    return element_quantities
+
 
 @dataclass
 class SpatialNode:
@@ -49,6 +181,8 @@ class SpatialNode:
         description: Optional element description
         long_name: Optional long name (for storeys, sites, etc.)
         children: List of child nodes in the hierarchy
+        rollup: Aggregates over the elements below a spatial node (see new_rollup()),
+                None for element leaves
     """
     global_id: str
     name: Optional[str]
@@ -56,10 +190,11 @@ class SpatialNode:
     description: Optional[str] = None
     long_name: Optional[str] = None
     children: List["SpatialNode"] = field(default_factory=list)
+    rollup: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
+        """Convert to dictionary for JSON serialization ("rollup" only for spatial nodes)."""
+        data = {
             "global_id": self.global_id,
             "name": self.name,
             "ifc_type": self.ifc_type,
@@ -67,15 +202,272 @@ def to_dict(self) -> Dict[str, Any]:
             "long_name": self.long_name,
             "children": [child.to_dict() for child in self.children]
         }
+        if self.rollup is not None:
+            data["rollup"] = self.rollup
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpatialNode":
+        """Rebuild a node (and its subtree) from to_dict() output."""
+        return cls(
+            global_id=data["global_id"],
+            name=data.get("name"),
+            ifc_type=data["ifc_type"],
+            description=data.get("description"),
+            long_name=data.get("long_name"),
+            children=[cls.from_dict(child) for child in data.get("children", [])],
+            rollup=data.get("rollup")
+        )
+
+    def to_compact(self) -> Dict[str, Any]:
+        """
+        Encode the tree as parallel arrays (see COMPACT_TREE_FORMAT).
+
+        Nodes are numbered breadth-first, so the children of every node occupy
+        the contiguous range first_child[i] .. first_child[i] + child_count[i].
+        Entity types are stored once in a string table; descriptions, long
+        names and rollups, which most nodes don't have, are stored sparsely
+        by node index.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        types: List[str] = []
+        type_ids: Dict[str, int] = {}
+        encoded: Dict[str, Any] = {
+            "format": COMPACT_TREE_FORMAT,
+            "version": COMPACT_TREE_VERSION,
+            "types": types,
+            "parent": [],
+            "type": [],
+            "global_id": [],
+            "name": [],
+            "first_child": [],
+            "child_count": [],
+            "description": {},
+            "long_name": {},
+            "rollup": {},
+        }
+
+        queue = [(self, -1)]
+        position = 0
+        # The queue itself is the breadth-first node order
+        while position < len(queue):
+            node, parent = queue[position]
+
+            type_id = type_ids.get(node.ifc_type)
+            if type_id is None:
+                type_id = type_ids[node.ifc_type] = len(types)
+                types.append(node.ifc_type)
+
+            encoded["parent"].append(parent)
+            encoded["type"].append(type_id)
+            encoded["global_id"].append(node.global_id)
+            encoded["name"].append(node.name)
+            encoded["first_child"].append(len(queue))
+            encoded["child_count"].append(len(node.children))
+            if node.description is not None:
+                encoded["description"][str(position)] = node.description
+            if node.long_name is not None:
+                encoded["long_name"][str(position)] = node.long_name
+            if node.rollup is not None:
+                encoded["rollup"][str(position)] = node.rollup
+
+            queue.extend((child, position) for child in node.children)
+            position += 1
+
+        encoded["count"] = position
+        return encoded
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> "SpatialNode":
+        """
+        Rebuild a tree from to_compact() output.
+
+        Args:
+            data: Compact encoding
+
+        Returns:
+            Root node with its full subtree
+
+        Raises:
+            ValueError: If the data is not a supported compact tree
+        """
+        if data.get("format") != COMPACT_TREE_FORMAT or data.get("version") != COMPACT_TREE_VERSION:
+            raise ValueError("Unsupported compact spatial tree encoding")
+        if not data["count"]:
+            raise ValueError("Compact spatial tree has no nodes")
+
+        types = data["types"]
+        descriptions = data.get("description", {})
+        long_names = data.get("long_name", {})
+        rollups = data.get("rollup", {})
+
+        nodes = [
+            cls(
+                global_id=global_id,
+                name=name,
+                ifc_type=types[type_id],
+                description=descriptions.get(str(position)),
+                long_name=long_names.get(str(position)),
+                rollup=rollups.get(str(position)),
+            )
+            for position, (global_id, name, type_id) in enumerate(zip(data["global_id"], data["name"], data["type"]))
+        ]
+
+        for node, first_child, child_count in zip(nodes, data["first_child"], data["child_count"]):
+            node.children = nodes[first_child:first_child + child_count]
+
+        return nodes[0]
+
+
+class SpatialTreeIndex:
+    """
+    Flat, navigable index of a spatial tree.
+
+    Nodes are stored in pre-order in parallel lists (parent position, child
+    positions) with a GlobalId lookup, so a viewer can page through the
+    children of one node without serializing the whole hierarchy.
+
+    Usage:
+        index = SpatialTreeIndex(tree)
+        root = index.get_root()
+        page = index.get_children(root["global_id"], offset=0, limit=100)
+    """
+
+    def __init__(self, root: SpatialNode):
+        """
+        Flatten a spatial tree.
+
+        Args:
+            root: Root node (IfcProject) with its full subtree
+        """
+        # Node attributes without children, in pre-order
+        self._nodes: List[Dict[str, Any]] = []
+        # Position of each node's parent (-1 for the root)
+        self._parents: List[int] = []
+        # Positions of each node's children, in tree order
+        self._children: List[List[int]] = []
+        # GlobalId -> position (first occurrence)
+        self._positions: Dict[str, int] = {}
+
+        pending = [(root, -1)]
+        while pending:
+            node, parent = pending.pop()
+            position = len(self._nodes)
+            record = {
+                "global_id": node.global_id,
+                "name": node.name,
+                "ifc_type": node.ifc_type,
+                "description": node.description,
+                "long_name": node.long_name,
+            }
+            if node.rollup is not None:
+                record["rollup"] = node.rollup
+            self._nodes.append(record)
+            self._parents.append(parent)
+            self._children.append([])
+            self._positions.setdefault(node.global_id, position)
+            if parent >= 0:
+                self._children[parent].append(position)
+
+            # Reversed, so that children are flattened in tree order
+            for child in reversed(node.children):
+                pending.append((child, position))
+
+    @property
+    def node_count(self) -> int:
+        """Number of nodes in the tree."""
+        return len(self._nodes)
+
+    def get_root(self) -> Dict[str, Any]:
+        """
+        Get the root node.
+
+        Returns:
+            Node attributes with child_count
+        """
+        return self._summary(0)
+
+    def get_children(self, global_id: str, offset: int = 0, limit: Optional[int] = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Get one page of the children of a node.
+
+        Args:
+            global_id: GlobalId of the parent node
+            offset: Index of the first child to return
+            limit: Maximum number of children to return (None = all)
+
+        Returns:
+            Dictionary with parent_global_id, total, offset, limit and children
+            (node attributes with child_count)
+
+        Raises:
+            ValueError: If the node is not in the tree or offset/limit are negative
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must not be negative")
+
+        children = self._children[self._position(global_id)]
+        end = len(children) if limit is None else offset + limit
+        return {
+            "parent_global_id": global_id,
+            "total": len(children),
+            "offset": offset,
+            "limit": limit,
+            "children": [self._summary(child) for child in children[offset:end]],
+        }
+
+    def get_node(self, global_id: str) -> Dict[str, Any]:
+        """
+        Get a single node with the GlobalIds of its ancestors.
+
+        Args:
+            global_id: GlobalId of the node
+
+        Returns:
+            Node attributes with child_count, parent_global_id and path
+            (ancestor GlobalIds from the root down to the parent)
+
+        Raises:
+            ValueError: If the node is not in the tree
+        """
+        position = self._position(global_id)
+
+        path = []
+        parent = self._parents[position]
+        while parent >= 0:
+            path.append(self._nodes[parent]["global_id"])
+            parent = self._parents[parent]
+        path.reverse()
+
+        node = self._summary(position)
+        node["parent_global_id"] = path[-1] if path else None
+        node["path"] = path
+        return node
+
+    def _position(self, global_id: str) -> int:
+        """Position of a node, by GlobalId."""
+        position = self._positions.get(global_id)
+        if position is None:
+            raise ValueError(f"Spatial tree node with GUID {global_id} not found")
+        return position
+
+    def _summary(self, position: int) -> Dict[str, Any]:
+        """Node attributes plus number of children."""
+        node = dict(self._nodes[position])
+        node["child_count"] = len(self._children[position])
+        return node
 
 
 class SpatialTreeExtractor:
     """
     Extract spatial hierarchy tree from IFC files.
 
-    Uses IfcOpenShell's get_decomposition() utility to recursively traverse
-    the spatial structure. This is a clean-room implementation inspired by
-    Bonsai's approach but using only the IfcOpenShell API (LGPL).
+    Reads all aggregation and containment relationships once (SpatialIndex)
+    and builds the spatial structure iteratively from that index. This is a
+    clean-room implementation inspired by Bonsai's approach but using only
+    the IfcOpenShell API (LGPL).
 
     Supports caching for performance optimization.
 
@@ -83,17 +475,44 @@ class SpatialTreeExtractor:
         extractor = SpatialTreeExtractor()
         tree = extractor.extract_tree("model.ifc")
         print(tree.to_dict())
+
+        # Lazy, paged access for viewers
+        root = extractor.get_root("model.ifc")
+        page = extractor.get_children("model.ifc", root["global_id"], offset=0, limit=100)
     """
 
-    def __init__(self, cache_manager: Optional[IfcCacheManager] = None):
+    # Version of the spatial tree artifact; bump when the tree structure changes
+    # (2: children in relationship order instead of set order, 3: compact encoding,
+    #  4: per-node rollups)
+    ARTIFACT_VERSION = 4
+
+    def __init__(
+        self,
+        cache_manager: Optional[IfcCacheManager] = None,
+        artifact_cache: Optional[ArtifactCache] = None
+    ):
         """
         Initialize the spatial tree extractor.
 
         Args:
             cache_manager: Optional cache manager instance (uses global cache if None)
+            artifact_cache: Optional on-disk artifact cache (uses IFC_ARTIFACT_CACHE_DIR if None)
         """
         self.ifc_file: Optional[ifcopenshell.file] = None
         self.cache = cache_manager or get_global_cache()
+        self.artifacts = artifact_cache or get_global_artifact_cache()
+
+        # file path -> (stat signature, tree index), least recently used first
+        self._tree_indexes: "OrderedDict[str, Tuple[tuple, SpatialTreeIndex]]" = OrderedDict()
+        self._tree_index_lock = threading.Lock()
+
+        # Drop the model when the cache evicts it (tree indexes hold no model references)
+        self.cache.add_release_listener(self._release_file)
+
+    def _release_file(self, ifc_file: ifcopenshell.file) -> None:
+        """Forget a model that left the cache, so it can be freed."""
+        if self.ifc_file is ifc_file:
+            self.ifc_file = None
 
     def open_file(self, file_path: str) -> None:
         """
@@ -127,6 +546,12 @@ def extract_tree(self, file_path: str) -> SpatialNode:
             FileNotFoundError: If file doesn't exist
             RuntimeError: If IFC file has no IfcProject or extraction fails
         """
+        # Tree derived from the same file content earlier (no parsing needed)
+        if self.artifacts is not None:
+            cached = self.artifacts.get(file_path, "spatial_tree", self.ARTIFACT_VERSION)
+            if cached is not None:
+                return SpatialNode.from_compact(cached)
+
         self.open_file(file_path)
 
         # Get the IfcProject (root of spatial hierarchy)
@@ -137,95 +562,228 @@ def extract_tree(self, file_path: str) -> SpatialNode:
 
         project = projects[0]
 
-        # Build tree recursively starting from project
-        tree = self._build_node(project)
+        # One pass over all aggregation/containment relationships, then build the tree from it
+        tree = self._build_tree(project, SpatialIndex(self.ifc_file))
+
+        if self.artifacts is not None:
+            self.artifacts.put(file_path, "spatial_tree", self.ARTIFACT_VERSION, tree.to_compact())
 
         return tree
 
-    def _build_node(self, element: ifcopenshell.entity_instance, include_spaces: bool = False) -> SpatialNode:
+    def get_tree_index(self, file_path: str) -> SpatialTreeIndex:
         """
-        Recursively build a spatial node and its children.
+        Get the navigable tree index of a file.
 
-        This method properly traverses the IFC spatial hierarchy:
-        - Project → Site → Building → Storey (via IfcRelAggregates)
-        - Storey contains Spaces (via IfcRelContainedInSpatialStructure)
+        The index is built from extract_tree() (and therefore from the artifact
+        cache if enabled) once per file version and kept for the most recently
+        used files.
 
         Args:
-            element: IFC element to build node for
-            include_spaces: If True, include IfcSpace children (for Storeys)
+            file_path: Path to the IFC file
 
         Returns:
-            SpatialNode with children populated recursively
+            SpatialTreeIndex of the file
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If IFC file has no IfcProject or extraction fails
         """
-        # Create node for current element
-        node = SpatialNode(
-            global_id=element.GlobalId if hasattr(element, "GlobalId") else "",
-            name=element.Name if hasattr(element, "Name") else None,
-            ifc_type=element.is_a(),
-            description=element.Description if hasattr(element, "Description") else None,
-            long_name=element.LongName if hasattr(element, "LongName") else None,
-        )
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            raise FileNotFoundError(f"IFC file not found: {file_path}")
+        signature = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
-        element_type = element.is_a()
+        with self._tree_index_lock:
+            known = self._tree_indexes.get(file_path)
+            if known is not None and known[0] == signature:
+                self._tree_indexes.move_to_end(file_path)
+                return known[1]
 
-        # Define which children types are valid for each parent type
-        # This enforces the correct hierarchy: Project → Site → Building → Storey → Space
-        valid_child_types = {
-            "IfcProject": {"IfcSite"},
-            "IfcSite": {"IfcBuilding"},
-            "IfcBuilding": {"IfcBuildingStorey"},
-            "IfcBuildingStorey": {"IfcSpace"},  # Spaces are leaf nodes
-            "IfcSpace": set(),  # Spaces have no spatial children
-        }
+        index = SpatialTreeIndex(self.extract_tree(file_path))
 
-        # Get the allowed child types for this element
-        allowed_children = valid_child_types.get(element_type, set())
+        with self._tree_index_lock:
+            self._tree_indexes[file_path] = (signature, index)
+            self._tree_indexes.move_to_end(file_path)
+            while len(self._tree_indexes) > TREE_INDEX_CACHE_SIZE:
+                self._tree_indexes.popitem(last=False)
 
-        if not allowed_children:
-            # No children allowed for this type
-            return node
+        return index
 
-        # Get spatial decomposition (children) using IfcOpenShell utility
-        try:
-            decomposition = ifcopenshell.util.element.get_decomposition(element)
-        except Exception:
-            # If get_decomposition fails, return node without children
-            return node
+    def get_root(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get the root node (IfcProject) of the spatial tree without its subtree.
 
-        # Recursively build child nodes (only for correct spatial hierarchy)
-        for child in decomposition:
-            child_type = child.is_a()
+        Args:
+            file_path: Path to the IFC file
 
-            # Only include children that belong in this level of the hierarchy
-            if child_type in allowed_children:
-                # For storeys, this will include spaces; for others, only structural children
-                child_node = self._build_node(child, include_spaces=(child_type == "IfcBuildingStorey"))
+        Returns:
+            Node attributes with child_count
+        """
+        return self.get_tree_index(file_path).get_root()
+
+    def get_children(
+        self,
+        file_path: str,
+        global_id: str,
+        offset: int = 0,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Get one page of the direct children of a spatial tree node.
+
+        Args:
+            file_path: Path to the IFC file
+            global_id: GlobalId of the parent node
+            offset: Index of the first child to return (default: 0)
+            limit: Maximum number of children (default: DEFAULT_PAGE_SIZE, None = all)
+
+        Returns:
+            Dictionary with parent_global_id, total, offset, limit and children
+
+        Raises:
+            ValueError: If the node is not in the tree
+        """
+        return self.get_tree_index(file_path).get_children(global_id, offset, limit)
+
+    def get_node(self, file_path: str, global_id: str) -> Dict[str, Any]:
+        """
+        Get a single spatial tree node by GlobalId.
+
+        Args:
+            file_path: Path to the IFC file
+            global_id: GlobalId of the node
+
+        Returns:
+            Node attributes with child_count, parent_global_id and path
+            (ancestor GlobalIds from the root, to expand the tree down to the node)
+
+        Raises:
+            ValueError: If the node is not in the tree
+        """
+        return self.get_tree_index(file_path).get_node(global_id)
+
+    def _build_tree(self, project: ifcopenshell.entity_instance, index: SpatialIndex) -> SpatialNode:
+        """
+        Build the spatial tree below a project from the containment index.
+
+        The hierarchy is traversed iteratively (no recursion limit):
+        - Project → Site → Building → Storey → Space (aggregated or contained)
+        - Storeys additionally list the physical elements contained in them
+
+        Every spatial node gets a rollup of the elements below it, summed
+        bottom-up once the tree is complete.
+
+        Args:
+            project: IfcProject instance (root of the tree)
+            index: Containment index of the project's file
+
+        Returns:
+            SpatialNode representing the project with all children populated
+        """
+        # element id -> spatial children (filtered once per element)
+        spatial_children: Dict[int, List[ifcopenshell.entity_instance]] = {}
+
+        # Quantity sets per element, read once per file for the rollups
+        quantities = index_element_quantities(self.ifc_file)
+
+        root = self._make_node(project)
+        root.rollup = new_rollup()
+        pending = [(project, root)]
+        # Spatial nodes with their parent, in creation order (parents before children)
+        created = [(root, None)]
+
+        while pending:
+            element, node = pending.pop()
+            element_type = element.is_a()
+
+            # Only children that belong in this level of the hierarchy
+            allowed_children = VALID_CHILD_TYPES.get(element_type)
+            if not allowed_children:
+                continue
+
+            for child in self._spatial_descendants(element, allowed_children, index, spatial_children):
+                child_node = self._make_node(child)
+                child_node.rollup = new_rollup()
                 node.children.append(child_node)
+                pending.append((child, child_node))
+                created.append((child_node, node))
+
+            # Physical building elements contained in this storey (walls, doors, slabs, ...)
+            if element_type == "IfcBuildingStorey":
+                for contained_element in index.get_contained(element):
+                    if contained_element.is_a() not in SPATIAL_ELEMENT_TYPES:
+                        # Building elements don't have children in this tree
+                        element_node = self._make_node(contained_element, with_long_name=False)
+                        node.children.append(element_node)
+                        add_element_to_rollup(
+                            node.rollup, element_node.ifc_type, quantities.get(contained_element.id(), ())
+                        )
+
+        # Bottom-up: every spatial node is complete before it is added to its parent
+        for node, parent in reversed(created):
+            if parent is not None:
+                merge_rollup(parent.rollup, node.rollup)
+        for node, _ in created:
+            round_rollup(node.rollup)
+
+        return root
+
+    @staticmethod
+    def _spatial_descendants(
+        element: ifcopenshell.entity_instance,
+        allowed_types: Set[str],
+        index: SpatialIndex,
+        spatial_children: Dict[int, List[ifcopenshell.entity_instance]]
+    ) -> List[ifcopenshell.entity_instance]:
+        """
+        Collect the spatial descendants of an element that have one of the allowed types.
 
-        # Add physical building elements contained in this spatial element
-        # (walls, doors, windows, slabs, etc.)
-        if element_type in {"IfcBuildingStorey", "IfcSpace"}:
-            try:
-                # Get elements contained in this spatial structure
-                # Using IfcRelContainedInSpatialStructure relationship
-                for rel in getattr(element, 'ContainsElements', []):
-                    for contained_element in rel.RelatedElements:
-                        # Skip spatial elements (we only want physical building elements)
-                        if contained_element.is_a() not in SPATIAL_ELEMENT_TYPES:
-                            element_node = SpatialNode(
-                                global_id=contained_element.GlobalId if hasattr(contained_element, "GlobalId") else "",
-                                name=contained_element.Name if hasattr(contained_element, "Name") else None,
-                                ifc_type=contained_element.is_a(),
-                                description=contained_element.Description if hasattr(contained_element, "Description") else None,
-                                long_name=None,
-                                children=[]  # Building elements don't have children in this tree
-                            )
-                            node.children.append(element_node)
-            except Exception:
-                # If getting contained elements fails, continue without them
-                pass
+        Intermediate spatial levels are looked through, so spaces nested in other
+        spaces are still listed below their storey.
 
-        return node
+        Args:
+            element: Spatial element to start from
+            allowed_types: Entity types to collect
+            index: Containment index
+            spatial_children: Memo of the spatial children per element id
+
+        Returns:
+            Matching descendants in index order, each listed once
+        """
+        found = []
+        seen = {element.id()}
+        pending = [element]
+
+        while pending:
+            current = pending.pop()
+            children = spatial_children.get(current.id())
+            if children is None:
+                children = [child for child in index.get_children(current) if child.is_a() in SPATIAL_ELEMENT_TYPES]
+                spatial_children[current.id()] = children
+
+            # Reversed, so that children are popped (and listed) in index order
+            for child in reversed(children):
+                if child.id() in seen:
+                    continue
+                seen.add(child.id())
+                pending.append(child)
+
+            if current is not element and current.is_a() in allowed_types:
+                found.append(current)
+
+        return found
+
+    @staticmethod
+    def _make_node(element: ifcopenshell.entity_instance, with_long_name: bool = True) -> SpatialNode:
+        """Create a childless node from an element's identity attributes."""
+        return SpatialNode(
+            global_id=element.GlobalId if hasattr(element, "GlobalId") else "",
+            name=element.Name if hasattr(element, "Name") else None,
+            ifc_type=element.is_a(),
+            description=element.Description if hasattr(element, "Description") else None,
+            long_name=element.LongName if with_long_name and hasattr(element, "LongName") else None,
+        )
 
     def get_spatial_elements_flat(self, file_path: str) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,327 @@
+"""
+IFC Intelligence Worker
+
+Long-lived worker process that serves IFC requests over a line-delimited
+JSON protocol on stdin/stdout.
+
+Every CLI script in scripts/ starts a fresh interpreter, so the RAM cache
+(IfcCacheManager) is empty on every call. The worker keeps one cache for its
+whole lifetime, so repeated requests against the same revision are served
+from the already parsed model.
+
+Protocol (one JSON object per line):
+    Request:  {"id": 1, "command": "properties", "params": {"file_path": "...", "element_guid": "..."}}
+    Response: {"id": 1, "result": {...}, "metrics": {"timings": {"total_ms": 3}}}
+    Error:    {"id": 1, "error": "File not found: ..."}
+
+Logs go to stderr, only response frames go to stdout.
+
+License: MIT (our code) + LGPL (IfcOpenShell library)
+"""
+
+import sys
+import json
+import time
+from dataclasses import asdict, fields
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from .cache_manager import IfcCacheManager, get_global_cache
+from .artifact_cache import ArtifactCache, get_global_artifact_cache
+from .parser import IfcParser
+from .spatial_tree_extractor import DEFAULT_PAGE_SIZE, SpatialTreeExtractor
+from .property_extractor import PropertyExtractor
+from .bulk_element_extractor import BulkElementExtractor
+from .change_detection import diff_elements
+from .gltf_exporter import GltfExporter, GltfExportOptions
+from .pipeline import RevisionPipeline
+from .parallel_extractor import plan_extraction
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IfcWorker:
+    """
+    Dispatch IFC requests to the extractors, sharing one IfcCacheManager.
+
+    Usage:
+        worker = IfcWorker()
+        response = worker.handle_request({"id": 1, "command": "parse", "params": {"file_path": "model.ifc"}})
+
+        # Or serve requests from stdin until EOF / "shutdown"
+        worker.serve()
+    """
+
+    def __init__(
+        self,
+        cache_manager: Optional[IfcCacheManager] = None,
+        ifcconvert_path: str = "IfcConvert",
+        artifact_cache: Optional[ArtifactCache] = None
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            cache_manager: Optional cache manager instance (uses global cache if None)
+            ifcconvert_path: Path to IfcConvert binary used for glTF export
+            artifact_cache: Optional on-disk artifact cache (uses IFC_ARTIFACT_CACHE_DIR if None)
+        """
+        self.cache = cache_manager or get_global_cache()
+        self.artifacts = artifact_cache or get_global_artifact_cache()
+
+        # Extractors are created once and reused; they all share the same caches
+        self.parser = IfcParser(cache_manager=self.cache, artifact_cache=self.artifacts)
+        self.spatial_extractor = SpatialTreeExtractor(cache_manager=self.cache, artifact_cache=self.artifacts)
+        self.property_extractor = PropertyExtractor(cache_manager=self.cache, artifact_cache=self.artifacts)
+        self.bulk_extractor = BulkElementExtractor(cache_manager=self.cache)
+        self.gltf_exporter = GltfExporter(ifcconvert_path=ifcconvert_path, cache_manager=self.cache)
+        self.pipeline = RevisionPipeline(cache_manager=self.cache, ifcconvert_path=ifcconvert_path)
+
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "ping": self._handle_ping,
+            "parse": self._handle_parse,
+            "spatial_tree": self._handle_spatial_tree,
+            "spatial_root": self._handle_spatial_root,
+            "spatial_children": self._handle_spatial_children,
+            "spatial_node": self._handle_spatial_node,
+            "properties": self._handle_properties,
+            "bulk": self._handle_bulk,
+            "gltf": self._handle_gltf,
+            "process_revision": self._handle_process_revision,
+            "prescan": self._handle_prescan,
+            "stats": self._handle_stats,
+            "evict": self._handle_evict,
+        }
+
+        self._requests_served = 0
+        self._running = False
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle a single request and build the response frame.
+
+        Args:
+            request: Request dictionary with "command", optional "id" and "params"
+
+        Returns:
+            Response dictionary with "result" or "error"
+        """
+        request_id = request.get("id")
+        command = request.get("command")
+        params = request.get("params") or {}
+
+        if command == "shutdown":
+            self._running = False
+            return {"id": request_id, "result": {"shutdown": True}}
+
+        handler = self._handlers.get(command)
+        if handler is None:
+            return {"id": request_id, "error": f"Unknown command: {command}"}
+
+        start_time = time.time()
+        try:
+            result = handler(params)
+        except FileNotFoundError as e:
+            return {"id": request_id, "error": f"File not found: {str(e)}"}
+        except (KeyError, ValueError) as e:
+            return {"id": request_id, "error": f"Invalid request: {str(e)}"}
+        except RuntimeError as e:
+            return {"id": request_id, "error": f"Runtime error: {str(e)}"}
+        except Exception as e:
+            logger.exception("worker_request_failed", command=command, error=str(e))
+            return {"id": request_id, "error": f"Unexpected error: {str(e)}"}
+        finally:
+            self._requests_served += 1
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        logger.debug("worker_request_completed", command=command, time_ms=elapsed_ms)
+
+        return {
+            "id": request_id,
+            "result": result,
+            "metrics": {"timings": {"total_ms": elapsed_ms}}
+        }
+
+    def serve(self, input_stream: Optional[TextIO] = None, output_stream: Optional[TextIO] = None) -> None:
+        """
+        Serve line-delimited JSON requests until EOF or a "shutdown" command.
+
+        Args:
+            input_stream: Stream to read requests from (default: stdin)
+            output_stream: Stream to write responses to (default: stdout)
+        """
+        input_stream = input_stream or sys.stdin
+        output_stream = output_stream or sys.stdout
+
+        self._running = True
+        logger.info("worker_started")
+
+        for line in input_stream:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "error": f"Invalid request: {str(e)}"}
+            else:
+                response = self.handle_request(request)
+
+            output_stream.write(json.dumps(response, default=str) + "\n")
+            output_stream.flush()
+
+            if not self._running:
+                break
+
+        self._running = False
+        logger.info("worker_stopped", requests_served=self._requests_served)
+
+    def _handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"pong": True, "requests_served": self._requests_served}
+
+    def _handle_parse(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("fast"):
+            return asdict(self.parser.parse_header(params["file_path"]))
+
+        metadata = self.parser.parse_file(params["file_path"])
+        return asdict(metadata)
+
+    def _handle_spatial_tree(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        file_path = params["file_path"]
+
+        if params.get("storey_guid"):
+            elements = self.spatial_extractor.get_elements_in_storey(file_path, params["storey_guid"])
+            return {
+                "storey_guid": params["storey_guid"],
+                "element_count": len(elements),
+                "elements": elements
+            }
+
+        if params.get("flat"):
+            elements = self.spatial_extractor.get_spatial_elements_flat(file_path)
+            return {"element_count": len(elements), "elements": elements}
+
+        tree = self.spatial_extractor.extract_tree(file_path)
+        return tree.to_compact() if params.get("compact") else tree.to_dict()
+
+    def _handle_spatial_root(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.spatial_extractor.get_root(params["file_path"])
+
+    def _handle_spatial_children(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.spatial_extractor.get_children(
+            params["file_path"],
+            params["global_id"],
+            offset=params.get("offset", 0),
+            limit=params.get("limit", DEFAULT_PAGE_SIZE)
+        )
+
+    def _handle_spatial_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.spatial_extractor.get_node(params["file_path"], params["global_id"])
+
+    def _handle_properties(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        file_path = params["file_path"]
+
+        if "element_guids" in params:
+            results = self.property_extractor.extract_properties_from_file(file_path, params["element_guids"])
+            return {guid: asdict(props) for guid, props in results.items()}
+
+        global_id = params["element_guid"]
+        results = self.property_extractor.extract_properties_from_file(file_path, [global_id])
+        if global_id not in results:
+            raise RuntimeError(f"Element not found with GlobalId: {global_id}")
+        return asdict(results[global_id])
+
+    def _handle_bulk(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        elements = self.bulk_extractor.extract_all_elements(params["file_path"])
+
+        if params.get("previous_hashes") is not None:
+            # Differential mode: only added/changed elements plus removed GUIDs
+            diff = diff_elements(elements, params["previous_hashes"])
+            return {
+                "elements": diff["added"] + diff["changed"],
+                "removed": diff["removed"],
+                "element_count": len(elements),
+                "changes": diff["statistics"]
+            }
+
+        return {"elements": elements, "element_count": len(elements)}
+
+    def _handle_gltf(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        options = self._gltf_options(params)
+        result = self.gltf_exporter.export(
+            ifc_file_path=params["file_path"],
+            output_path=params["output_path"],
+            format=params.get("format", "glb"),
+            options=options,
+            progress=self._gltf_progress_logger(params["file_path"])
+        )
+
+        # Omit stdout/stderr (can be large), same as scripts/export_gltf.py
+        return {
+            "success": result.success,
+            "output_path": result.output_path,
+            "file_size": result.file_size,
+            "error_message": result.error_message,
+            "statistics": result.statistics,
+            "timed_out": result.timed_out,
+            "cancelled": result.cancelled
+        }
+
+    @staticmethod
+    def _gltf_options(params: Dict[str, Any]) -> GltfExportOptions:
+        """
+        Build export options from params["options"].
+
+        Raises:
+            ValueError: If options is not an object or has unknown keys (client error)
+        """
+        options = params.get("options") or {}
+        if not isinstance(options, dict):
+            raise ValueError("options must be a JSON object")
+
+        unknown = set(options) - {field.name for field in fields(GltfExportOptions)}
+        if unknown:
+            raise ValueError(f"unknown option(s): {', '.join(sorted(unknown))}")
+        return GltfExportOptions(**options)
+
+    @staticmethod
+    def _gltf_progress_logger(file_path: str, step: float = 10.0) -> Callable[[Optional[int], float], None]:
+        """Progress callback that logs every `step` percent (stdout carries only response frames)."""
+        next_percent = [step]
+
+        def report(elements_written: Optional[int], percent: float) -> None:
+            if percent >= next_percent[0]:
+                logger.info("gltf_progress", file_path=file_path, percent=round(percent, 1),
+                            elements_written=elements_written)
+                next_percent[0] = (percent // step + 1) * step
+
+        return report
+
+    def _handle_process_revision(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.pipeline.process(
+            params["file_path"],
+            gltf_output_path=params.get("gltf_output_path"),
+            gltf_format=params.get("format", "glb"),
+            gltf_options=self._gltf_options(params),
+            stages=params.get("stages")
+        )
+
+    def _handle_prescan(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Raw STEP scan, the file is not loaded into the cache
+        return plan_extraction(params["file_path"], max_workers=params.get("max_workers"))
+
+    def _handle_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        stats = {"cache": self.cache.get_stats(), "requests_served": self._requests_served}
+        if self.artifacts is not None:
+            stats["artifacts"] = self.artifacts.get_stats()
+        return stats
+
+    def _handle_evict(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get("file_path"):
+            self.cache.remove(params["file_path"])
+        else:
+            self.cache.clear()
+        return {"cache": self.cache.get_stats()}
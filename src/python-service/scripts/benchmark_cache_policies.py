@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Compare IFC cache policies by replaying access traces.
+
+Replays a recorded trace (ifc_worker.py --trace-file) or a generated
+workload against each cache policy without loading any IFC files, and
+reports hit rates and the parse time spent on misses.
+
+The synthetic workload mixes interactive viewers, which keep coming back to
+a few hot models, with periodic bulk jobs that touch many old revisions once.
+
+Usage:
+    python benchmark_cache_policies.py --trace trace.ndjson [--max-entries 10] [--max-memory-mb 8192]
+    python benchmark_cache_policies.py --synthetic [--policies lru,lfu,cost]
+
+Output:
+    JSON results (stdout)
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import ifc_intelligence module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ifc_intelligence.cache_manager import DEFAULT_MEMORY_FACTOR
+from ifc_intelligence.cache_policy import CACHE_POLICIES, create_policy, replay_trace
+
+MB = 1024 * 1024
+
+# Parse throughput assumed for trace records without a measured load time
+SECONDS_PER_MB = 0.5
+
+
+def load_trace(trace_path: str) -> list:
+    """
+    Read a trace written by IfcCacheManager(trace_path=...).
+
+    Load times are only recorded on misses, so every request for a key uses
+    the last load time measured for that key.
+
+    Args:
+        trace_path: Path to the NDJSON trace
+
+    Returns:
+        List of (key, memory bytes, load seconds)
+    """
+    records = []
+    with open(trace_path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+
+    load_seconds = {}
+    memory = {}
+    for record in records:
+        if "load_ms" in record:
+            load_seconds[record["key"]] = record["load_ms"] / 1000
+        if "memory" in record:
+            memory[record["key"]] = record["memory"]
+
+    accesses = []
+    for record in records:
+        key = record["key"]
+        size = record.get("size", 0)
+        accesses.append((
+            key,
+            memory.get(key, int(size * DEFAULT_MEMORY_FACTOR)),
+            load_seconds.get(key, size / MB * SECONDS_PER_MB),
+        ))
+    return accesses
+
+
+def synthetic_trace(
+    hot_models: int = 6,
+    cold_models: int = 50,
+    requests: int = 3000,
+    scan_every: int = 500,
+    seed: int = 42
+) -> list:
+    """
+    Generate a viewer workload interrupted by bulk reprocessing scans.
+
+    Args:
+        hot_models: Models viewers keep opening (Zipf-like popularity)
+        cold_models: Old revisions touched once per scan
+        requests: Number of viewer requests
+        scan_every: Viewer requests between two scans
+        seed: Random seed
+
+    Returns:
+        List of (key, memory bytes, load seconds)
+    """
+    rng = random.Random(seed)
+
+    def model(name):
+        size = rng.randint(20, 400) * MB
+        return name, int(size * DEFAULT_MEMORY_FACTOR), size / MB * SECONDS_PER_MB
+
+    hot = [model(f"hot_{i}") for i in range(hot_models)]
+    cold = [model(f"revision_{i}") for i in range(cold_models)]
+    weights = [1 / (rank + 1) for rank in range(hot_models)]
+
+    accesses = []
+    for i in range(requests):
+        if i > 0 and i % scan_every == 0:
+            accesses.extend(cold)
+        accesses.append(rng.choices(hot, weights=weights)[0])
+    return accesses
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare IFC cache policies by replaying access traces",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--trace",
+        help="NDJSON trace recorded with ifc_worker.py --trace-file"
+    )
+    source.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Use a generated viewer + bulk scan workload"
+    )
+
+    parser.add_argument(
+        "--policies",
+        default=",".join(CACHE_POLICIES),
+        help=f"Comma-separated policies to compare (default: {','.join(CACHE_POLICIES)})"
+    )
+
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=10,
+        help="Maximum number of cached files (default: 10)"
+    )
+
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Memory budget in MB (default: none)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        accesses = load_trace(args.trace) if args.trace else synthetic_trace()
+        max_bytes = int(args.max_memory_mb * MB) if args.max_memory_mb else None
+
+        results = {}
+        for name in (value.strip() for value in args.policies.split(",")):
+            if name:
+                results[name] = replay_trace(create_policy(name), accesses, args.max_entries, max_bytes)
+
+        print(json.dumps({
+            "trace": args.trace or "synthetic",
+            "requests": len(accesses),
+            "distinct_files": len({key for key, _, _ in accesses}),
+            "max_entries": args.max_entries,
+            "max_memory_mb": args.max_memory_mb,
+            "results": results
+        }, indent=2))
+
+    except Exception as e:
+        print(json.dumps({"error": f"Benchmark failed: {str(e)}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
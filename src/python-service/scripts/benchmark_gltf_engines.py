@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark glTF export engines: IfcConvert subprocess vs. in-process ifcopenshell.geom.
+
+Exports each IFC file with every engine and reports wall-clock times, output
+sizes and node counts. The in-process engine is measured "cold" (includes
+parsing the file), "warm" (model already in the cache, which is the worker's
+situation) and warm with geometry instancing (one mesh per shared geometry),
+to compare output sizes. Engines that fail (e.g. IfcConvert not installed)
+are reported with their error message.
+
+Usage:
+    python benchmark_gltf_engines.py [ifc_file_path ...] [--threads 1,4] [--repeat 3]
+                                     [--ifcconvert /usr/local/bin/IfcConvert]
+
+Output:
+    JSON results (stdout)
+    Structured logs (stderr)
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import ifc_intelligence module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.gltf_exporter import GltfExporter, GltfExportOptions
+from ifc_intelligence.glb_writer import read_glb
+from ifc_intelligence.logger import get_logger
+
+logger = get_logger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def run_export(exporter: GltfExporter, file_path: str, output_path: str, options: GltfExportOptions) -> dict:
+    """
+    Run one export and measure it.
+
+    Args:
+        exporter: Exporter to use
+        file_path: Path to the IFC file
+        output_path: Path of the GLB file
+        options: Export options (selects the engine)
+
+    Returns:
+        Run result with time, file size and node count (or error)
+    """
+    run_start = time.time()
+    result = exporter.export(file_path, output_path, format="glb", options=options)
+    run_ms = (time.time() - run_start) * 1000
+
+    if not result.success:
+        return {"ms": round(run_ms, 1), "error": result.error_message}
+
+    document, _ = read_glb(result.output_path)
+    return {
+        "ms": round(run_ms, 1),
+        "file_size": result.file_size,
+        "nodes": len(document.get("nodes", [])),
+        "meshes": len(document.get("meshes", [])),
+    }
+
+
+def best_run(runs: list) -> dict:
+    """Fastest successful run, or the first failed one."""
+    successful = [run for run in runs if "error" not in run]
+    if not successful:
+        return runs[0]
+    return min(successful, key=lambda run: run["ms"])
+
+
+def benchmark_file(file_path: str, thread_counts, repeat: int, ifcconvert_path: str, tmp_dir: str) -> dict:
+    """
+    Time all engines on one file.
+
+    Args:
+        file_path: Path to the IFC file
+        thread_counts: Thread counts for the in-process engine
+        repeat: Runs per configuration (best time is reported)
+        ifcconvert_path: Path to the IfcConvert binary
+        tmp_dir: Directory for the exported files
+
+    Returns:
+        Benchmark result for the file
+    """
+    output_path = str(Path(tmp_dir) / f"{Path(file_path).stem}.glb")
+    runs = []
+
+    exporter = GltfExporter(ifcconvert_path=ifcconvert_path, cache_manager=IfcCacheManager())
+    ifcconvert = best_run([
+        run_export(exporter, file_path, output_path, GltfExportOptions(engine="ifcconvert"))
+        for _ in range(repeat)
+    ])
+    runs.append({"engine": "ifcconvert", **ifcconvert})
+    logger.info("benchmark_run_completed", file_path=file_path, engine="ifcconvert", **ifcconvert)
+
+    for threads in thread_counts:
+        options = GltfExportOptions(engine="ifcopenshell", threads=threads)
+
+        # Cold: a fresh cache per run, so the parse is part of the export
+        cold = best_run([
+            run_export(GltfExporter(cache_manager=IfcCacheManager()), file_path, output_path, options)
+            for _ in range(repeat)
+        ])
+        runs.append({"engine": "ifcopenshell", "threads": threads, "cache": "cold", **cold})
+
+        # Warm: the model is already parsed, as in the worker
+        warm_exporter = GltfExporter(cache_manager=IfcCacheManager())
+        warm_exporter.geometry_engine.cache.get_or_load(file_path)
+        warm = best_run([run_export(warm_exporter, file_path, output_path, options) for _ in range(repeat)])
+        runs.append({"engine": "ifcopenshell", "threads": threads, "cache": "warm", **warm})
+
+        instanced_options = GltfExportOptions(engine="ifcopenshell", threads=threads, instancing=True)
+        instanced = best_run([
+            run_export(warm_exporter, file_path, output_path, instanced_options) for _ in range(repeat)
+        ])
+        runs.append({"engine": "ifcopenshell", "threads": threads, "cache": "warm", "instancing": True, **instanced})
+
+        logger.info("benchmark_run_completed", file_path=file_path, engine="ifcopenshell",
+                    threads=threads, cold_ms=cold["ms"], warm_ms=warm["ms"], instanced_ms=instanced["ms"])
+
+    if "error" not in ifcconvert:
+        for run in runs:
+            if "error" not in run and run["ms"]:
+                run["speedup_vs_ifcconvert"] = round(ifcconvert["ms"] / run["ms"], 2)
+
+    return {"file_path": file_path, "runs": runs}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark glTF export engines (IfcConvert vs. in-process ifcopenshell.geom)",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "ifc_file_paths",
+        nargs="*",
+        help="IFC files to benchmark (default: all tests/fixtures/*.ifc)"
+    )
+
+    parser.add_argument(
+        "--threads",
+        default="1",
+        help="Comma-separated thread counts for the ifcopenshell engine (default: 1)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per configuration, best time is reported (default: 3)"
+    )
+
+    parser.add_argument(
+        "--ifcconvert",
+        default="IfcConvert",
+        help="Path to IfcConvert binary (default: searches PATH)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        thread_counts = [int(value) for value in args.threads.split(",") if value.strip()]
+    except ValueError:
+        parser.error("--threads must be a comma-separated list of integers")
+
+    file_paths = args.ifc_file_paths or [str(path) for path in sorted(FIXTURES_DIR.glob("*.ifc"))]
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = [
+                benchmark_file(file_path, thread_counts, args.repeat, args.ifcconvert, tmp_dir)
+                for file_path in file_paths
+            ]
+
+        print(json.dumps({"results": results}, indent=2))
+
+    except Exception as e:
+        logger.exception("benchmark_failed", error=str(e))
+        print(json.dumps({"error": f"Benchmark failed: {str(e)}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs. parallel bulk element extraction.
+
+Runs the bulk extraction with different worker counts on a real IFC file
+and/or a generated synthetic model and reports wall-clock times and speedups.
+
+Usage:
+    python benchmark_parallel_extraction.py [ifc_file_path] [--workers 1,2,4,8]
+                                            [--synthetic 20000] [--repeat 3]
+
+Output:
+    JSON results (stdout)
+    Structured logs (stderr)
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import ifc_intelligence module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ifcopenshell
+import ifcopenshell.guid
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.bulk_element_extractor import BulkElementExtractor
+from ifc_intelligence.parallel_extractor import ParallelBulkElementExtractor
+from ifc_intelligence.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def build_synthetic_model(path: str, element_count: int) -> None:
+    """
+    Write an IFC4 model with many typed walls, each with its own property and quantity set.
+
+    Args:
+        path: Output path
+        element_count: Number of wall occurrences
+    """
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    ifc_file.create_entity("IfcProject", GlobalId=ifcopenshell.guid.new(), Name="Synthetic Project")
+
+    wall_types = []
+    for i in range(10):
+        type_pset = ifc_file.create_entity(
+            "IfcPropertySet", GlobalId=ifcopenshell.guid.new(), Name="Pset_WallCommon",
+            HasProperties=[
+                ifc_file.create_entity("IfcPropertySingleValue", Name="IsExternal",
+                                       NominalValue=ifc_file.create_entity("IfcBoolean", i % 2 == 0)),
+                ifc_file.create_entity("IfcPropertySingleValue", Name="FireRating",
+                                       NominalValue=ifc_file.create_entity("IfcLabel", f"F{30 * (i + 1)}")),
+            ]
+        )
+        wall_types.append(ifc_file.create_entity(
+            "IfcWallType", GlobalId=ifcopenshell.guid.new(), Name=f"Wall Type {i}",
+            PredefinedType="STANDARD", HasPropertySets=[type_pset]
+        ))
+
+    walls_by_type = [[] for _ in wall_types]
+    for i in range(element_count):
+        wall = ifc_file.create_entity("IfcWall", GlobalId=ifcopenshell.guid.new(), Name=f"Wall {i}")
+        walls_by_type[i % len(wall_types)].append(wall)
+
+        pset = ifc_file.create_entity(
+            "IfcPropertySet", GlobalId=ifcopenshell.guid.new(), Name="Pset_Custom",
+            HasProperties=[
+                ifc_file.create_entity("IfcPropertySingleValue", Name="Index",
+                                       NominalValue=ifc_file.create_entity("IfcInteger", i)),
+                ifc_file.create_entity("IfcPropertySingleValue", Name="Mark",
+                                       NominalValue=ifc_file.create_entity("IfcLabel", f"W-{i:06d}")),
+            ]
+        )
+        qto = ifc_file.create_entity(
+            "IfcElementQuantity", GlobalId=ifcopenshell.guid.new(), Name="Qto_WallBaseQuantities",
+            Quantities=[
+                ifc_file.create_entity("IfcQuantityLength", Name="Length", LengthValue=1.0 + i % 7),
+                ifc_file.create_entity("IfcQuantityArea", Name="NetSideArea", AreaValue=3.0 + i % 5),
+            ]
+        )
+        for definition in (pset, qto):
+            ifc_file.create_entity(
+                "IfcRelDefinesByProperties", GlobalId=ifcopenshell.guid.new(),
+                RelatedObjects=[wall], RelatingPropertyDefinition=definition
+            )
+
+    for wall_type, walls in zip(wall_types, walls_by_type):
+        if walls:
+            ifc_file.create_entity(
+                "IfcRelDefinesByType", GlobalId=ifcopenshell.guid.new(),
+                RelatedObjects=walls, RelatingType=wall_type
+            )
+
+    ifc_file.write(path)
+
+
+def benchmark_file(file_path: str, worker_counts, repeat: int) -> dict:
+    """
+    Time the bulk extraction of one file for each worker count.
+
+    Args:
+        file_path: Path to the IFC file
+        worker_counts: Worker counts to measure (1 = serial BulkElementExtractor)
+        repeat: Runs per worker count (best time is reported)
+
+    Returns:
+        Benchmark result for the file
+    """
+    # Parse once; every run below extracts from the cached model
+    cache = IfcCacheManager()
+    parse_start = time.time()
+    cache.get_or_load(file_path)
+    parse_ms = int((time.time() - parse_start) * 1000)
+
+    runs = []
+    reference = None
+    for workers in worker_counts:
+        best_ms = None
+        element_count = 0
+        for _ in range(repeat):
+            if workers == 1:
+                extractor = BulkElementExtractor(cache_manager=cache)
+            else:
+                extractor = ParallelBulkElementExtractor(workers=workers, cache_manager=cache)
+
+            run_start = time.time()
+            elements = extractor.extract_all_elements(file_path)
+            run_ms = (time.time() - run_start) * 1000
+
+            best_ms = run_ms if best_ms is None else min(best_ms, run_ms)
+            element_count = len(elements)
+
+            if reference is None:
+                reference = elements
+            elif elements != reference:
+                raise RuntimeError(f"Result with {workers} workers differs from the first run")
+
+        runs.append({"workers": workers, "best_ms": round(best_ms, 1), "elements": element_count})
+        logger.info("benchmark_run_completed", file_path=file_path, workers=workers, best_ms=round(best_ms, 1))
+
+    baseline_ms = runs[0]["best_ms"]
+    for run in runs:
+        run["speedup"] = round(baseline_ms / run["best_ms"], 2) if run["best_ms"] else None
+
+    return {"file_path": file_path, "parse_ms": parse_ms, "runs": runs}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark serial vs. parallel bulk element extraction",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "ifc_file_path",
+        nargs="?",
+        default=str(Path(__file__).parent.parent / "tests" / "fixtures" / "Duplex.ifc"),
+        help="IFC file to benchmark (default: tests/fixtures/Duplex.ifc)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        default="1,2,4,8",
+        help="Comma-separated worker counts (default: 1,2,4,8)"
+    )
+
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Also benchmark a generated model with this many walls (default: 0 = skip)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per worker count, best time is reported (default: 3)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        worker_counts = [int(value) for value in args.workers.split(",") if value.strip()]
+    except ValueError:
+        parser.error("--workers must be a comma-separated list of integers")
+
+    try:
+        results = [benchmark_file(args.ifc_file_path, worker_counts, args.repeat)]
+
+        if args.synthetic > 0:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                synthetic_path = str(Path(tmp_dir) / "synthetic.ifc")
+                build_start = time.time()
+                build_synthetic_model(synthetic_path, args.synthetic)
+                logger.info("synthetic_model_built", elements=args.synthetic,
+                            time_ms=int((time.time() - build_start) * 1000))
+                result = benchmark_file(synthetic_path, worker_counts, args.repeat)
+                result["file_path"] = f"synthetic ({args.synthetic} walls)"
+                results.append(result)
+
+        print(json.dumps({"fork_available": ParallelBulkElementExtractor.fork_available(),
+                          "results": results}, indent=2))
+
+    except Exception as e:
+        logger.exception("benchmark_failed", error=str(e))
+        print(json.dumps({"error": f"Benchmark failed: {str(e)}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,13 @@
 
 Usage:
     python scripts/export_gltf.py <input.ifc> <output.glb> [--format glb|gltf] [--use-names]
+                                  [--engine ifcconvert|ifcopenshell] [--threads N]
+                                  [--timeout SECONDS] [--memory-limit-mb MB] [--progress]
+                                  [--instancing]
 
 Output:
     JSON to stdout with export result
+    With --progress: one {"progress": <percent>} JSON line per update on stderr
 
 This script is designed to be called by the .NET backend via ProcessRunner.
 """
@@ -22,7 +26,7 @@
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ifc_intelligence.gltf_exporter import GltfExporter, GltfExportOptions
+from ifc_intelligence.gltf_exporter import GLTF_ENGINES, GltfExporter, GltfExportOptions
 
 
 def main():
@@ -80,6 +84,46 @@ def main():
         help="Use Y-up coordinate system (default is Z-up)"
     )
 
+    parser.add_argument(
+        "--engine",
+        choices=GLTF_ENGINES,
+        default="ifcconvert",
+        help="Export engine: IfcConvert binary or in-process ifcopenshell.geom (default: ifcconvert)"
+    )
+
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Tessellation threads (default: one per CPU)"
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Abort the export after this many seconds (default: no limit)"
+    )
+
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        default=None,
+        help="Address-space limit of the IfcConvert process in MB (default: no limit)"
+    )
+
+    parser.add_argument(
+        "--instancing",
+        action="store_true",
+        help="One mesh per shared geometry, referenced by every occurrence (requires --engine ifcopenshell)"
+    )
+
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report percent complete as JSON lines on stderr"
+    )
+
     args = parser.parse_args()
 
     try:
@@ -102,16 +146,31 @@ def main():
             use_element_names=args.use_names,
             use_material_names=not args.no_material_names,
             center_model=args.center,
-            y_up=args.y_up
+            y_up=args.y_up,
+            engine=args.engine,
+            threads=args.threads,
+            timeout_seconds=args.timeout,
+            memory_limit_mb=args.memory_limit_mb,
+            instancing=args.instancing
         )
 
+        last_percent = [-1.0]
+
+        def report_progress(elements_written, percent):
+            # The in-process engine reports every element, print only changes
+            percent = round(percent, 1)
+            if percent > last_percent[0]:
+                last_percent[0] = percent
+                print(json.dumps({"progress": percent}), file=sys.stderr, flush=True)
+
         # Export IFC to glTF
         export_start = time.time()
         result = exporter.export(
             ifc_file_path=args.input_file,
             output_path=args.output_file,
             format=args.format,
-            options=options
+            options=options,
+            progress=report_progress if args.progress else None
         )
         export_time_ms = int((time.time() - export_start) * 1000)
 
@@ -122,6 +181,8 @@ def main():
         metrics["statistics"] = {
             "gltf_file_size_bytes": result.file_size if result.success else None
         }
+        if result.statistics:
+            metrics["statistics"].update(result.statistics)
 
         # Convert result to dict for JSON serialization
         result_dict = {
@@ -129,6 +190,7 @@ def main():
             "output_path": result.output_path,
             "file_size": result.file_size,
             "error_message": result.error_message,
+            "timed_out": result.timed_out,
             "metrics": metrics
             # Omit stdout/stderr in JSON output (can be large)
         }
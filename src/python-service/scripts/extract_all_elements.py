@@ -6,16 +6,35 @@
 all element properties for database storage.
 
 Usage:
-    python extract_all_elements.py <ifc_file_path>
+    python extract_all_elements.py <ifc_file_path> [--format json|ndjson] [--workers N|auto]
+    python extract_all_elements.py <ifc_file_path> --format copy-text|copy-binary --revision-id <id>
+                                   [--metrics-file metrics.json]
+    python extract_all_elements.py <ifc_file_path> --previous-hashes prev.json [--hashes-output hashes.json]
 
 Output:
-    JSON with elements and metrics (stdout)
+    --format json (default): one JSON document with elements and metrics (stdout)
+    --format ndjson: one compact JSON element per line as soon as it is extracted,
+                     followed by a final {"metrics": {...}} line (stdout)
+    --format copy-text / copy-binary: PostgreSQL COPY stream for the "IfcElements" table (stdout),
+                     load with: COPY "IfcElements" ("RevisionId", "GlobalId", "ElementType",
+                     "Name", "Description", "PropertiesJson", "BuildingGlobalId",
+                     "StoreyGlobalId", "SpaceGlobalId") FROM STDIN [WITH (FORMAT binary)]
+                     (ifc_intelligence.copy_writer.copy_statement() builds it)
+                     Metrics are written to --metrics-file (if given) and logged.
+    --previous-hashes: differential mode, only added and changed elements are output
+                     (each with a "change" key); removed GUIDs are listed as "removed"
+                     (json), as {"global_id": ..., "change": "removed"} lines (ndjson),
+                     or in the metrics (COPY formats)
+    --hashes-output: write the GUID → content hash map of this revision (input for the next one)
+    --workers auto: pre-scan the raw file (no parse) and choose serial or parallel
+                     extraction by element count; the plan is reported as metrics["prescan"]
     Structured logs (stderr)
 """
 
 import sys
 import json
 import time
+import argparse
 from pathlib import Path
 from datetime import datetime
 from collections import Counter
@@ -24,53 +43,112 @@
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ifc_intelligence.bulk_element_extractor import BulkElementExtractor
+from ifc_intelligence.parallel_extractor import ParallelBulkElementExtractor, plan_extraction
+from ifc_intelligence.copy_writer import IfcElementCopyWriter, copy_statement
+from ifc_intelligence.change_detection import RevisionDiff, UNCHANGED, REMOVED
 from ifc_intelligence.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def count_element_types(elements):
-    """Count elements by IFC type"""
-    type_counts = Counter(elem["element_type"] for elem in elements)
-    return dict(type_counts)
+def workers_argument(value: str):
+    """argparse type for --workers: a number or 'auto'."""
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'auto', got {value!r}")
+
+
+class ElementStatistics:
+    """Incrementally count element types, property sets, properties, and quantities"""
 
+    def __init__(self):
+        self.total_elements = 0
+        self.type_counts = Counter()
+        self.total_psets = 0
+        self.total_props = 0
+        self.total_quantities = 0
 
-def count_properties(elements):
-    """Count total property sets, properties, and quantities"""
-    total_psets = 0
-    total_props = 0
-    total_quantities = 0
+    def add(self, elem):
+        """Add one extracted element to the statistics"""
+        self.total_elements += 1
+        self.type_counts[elem["element_type"]] += 1
 
-    for elem in elements:
         props = elem.get("properties", {})
 
         # Count property sets
         psets = props.get("property_sets", {})
-        total_psets += len(psets)
+        self.total_psets += len(psets)
 
         # Count individual properties
         for pset_data in psets.values():
             if isinstance(pset_data, dict):
-                total_props += len(pset_data)
+                self.total_props += len(pset_data)
 
         # Count quantities
         quantities = props.get("quantities", {})
         for qset_data in quantities.values():
             if isinstance(qset_data, dict):
-                total_quantities += len(qset_data)
-
-    return total_psets, total_props, total_quantities
+                self.total_quantities += len(qset_data)
 
 
 def main():
-    if len(sys.argv) != 2:
-        logger.error("invalid_usage", expected="<ifc_file_path>", provided=sys.argv[1:])
-        print(json.dumps({
-            "error": "Usage: python extract_all_elements.py <ifc_file_path>"
-        }))
-        sys.exit(1)
-
-    ifc_file_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Extract all element properties from an IFC file",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "ifc_file_path",
+        help="Path to input IFC file"
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson", "copy-text", "copy-binary"],
+        default="json",
+        help="Output format: single JSON document (default), streamed NDJSON or PostgreSQL COPY stream"
+    )
+
+    parser.add_argument(
+        "--revision-id",
+        type=int,
+        help="Revision id written into the RevisionId column (required for COPY formats)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=workers_argument,
+        default=1,
+        help="Number of worker processes (default: 1 = serial, 0 = one per CPU, "
+             "auto = decide from a pre-scan of the file)"
+    )
+
+    parser.add_argument(
+        "--previous-hashes",
+        help="JSON file with the GUID → content hash map of the previous revision (differential mode)"
+    )
+
+    parser.add_argument(
+        "--hashes-output",
+        help="Write the GUID → content hash map of this revision to this JSON file"
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        help="Write the metrics JSON to this file (COPY formats have no room for it on stdout)"
+    )
+
+    args = parser.parse_args()
+
+    ifc_file_path = args.ifc_file_path
+    streaming = args.format == "ndjson"
+    copy_format = args.format in ("copy-text", "copy-binary")
+
+    if copy_format and args.revision_id is None:
+        parser.error("--revision-id is required for COPY formats")
 
     # Initialize metrics
     metrics = {
@@ -80,12 +158,27 @@ def main():
         "warnings": []
     }
 
-    logger.info("extraction_started", ifc_file_path=ifc_file_path)
+    logger.info("extraction_started", ifc_file_path=ifc_file_path, output_format=args.format,
+                workers=args.workers)
 
     try:
+        # Pre-scan the raw file to pick serial or parallel mode before parsing
+        plan = None
+        workers = args.workers
+        if workers == "auto":
+            plan = plan_extraction(ifc_file_path)
+            workers = plan["recommended_workers"]
+            metrics["prescan"] = plan
+            logger.info("prescan_completed", **plan)
+
         # Timing: File parsing/opening
         parse_start = time.time()
-        extractor = BulkElementExtractor()
+        if workers == 1:
+            extractor = BulkElementExtractor()
+        else:
+            extractor = ParallelBulkElementExtractor(workers=workers or None)
+        if plan is not None:
+            extractor.element_count_estimate = plan["element_count"]
         logger.debug("extractor_created")
 
         # Open file (triggers ifcopenshell parsing)
@@ -94,76 +187,125 @@ def main():
         metrics["timings"]["parse_ms"] = parse_time_ms
         logger.info("parse_completed", time_ms=parse_time_ms)
 
+        # Timing: Property relationship index (single scan over IfcRelDefines*)
+        index_start = time.time()
+        index_stats = extractor.build_property_index()
+        index_time_ms = int((time.time() - index_start) * 1000)
+        metrics["timings"]["property_index_ms"] = index_time_ms
+        logger.info("property_index_built", time_ms=index_time_ms, **index_stats)
+
+        # Differential mode: compare against the previous revision's content hashes
+        diff = None
+        if args.previous_hashes:
+            with open(args.previous_hashes) as f:
+                diff = RevisionDiff(json.load(f))
+            logger.info("differential_mode", previous_elements=len(diff.previous_hashes))
+        content_hashes = diff.current_hashes if diff is not None else {}
+
         # Timing: Element extraction
         extract_start = time.time()
         elements = []
-        element_count = 0
-
-        # Extract elements by type
-        for element_type in extractor.ELEMENT_TYPES:
-            try:
-                instances = extractor.ifc_file.by_type(element_type)
-
-                for instance in instances:
-                    try:
-                        element_data = extractor._extract_element_data(instance)
-                        if element_data:
-                            elements.append(element_data)
-                            element_count += 1
-                    except Exception as e:
-                        # Track warning for failed element
-                        element_id = instance.GlobalId if hasattr(instance, 'GlobalId') else 'unknown'
-                        warning_msg = f"Failed to extract element {element_id}: {str(e)}"
-                        metrics["warnings"].append(warning_msg)
-                        logger.warning("element_extraction_failed", element_id=element_id, error=str(e))
-                        continue
-
-            except Exception as e:
-                # Skip element types that don't exist in this IFC schema
-                continue
+        stats = ElementStatistics()
+
+        copy_writer = None
+        if copy_format:
+            binary = args.format == "copy-binary"
+            copy_writer = IfcElementCopyWriter(sys.stdout.buffer, args.revision_id, binary=binary)
+            logger.info("copy_stream_started", statement=copy_statement(binary=binary))
+
+        # Extract elements (each entity visited exactly once)
+        for element_data in extractor.iter_elements(warnings=metrics["warnings"]):
+            stats.add(element_data)
+
+            if diff is not None:
+                change = diff.classify(element_data)
+                if change == UNCHANGED:
+                    continue
+                element_data = {**element_data, "change": change}
+            else:
+                content_hashes[element_data["global_id"]] = element_data["content_hash"]
+
+            if copy_writer is not None:
+                copy_writer.write_element(element_data)
+            elif streaming:
+                # Write each element as soon as it is extracted; memory stays flat
+                sys.stdout.write(json.dumps(element_data, separators=(",", ":"), default=str) + "\n")
+            else:
+                elements.append(element_data)
+
+        removed = diff.removed() if diff is not None else []
+
+        if copy_writer is not None:
+            copy_writer.close()
+        elif streaming:
+            for global_id in removed:
+                sys.stdout.write(json.dumps({"global_id": global_id, "change": REMOVED}) + "\n")
 
         extract_time_ms = int((time.time() - extract_start) * 1000)
         metrics["timings"]["element_extraction_ms"] = extract_time_ms
-        logger.info("extraction_completed", element_count=len(elements), time_ms=extract_time_ms)
-
-        # Calculate statistics
-        element_type_counts = count_element_types(elements)
-        total_psets, total_props, total_quantities = count_properties(elements)
+        logger.info("extraction_completed", element_count=stats.total_elements, time_ms=extract_time_ms)
 
         metrics["statistics"] = {
-            "total_elements": len(elements),
-            "element_type_counts": element_type_counts,
-            "total_property_sets": total_psets,
-            "total_properties": total_props,
-            "total_quantities": total_quantities
+            "total_elements": stats.total_elements,
+            "element_type_counts": dict(stats.type_counts),
+            "total_property_sets": stats.total_psets,
+            "total_properties": stats.total_props,
+            "total_quantities": stats.total_quantities,
+            "duplicates_avoided": extractor.enumeration_stats["duplicates_avoided"],
+            "type_pset_cache": extractor.get_type_pset_cache_stats(),
+            "workers": getattr(extractor, "workers", 1)
         }
+        if diff is not None:
+            metrics["statistics"]["changes"] = diff.get_stats()
+            if copy_format:
+                # COPY payload has no room for deletions
+                metrics["removed"] = removed
+
+        if args.hashes_output:
+            with open(args.hashes_output, "w") as f:
+                json.dump(content_hashes, f, separators=(",", ":"))
 
         # Total time
-        total_time_ms = parse_time_ms + extract_time_ms
+        total_time_ms = parse_time_ms + index_time_ms + extract_time_ms
         metrics["timings"]["total_ms"] = total_time_ms
         metrics["end_time"] = datetime.utcnow().isoformat()
 
         logger.info("metrics_calculated",
-                   total_elements=len(elements),
-                   total_psets=total_psets,
-                   total_props=total_props,
+                   total_elements=stats.total_elements,
+                   total_psets=stats.total_psets,
+                   total_props=stats.total_props,
                    warnings=len(metrics["warnings"]))
 
-        # Output combined result with elements AND metrics
-        result = {
-            "elements": elements,
-            "metrics": metrics
-        }
-
-        print(json.dumps(result, indent=2, default=str))
+        if args.metrics_file:
+            with open(args.metrics_file, "w") as f:
+                json.dump(metrics, f, indent=2, default=str)
+
+        if copy_format:
+            # stdout carries only the COPY payload
+            logger.info("extraction_metrics", metrics=metrics)
+        elif streaming:
+            # Final record carries the metrics
+            sys.stdout.write(json.dumps({"metrics": metrics}, separators=(",", ":"), default=str) + "\n")
+            sys.stdout.flush()
+        else:
+            # Output combined result with elements AND metrics
+            result = {
+                "elements": elements,
+                "metrics": metrics
+            }
+            if diff is not None:
+                result["removed"] = removed
+
+            print(json.dumps(result, indent=2, default=str))
 
     except FileNotFoundError as e:
         logger.error("file_not_found", ifc_file_path=ifc_file_path, error=str(e))
-        print(json.dumps({"error": str(e)}))
+        # Never mix an error document into a COPY payload
+        print(json.dumps({"error": str(e)}), file=sys.stderr if copy_format else sys.stdout)
         sys.exit(1)
     except Exception as e:
         logger.exception("extraction_failed", ifc_file_path=ifc_file_path, error=str(e))
-        print(json.dumps({"error": f"Failed to extract elements: {str(e)}"}))
+        print(json.dumps({"error": f"Failed to extract elements: {str(e)}"}), file=sys.stderr if copy_format else sys.stdout)
         sys.exit(1)
 
 
@@ -53,9 +53,11 @@ def main():
 
     try:
         # Create extractor instance
-        extractor = PropertyExtractor(args.input_file)
+        extractor = PropertyExtractor()
 
         if args.all:
+            extractor.open_file(args.input_file)
+
             # Extract properties for all elements
             global_ids = extractor.get_all_elements_with_properties()
 
@@ -75,8 +77,11 @@ def main():
                 for guid, props in results.items()
             }
         else:
-            # Extract properties for single element
-            properties = extractor.extract_properties(args.element_guid)
+            # Extract properties for single element (served from the artifact cache if enabled)
+            results = extractor.extract_properties_from_file(args.input_file, [args.element_guid])
+            if args.element_guid not in results:
+                raise RuntimeError(f"Element not found with GlobalId: {args.element_guid}")
+            properties = results[args.element_guid]
 
             # Convert dataclass to dict
             output = asdict(properties)
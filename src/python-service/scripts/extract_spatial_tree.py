@@ -9,6 +9,10 @@
     python extract_spatial_tree.py <input.ifc>
     python extract_spatial_tree.py <input.ifc> --flat
     python extract_spatial_tree.py <input.ifc> --storey <storey-guid>
+    python extract_spatial_tree.py <input.ifc> --compact
+    python extract_spatial_tree.py <input.ifc> --root
+    python extract_spatial_tree.py <input.ifc> --children <guid> [--offset 0] [--limit 100]
+    python extract_spatial_tree.py <input.ifc> --node <guid>
 
 Examples:
     # Extract full tree
@@ -20,6 +24,13 @@
     # Extract elements in a specific storey
     python extract_spatial_tree.py model.ifc --storey "2O2Fr$t4X7Zf8NOew3FKau"
 
+    # Extract full tree as compact parallel arrays (several times smaller)
+    python extract_spatial_tree.py model.ifc --compact
+
+    # Lazy tree: root node, then one page of a node's children
+    python extract_spatial_tree.py model.ifc --root
+    python extract_spatial_tree.py model.ifc --children "2O2Fr$t4X7Zf8NOew3FKau" --offset 100 --limit 100
+
 Exit codes:
     0: Success
     1: Error (file not found, parsing error, etc.)
@@ -33,7 +44,7 @@
 # Add parent directory to path to import ifc_intelligence package
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ifc_intelligence.spatial_tree_extractor import SpatialTreeExtractor
+from ifc_intelligence.spatial_tree_extractor import DEFAULT_PAGE_SIZE, SpatialTreeExtractor
 
 
 def main():
@@ -51,6 +62,14 @@ def main():
 
   # Extract elements in a specific building storey
   python extract_spatial_tree.py model.ifc --storey "2O2Fr$t4X7Zf8NOew3FKau"
+
+  # Extract full tree as compact parallel arrays
+  python extract_spatial_tree.py model.ifc --compact
+
+  # Lazy tree: root node, one page of children, single node with its ancestor path
+  python extract_spatial_tree.py model.ifc --root
+  python extract_spatial_tree.py model.ifc --children "2O2Fr$t4X7Zf8NOew3FKau" --limit 50
+  python extract_spatial_tree.py model.ifc --node "2O2Fr$t4X7Zf8NOew3FKau"
         """
     )
 
@@ -73,6 +92,46 @@ def main():
         help="Extract elements in a specific building storey (by GUID)"
     )
 
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Encode the full tree as parallel arrays (see SpatialNode.to_compact) without indentation"
+    )
+
+    parser.add_argument(
+        "--root",
+        action="store_true",
+        help="Return only the root node (with its child count)"
+    )
+
+    parser.add_argument(
+        "--children",
+        type=str,
+        metavar="GUID",
+        help="Return one page of the children of a tree node (by GUID)"
+    )
+
+    parser.add_argument(
+        "--node",
+        type=str,
+        metavar="GUID",
+        help="Return a single tree node with the GUIDs of its ancestors"
+    )
+
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="First child to return with --children (default: 0)"
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Maximum number of children with --children (default: {DEFAULT_PAGE_SIZE})"
+    )
+
     args = parser.parse_args()
 
     # Validate input file
@@ -112,6 +171,15 @@ def main():
                 "elements": elements
             }
 
+        elif args.root:
+            result = extractor.get_root(str(input_path))
+
+        elif args.children:
+            result = extractor.get_children(str(input_path), args.children, offset=args.offset, limit=args.limit)
+
+        elif args.node:
+            result = extractor.get_node(str(input_path), args.node)
+
         elif args.flat:
             # Extract flat list of spatial elements
             elements = extractor.get_spatial_elements_flat(str(input_path))
@@ -120,6 +188,20 @@ def main():
                 "elements": elements
             }
 
+        elif args.compact:
+            # Extract full tree as parallel arrays; nodes are numbered
+            # breadth-first, so every parent precedes its children
+            result = extractor.extract_tree(str(input_path)).to_compact()
+
+            depths = [0] * result["count"]
+            for position, parent in enumerate(result["parent"]):
+                if parent >= 0:
+                    depths[position] = depths[parent] + 1
+            metrics["statistics"] = {
+                "tree_depth": max(depths),
+                "node_count": result["count"]
+            }
+
         else:
             # Extract full tree
             tree = extractor.extract_tree(str(input_path))
@@ -155,7 +237,10 @@ def calculate_tree_stats(node, depth=0):
         result["metrics"] = metrics
 
         # Output JSON
-        print(json.dumps(result, indent=2))
+        if args.compact:
+            print(json.dumps(result, separators=(",", ":")))
+        else:
+            print(json.dumps(result, indent=2))
 
     except FileNotFoundError as e:
         print(json.dumps({
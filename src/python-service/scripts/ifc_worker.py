@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+IFC Intelligence Worker CLI Script
+
+Start a long-lived worker that serves IFC requests over stdin/stdout.
+Unlike the one-shot scripts, the worker keeps parsed IFC files in its
+RAM cache between requests.
+
+Usage:
+    python scripts/ifc_worker.py [--cache-size 10] [--ttl-hours 24] [--max-memory-mb 4096] [--hash-content]
+                                 [--cache-policy lru|lfu|cost] [--trace-file trace.ndjson]
+                                 [--artifact-cache-dir DIR] [--artifact-cache-mb 1024]
+
+Protocol:
+    One JSON request per line on stdin, one JSON response per line on stdout.
+
+    {"id": 1, "command": "parse", "params": {"file_path": "model.ifc"}}
+    {"id": 2, "command": "properties", "params": {"file_path": "model.ifc", "element_guid": "2O2Fr$t4X7Zf8NOew3FKau"}}
+    {"id": 3, "command": "stats"}
+    {"id": 4, "command": "shutdown"}
+
+Commands:
+    ping, parse, spatial_tree, spatial_root, spatial_children, spatial_node, properties, bulk, gltf, process_revision, prescan, stats, evict, shutdown
+
+This script is designed to be started once by the .NET backend and kept running.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ifc_intelligence.artifact_cache import ArtifactCache
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.cache_policy import CACHE_POLICIES
+from ifc_intelligence.worker import IfcWorker
+
+
+def main():
+    """Main entry point for CLI script."""
+
+    parser = argparse.ArgumentParser(
+        description="Serve IFC requests over stdin/stdout with a shared RAM cache",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=10,
+        help="Maximum number of IFC files kept in RAM (default: 10)"
+    )
+
+    parser.add_argument(
+        "--ttl-hours",
+        type=int,
+        default=24,
+        help="Time-to-live of cached IFC files in hours (default: 24)"
+    )
+
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Memory budget for parsed IFC files in MB; least recently used files are evicted "
+             "to stay below it (default: no budget)"
+    )
+
+    parser.add_argument(
+        "--hash-content",
+        action="store_true",
+        help="Identify cached files by content hash, so identical uploads under "
+             "different paths share one parsed model (default: mtime/size fingerprint)"
+    )
+
+    parser.add_argument(
+        "--cache-policy",
+        choices=sorted(CACHE_POLICIES),
+        default="lru",
+        help="Eviction/admission policy; 'lfu' keeps hot models through bulk scans, "
+             "'cost' keeps models that are expensive to parse (default: lru)"
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        help="Append every cache request to this NDJSON file "
+             "(replay with scripts/benchmark_cache_policies.py)"
+    )
+
+    parser.add_argument(
+        "--artifact-cache-dir",
+        help="Directory for persistent metadata/spatial tree/property results, shared "
+             "across restarts (default: IFC_ARTIFACT_CACHE_DIR, disabled if unset)"
+    )
+
+    parser.add_argument(
+        "--artifact-cache-mb",
+        type=float,
+        default=1024,
+        help="Disk budget of the artifact cache in MB (default: 1024)"
+    )
+
+    parser.add_argument(
+        "--ifcconvert",
+        default="IfcConvert",
+        help="Path to IfcConvert binary (default: searches PATH)"
+    )
+
+    args = parser.parse_args()
+
+    cache = IfcCacheManager(
+        max_size=args.cache_size,
+        ttl_hours=args.ttl_hours,
+        max_memory_mb=args.max_memory_mb,
+        hash_content=args.hash_content,
+        policy=args.cache_policy,
+        trace_path=args.trace_file
+    )
+    artifacts = None
+    if args.artifact_cache_dir:
+        artifacts = ArtifactCache(args.artifact_cache_dir, max_disk_mb=args.artifact_cache_mb)
+
+    worker = IfcWorker(cache_manager=cache, ifcconvert_path=args.ifcconvert, artifact_cache=artifacts)
+
+    try:
+        worker.serve()
+    except KeyboardInterrupt:
+        pass
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,20 @@
 
 Usage:
     python scripts/parse_ifc.py <input.ifc>
+    python scripts/parse_ifc.py <input.ifc> --fast
 
 Output:
     JSON to stdout with IFC metadata
 
+--fast reads only the STEP header and the project/owner history records
+(no full parse); entity counts are then sampled and may be approximate.
+
 This script is designed to be called by the .NET backend via ProcessRunner.
 """
 
 import sys
 import json
+import argparse
 from dataclasses import asdict
 from pathlib import Path
 
@@ -27,20 +32,41 @@
 def main():
     """Main entry point for CLI script."""
 
-    # Check arguments
-    if len(sys.argv) < 2:
-        error_result = {"error": "Usage: parse_ifc.py <input.ifc>"}
-        print(json.dumps(error_result))
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Parse an IFC file and output metadata as JSON",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "input_file",
+        help="Path to input IFC file"
+    )
+
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Read only the header and project records instead of parsing the model "
+             "(milliseconds on large files; entity counts may be approximate)"
+    )
+
+    parser.add_argument(
+        "--sample-mb",
+        type=float,
+        default=16,
+        help="With --fast: MB of the DATA section scanned for entity counts (default: 16)"
+    )
 
-    file_path = sys.argv[1]
+    args = parser.parse_args()
 
     try:
         # Create parser instance
-        parser = IfcParser()
+        ifc_parser = IfcParser()
 
-        # Parse IFC file
-        metadata = parser.parse_file(file_path)
+        # Parse IFC file (or only its header)
+        if args.fast:
+            metadata = ifc_parser.parse_header(args.input_file, sample_bytes=int(args.sample_mb * 1024 * 1024))
+        else:
+            metadata = ifc_parser.parse_file(args.input_file)
 
         # Convert dataclass to dict
         result = asdict(metadata)
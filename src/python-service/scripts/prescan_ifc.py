@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Pre-scan an IFC file without parsing it.
+
+Tokenizes the raw STEP DATA section (memory-mapped, no entity objects) and
+reports instance counts per entity type, the number of elements bulk
+extraction would visit, the recommended number of worker processes and
+predicted memory use and processing time of a full run.
+
+Usage:
+    python prescan_ifc.py <input.ifc> [--max-workers 8] [--top 20]
+
+Output:
+    JSON to stdout
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import ifc_intelligence module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ifc_intelligence.parallel_extractor import plan_extraction
+from ifc_intelligence.step_scanner import scan_entities
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-scan an IFC file: entity counts and processing plan without parsing",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "input_file",
+        help="Path to input IFC file"
+    )
+
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Upper limit for the recommended worker processes (default: number of CPUs)"
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of most frequent entity types to list (default: 20, 0 = all)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        scan = scan_entities(args.input_file)
+        plan = plan_extraction(args.input_file, max_workers=args.max_workers, scan=scan)
+
+        histogram = sorted(scan.histogram.items(), key=lambda item: item[1], reverse=True)
+        if args.top:
+            histogram = histogram[:args.top]
+
+        print(json.dumps({
+            "file": args.input_file,
+            "plan": plan,
+            "entity_counts": dict(histogram),
+            "unknown_types": scan.unknown_types
+        }, indent=2))
+
+    except FileNotFoundError as e:
+        print(json.dumps({"error": f"File not found: {str(e)}"}))
+        sys.exit(1)
+
+    except Exception as e:
+        print(json.dumps({"error": f"Pre-scan failed: {str(e)}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
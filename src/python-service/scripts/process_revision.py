@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Revision Processing CLI Script
+
+Run all upload stages (metadata, spatial tree, bulk elements, glTF export)
+with a single parse of the IFC file and output one combined JSON result.
+
+Usage:
+    python scripts/process_revision.py <input.ifc> [--gltf-output output.glb] [--format glb|gltf]
+                                       [--stages metadata,spatial_tree,elements,gltf]
+
+Output:
+    JSON to stdout with one key per stage and combined metrics
+    Structured logs (stderr)
+
+This script is designed to be called by the .NET backend via ProcessRunner.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ifc_intelligence.gltf_exporter import GltfExportOptions
+from ifc_intelligence.pipeline import RevisionPipeline, PIPELINE_STAGES
+
+
+def main():
+    """Main entry point for CLI script."""
+
+    parser = argparse.ArgumentParser(
+        description="Process an IFC revision (metadata, spatial tree, elements, glTF) with a single parse",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        "input_file",
+        help="Path to input IFC file"
+    )
+
+    parser.add_argument(
+        "--gltf-output",
+        help="Path to output glTF/GLB file (glTF stage is skipped if omitted)"
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["glb", "gltf"],
+        default="glb",
+        help="glTF output format (default: glb)"
+    )
+
+    parser.add_argument(
+        "--stages",
+        default=",".join(PIPELINE_STAGES),
+        help=f"Comma-separated stages to run (default: {','.join(PIPELINE_STAGES)})"
+    )
+
+    parser.add_argument(
+        "--use-names",
+        action="store_true",
+        help="Use element names instead of GUIDs in glTF"
+    )
+
+    parser.add_argument(
+        "--center",
+        action="store_true",
+        help="Center the glTF model at origin"
+    )
+
+    parser.add_argument(
+        "--y-up",
+        action="store_true",
+        help="Use Y-up coordinate system in glTF (default is Z-up)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        pipeline = RevisionPipeline()
+
+        options = GltfExportOptions(
+            use_element_names=args.use_names,
+            center_model=args.center,
+            y_up=args.y_up
+        )
+
+        result = pipeline.process(
+            args.input_file,
+            gltf_output_path=args.gltf_output,
+            gltf_format=args.format,
+            gltf_options=options,
+            stages=[stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        )
+
+        print(json.dumps(result, indent=2, default=str))
+        sys.exit(0)
+
+    except FileNotFoundError as e:
+        print(json.dumps({"error": f"File not found: {str(e)}"}))
+        sys.exit(1)
+
+    except ValueError as e:
+        print(json.dumps({"error": f"Invalid arguments: {str(e)}"}))
+        sys.exit(1)
+
+    except RuntimeError as e:
+        print(json.dumps({"error": f"Runtime error: {str(e)}"}))
+        sys.exit(1)
+
+    except Exception as e:
+        print(json.dumps({"error": f"Unexpected error: {str(e)}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,8 @@
             "ifc-export-gltf=scripts.export_gltf:main",
             "ifc-extract-properties=scripts.extract_properties:main",
             "ifc-extract-spatial=scripts.extract_spatial:main",
+            "ifc-worker=scripts.ifc_worker:main",
+            "ifc-process-revision=scripts.process_revision:main",
         ],
     },
 )
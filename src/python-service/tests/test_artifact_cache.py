@@ -0,0 +1,222 @@
+"""
+Unit Tests for the Persistent Artifact Cache
+
+Tests the on-disk format, keys, disk-size eviction and the artifact lookups
+in IfcParser, SpatialTreeExtractor and PropertyExtractor.
+"""
+
+import os
+import shutil
+import pytest
+from dataclasses import asdict
+from pathlib import Path
+
+from ifc_intelligence.artifact_cache import (
+    ArtifactCache,
+    artifact_key,
+    decode_artifact,
+    encode_artifact,
+)
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.parser import IfcParser
+from ifc_intelligence.property_extractor import PropertyExtractor
+from ifc_intelligence.spatial_tree_extractor import SpatialTreeExtractor
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+SAMPLE_IFC = FIXTURES_DIR / "sample.ifc"
+
+
+class CountingCacheManager(IfcCacheManager):
+    """RAM cache that counts how often a file is requested."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def get_or_load(self, file_path):
+        self.requests += 1
+        return super().get_or_load(file_path)
+
+
+@pytest.fixture
+def duplex_copy(tmp_path):
+    """Copy of Duplex.ifc that tests may modify."""
+    path = tmp_path / "model.ifc"
+    shutil.copy(DUPLEX_IFC, path)
+    return str(path)
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    """Empty artifact cache."""
+    return ArtifactCache(str(tmp_path / "artifacts"))
+
+
+def test_encode_decode_roundtrip():
+    """Test that artifacts survive the binary format unchanged."""
+    data = {"name": "Wand", "values": [1, 2.5, None, True], "nested": {"ä": "ö"}}
+
+    blob = encode_artifact(data)
+
+    assert blob[:4] == b"IFCA"
+    assert decode_artifact(blob) == data
+
+
+def test_decode_rejects_invalid_data():
+    """Test that foreign or truncated files are rejected."""
+    blob = encode_artifact({"a": 1})
+
+    with pytest.raises(ValueError):
+        decode_artifact(b"XXXX" + blob[4:])
+    with pytest.raises(ValueError):
+        decode_artifact(blob[:-3])
+    with pytest.raises(ValueError):
+        decode_artifact(b"IF")
+
+
+def test_key_depends_on_version_and_options():
+    """Test that extractor version and options are part of the key."""
+    base = artifact_key("abc", "properties", 1, {"global_id": "x"})
+
+    assert artifact_key("abc", "properties", 1, {"global_id": "x"}) == base
+    assert artifact_key("abc", "properties", 2, {"global_id": "x"}) != base
+    assert artifact_key("abc", "properties", 1, {"global_id": "y"}) != base
+    assert artifact_key("abd", "properties", 1, {"global_id": "x"}) != base
+
+
+def test_put_and_get(artifacts, duplex_copy):
+    """Test storing and reading an artifact."""
+    assert artifacts.get(duplex_copy, "metadata", 1) is None
+
+    artifacts.put(duplex_copy, "metadata", 1, {"schema": "IFC2X3"})
+
+    assert artifacts.get(duplex_copy, "metadata", 1) == {"schema": "IFC2X3"}
+    assert artifacts.get(duplex_copy, "metadata", 2) is None
+    stats = artifacts.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["writes"] == 1
+    assert stats["disk_bytes"] > 0
+
+
+def test_changed_file_misses(artifacts, duplex_copy):
+    """Test that artifacts of the old content are not served for a modified file."""
+    artifacts.put(duplex_copy, "metadata", 1, {"schema": "IFC2X3"})
+
+    shutil.copy(SAMPLE_IFC, duplex_copy)
+
+    assert artifacts.get(duplex_copy, "metadata", 1) is None
+
+
+def test_identical_content_shares_artifacts(artifacts, duplex_copy, tmp_path):
+    """Test that a copy of a processed file hits the same artifacts."""
+    artifacts.put(duplex_copy, "metadata", 1, {"schema": "IFC2X3"})
+    other = tmp_path / "upload.ifc"
+    shutil.copy(duplex_copy, other)
+
+    assert artifacts.get(str(other), "metadata", 1) == {"schema": "IFC2X3"}
+
+
+def test_artifacts_persist_across_instances(tmp_path, duplex_copy):
+    """Test that a new cache instance on the same directory sees earlier artifacts."""
+    ArtifactCache(str(tmp_path / "artifacts")).put(duplex_copy, "metadata", 1, {"schema": "IFC2X3"})
+
+    reopened = ArtifactCache(str(tmp_path / "artifacts"))
+
+    assert reopened.get(duplex_copy, "metadata", 1) == {"schema": "IFC2X3"}
+    assert reopened.get_stats()["disk_bytes"] > 0
+
+
+def test_corrupt_artifact_is_removed(artifacts, duplex_copy):
+    """Test that a damaged artifact file is treated as a miss and deleted."""
+    artifacts.put(duplex_copy, "metadata", 1, {"schema": "IFC2X3"})
+    path = next(Path(artifacts.cache_dir).rglob("*.ifca"))
+    path.write_bytes(b"garbage")
+
+    assert artifacts.get(duplex_copy, "metadata", 1) is None
+    assert not path.exists()
+    assert artifacts.get_stats()["errors"] == 1
+
+
+def test_eviction_by_disk_size(tmp_path, duplex_copy):
+    """Test that least recently used artifacts are deleted to stay within the disk budget."""
+    # Incompressible payload of ~40 KB per artifact, budget for about two
+    artifacts = ArtifactCache(str(tmp_path / "artifacts"), max_disk_mb=0.1, compress_level=0)
+    payload = "x" * 40_000
+
+    for i in range(3):
+        artifacts.put(duplex_copy, "properties", 1, payload, {"global_id": str(i)})
+        # Distinct mtimes, the first artifact is the least recently used
+        for path in Path(artifacts.cache_dir).rglob("*.ifca"):
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+
+    stats = artifacts.get_stats()
+    assert stats["evictions"] >= 1
+    assert stats["disk_bytes"] <= artifacts.max_disk_bytes
+    assert artifacts.get(duplex_copy, "properties", 1, {"global_id": "0"}) is None
+    assert artifacts.get(duplex_copy, "properties", 1, {"global_id": "2"}) == payload
+
+
+def test_missing_ifc_file_is_a_miss(artifacts):
+    """Test that lookups for missing IFC files don't raise."""
+    assert artifacts.get("/nonexistent/file.ifc", "metadata", 1) is None
+
+
+def test_parser_uses_artifacts(artifacts, duplex_copy):
+    """Test that metadata is read from disk instead of parsing again."""
+    first_cache = CountingCacheManager()
+    metadata = IfcParser(cache_manager=first_cache, artifact_cache=artifacts).parse_file(duplex_copy)
+
+    # Fresh RAM cache, as after a process restart
+    second_cache = CountingCacheManager()
+    cached = IfcParser(cache_manager=second_cache, artifact_cache=artifacts).parse_file(duplex_copy)
+
+    assert cached == metadata
+    assert first_cache.requests == 1
+    assert second_cache.requests == 0
+
+
+def test_spatial_tree_uses_artifacts(artifacts, duplex_copy):
+    """Test that the spatial tree is rebuilt from disk without parsing."""
+    tree = SpatialTreeExtractor(cache_manager=CountingCacheManager(), artifact_cache=artifacts).extract_tree(duplex_copy)
+
+    second_cache = CountingCacheManager()
+    cached = SpatialTreeExtractor(cache_manager=second_cache, artifact_cache=artifacts).extract_tree(duplex_copy)
+
+    assert cached.to_dict() == tree.to_dict()
+    assert second_cache.requests == 0
+
+
+def test_properties_use_artifacts(artifacts, duplex_copy):
+    """Test that per-element properties are cached and only missing elements trigger parsing."""
+    extractor = PropertyExtractor(cache_manager=CountingCacheManager(), artifact_cache=artifacts)
+    extractor.open_file(duplex_copy)
+    global_ids = extractor.get_all_elements_with_properties()[:3]
+
+    first = extractor.extract_properties_from_file(duplex_copy, global_ids[:2])
+
+    second_cache = CountingCacheManager()
+    second = PropertyExtractor(cache_manager=second_cache, artifact_cache=artifacts)
+    cached = second.extract_properties_from_file(duplex_copy, global_ids[:2])
+    assert second_cache.requests == 0
+    assert {guid: asdict(props) for guid, props in cached.items()} == \
+        {guid: asdict(props) for guid, props in first.items()}
+
+    mixed = second.extract_properties_from_file(duplex_copy, global_ids)
+    assert list(mixed) == global_ids
+    assert second_cache.requests == 1
+
+
+def test_properties_without_artifact_cache(duplex_copy):
+    """Test that extract_properties_from_file works with the artifact cache disabled."""
+    extractor = PropertyExtractor(artifact_cache=None)
+    extractor.open_file(duplex_copy)
+    global_id = extractor.get_all_elements_with_properties()[0]
+
+    results = extractor.extract_properties_from_file(duplex_copy, [global_id, "does-not-exist"])
+
+    assert list(results) == [global_id]
@@ -0,0 +1,179 @@
+"""
+Unit Tests for Bulk Element Extractor
+
+Tests the BulkElementExtractor class with real and synthetic IFC files.
+"""
+
+import pytest
+from pathlib import Path
+import ifcopenshell
+import ifcopenshell.guid
+import ifcopenshell.util.element
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.bulk_element_extractor import BulkElementExtractor, resolve_covering_types
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+
+@pytest.fixture
+def mep_ifc(tmp_path):
+    """Small IFC4 model with MEP elements that are subtypes of several ELEMENT_TYPES entries."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    ifc_file.create_entity("IfcProject", GlobalId=ifcopenshell.guid.new(), Name="MEP Project")
+
+    for _ in range(3):
+        ifc_file.create_entity("IfcWall", GlobalId=ifcopenshell.guid.new(), Name="Wall")
+    for _ in range(4):
+        ifc_file.create_entity("IfcSanitaryTerminal", GlobalId=ifcopenshell.guid.new(), Name="Sink")
+    for _ in range(5):
+        ifc_file.create_entity("IfcPipeSegment", GlobalId=ifcopenshell.guid.new(), Name="Pipe")
+    for _ in range(2):
+        ifc_file.create_entity("IfcSensor", GlobalId=ifcopenshell.guid.new(), Name="Sensor")
+
+    path = tmp_path / "mep.ifc"
+    ifc_file.write(str(path))
+    return path
+
+
+def test_resolve_covering_types_drops_subtypes():
+    """Test that subtypes of requested types are removed."""
+    covering = resolve_covering_types(
+        ("IfcDistributionElement", "IfcFlowTerminal", "IfcFlowSegment", "IfcWall"),
+        "IFC4"
+    )
+
+    assert covering == ("IfcDistributionElement", "IfcWall")
+
+
+def test_resolve_covering_types_skips_unknown_types():
+    """Test that types missing in the schema are dropped."""
+    covering = resolve_covering_types(("IfcWall", "IfcPipeSegment"), "IFC2X3")
+
+    assert covering == ("IfcWall",)
+
+
+def test_resolve_element_types_without_file():
+    """Test error when resolving types without loading a file."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+
+    with pytest.raises(RuntimeError, match="No IFC file loaded"):
+        extractor.resolve_element_types()
+
+
+def test_extract_all_elements_no_duplicates(mep_ifc):
+    """Test that MEP elements are extracted exactly once."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+
+    elements = extractor.extract_all_elements(str(mep_ifc))
+    global_ids = [element["global_id"] for element in elements]
+
+    assert len(global_ids) == len(set(global_ids))
+    assert len(elements) == 14
+
+    # 4 sinks (IfcFlowTerminal) + 5 pipes (IfcFlowSegment) would have been visited twice
+    assert extractor.enumeration_stats["duplicates_avoided"] == 9
+    assert extractor.enumeration_stats["instances"] == 14
+    assert "IfcFlowTerminal" not in extractor.enumeration_stats["resolved_types"]
+
+
+def test_covered_types_are_not_enumerated(mep_ifc, monkeypatch):
+    """Test that duplicates are counted without calling by_type() for the dropped types."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    extractor.open_file(str(mep_ifc))
+    called = []
+    by_type = extractor.ifc_file.by_type
+    monkeypatch.setattr(extractor.ifc_file, "by_type",
+                        lambda *args, **kwargs: called.append(args[0]) or by_type(*args, **kwargs))
+
+    instances = list(extractor.iter_element_instances())
+
+    assert len(instances) == 14
+    assert extractor.enumeration_stats["duplicates_avoided"] == 9
+    assert sorted(called) == sorted(extractor.enumeration_stats["resolved_types"])
+
+
+def test_element_count_estimate_matches_extraction(mep_ifc):
+    """Test that the estimate counts each entity once."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+
+    assert extractor.get_element_count_estimate(str(mep_ifc)) == 14
+
+
+def test_element_count_estimate_does_not_parse(mep_ifc):
+    """Test that the estimate comes from the raw pre-scan, not from a parsed file."""
+    cache = IfcCacheManager()
+    extractor = BulkElementExtractor(cache_manager=cache)
+
+    extractor.get_element_count_estimate(str(mep_ifc))
+
+    assert cache.get_stats()["size"] == 0
+
+
+def test_extract_all_elements_duplex():
+    """Test bulk extraction on Duplex.ifc."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+
+    elements = extractor.extract_all_elements(str(DUPLEX_IFC))
+
+    assert len(elements) > 0
+    assert len({element["global_id"] for element in elements}) == len(elements)
+
+    element = elements[0]
+    assert set(element.keys()) >= {"global_id", "element_type", "name", "description", "properties"}
+    assert set(element["properties"].keys()) >= {"property_sets", "quantities", "type_properties"}
+
+
+def test_elements_carry_spatial_location():
+    """Test that bulk elements carry the GUIDs of their building and storey."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    elements = extractor.extract_all_elements(str(DUPLEX_IFC))
+    ifc_file = extractor.ifc_file
+    building_guid = ifc_file.by_type("IfcBuilding")[0].GlobalId
+
+    for element in elements:
+        instance = ifc_file.by_guid(element["global_id"])
+        container = ifcopenshell.util.element.get_container(instance)
+        if container is not None and container.is_a("IfcBuildingStorey"):
+            assert element["storey_global_id"] == container.GlobalId
+            assert element["building_global_id"] == building_guid
+
+    walls = [element for element in elements if element["element_type"].startswith("IfcWall")]
+    assert walls and all(wall["storey_global_id"] for wall in walls)
+
+
+def test_iter_elements_is_lazy_and_matches_list():
+    """Test that iter_elements streams the same elements as extract_all_elements."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    elements = extractor.extract_all_elements(str(DUPLEX_IFC))
+
+    stream = extractor.iter_elements()
+    first = next(stream)
+
+    assert first == elements[0]
+    assert [first] + list(stream) == elements
+
+
+def test_iter_elements_collects_warnings(mep_ifc, monkeypatch):
+    """Test that failing elements are skipped and reported."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    extractor.open_file(str(mep_ifc))
+
+    original = extractor._extract_element_data
+
+    def failing(element):
+        if element.is_a("IfcSensor"):
+            raise ValueError("boom")
+        return original(element)
+
+    monkeypatch.setattr(extractor, "_extract_element_data", failing)
+
+    warnings = []
+    elements = list(extractor.iter_elements(warnings=warnings))
+
+    assert len(elements) == 12
+    assert len(warnings) == 2
+    assert "boom" in warnings[0]
@@ -0,0 +1,368 @@
+"""
+Unit Tests for IFC Cache Manager
+
+Tests LRU eviction, TTL handling, the memory budget, fingerprint keys
+and concurrent (single-flight) loading.
+"""
+
+import os
+import shutil
+import threading
+import time
+import pytest
+from pathlib import Path
+
+from ifc_intelligence import cache_manager as cache_module
+from ifc_intelligence.cache_manager import IfcCacheManager
+import ifcopenshell
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def duplex_copies(tmp_path):
+    """Three copies of Duplex.ifc under different paths."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"duplex_{i}.ifc"
+        shutil.copy(DUPLEX_IFC, path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def no_rss(monkeypatch):
+    """Make memory estimates depend on file size only (deterministic)."""
+    monkeypatch.setattr(cache_module, "get_resident_memory_bytes", lambda: None)
+
+
+def test_hit_and_miss():
+    """Test that a second load is served from the cache."""
+    cache = IfcCacheManager()
+
+    first = cache.get_or_load(str(DUPLEX_IFC))
+    second = cache.get_or_load(str(DUPLEX_IFC))
+
+    assert first is second
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_lru_eviction_by_count(duplex_copies):
+    """Test that the least recently used file is evicted when max_size is reached."""
+    cache = IfcCacheManager(max_size=2)
+
+    cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[1])
+    cache.get_or_load(duplex_copies[0])  # duplex_0 is now most recently used
+    cache.get_or_load(duplex_copies[2])
+
+    stats = cache.get_stats()
+    assert stats["cached_files"] == [duplex_copies[0], duplex_copies[2]]
+    assert stats["evictions"] == 1
+
+
+def test_memory_estimate_uses_file_size_lower_bound(no_rss):
+    """Test the file size × memory_factor estimate."""
+    cache = IfcCacheManager(memory_factor=5.0)
+
+    cache.get_or_load(str(DUPLEX_IFC))
+
+    assert cache.get_stats()["estimated_resident_bytes"] == DUPLEX_IFC.stat().st_size * 5
+
+
+def test_memory_estimate_uses_rss_growth(monkeypatch):
+    """Test that measured RSS growth above the lower bound is used."""
+    readings = iter([100 * MB, 400 * MB])
+    monkeypatch.setattr(cache_module, "get_resident_memory_bytes", lambda: next(readings))
+    cache = IfcCacheManager(memory_factor=1.0)
+
+    cache.get_or_load(str(DUPLEX_IFC))
+
+    assert cache.get_estimated_resident_bytes() == 300 * MB
+
+
+def test_eviction_by_memory_budget(no_rss, duplex_copies):
+    """Test that LRU files are evicted to stay within the memory budget."""
+    per_file = DUPLEX_IFC.stat().st_size * 8
+    # Room for two parsed models, not three
+    cache = IfcCacheManager(max_size=10, max_memory_mb=2.5 * per_file / MB)
+
+    for path in duplex_copies:
+        cache.get_or_load(path)
+
+    stats = cache.get_stats()
+    assert stats["cached_files"] == duplex_copies[1:]
+    assert stats["evictions"] == 1
+    assert stats["estimated_resident_bytes"] == 2 * per_file
+    assert stats["estimated_resident_bytes"] <= cache.max_memory_bytes
+
+
+def test_file_larger_than_budget_is_still_cached(no_rss, duplex_copies):
+    """Test that a single file over budget replaces everything else."""
+    cache = IfcCacheManager(max_memory_mb=1)
+
+    cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[1])
+
+    assert cache.get_stats()["cached_files"] == [duplex_copies[1]]
+
+
+def test_remove_and_clear_release_estimates(no_rss, duplex_copies):
+    """Test that removed files no longer count against the budget."""
+    cache = IfcCacheManager()
+    cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[1])
+
+    cache.remove(duplex_copies[0])
+    assert cache.get_estimated_resident_bytes() == DUPLEX_IFC.stat().st_size * 8
+
+    cache.clear()
+    assert cache.get_estimated_resident_bytes() == 0
+
+
+def _touch(path, seconds):
+    """Move the mtime of a file forward."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_release_listeners(duplex_copies):
+    """Test that listeners see every model leaving the cache and are held weakly."""
+    class Owner:
+        def __init__(self):
+            self.released = []
+
+        def release(self, ifc_file):
+            self.released.append(ifc_file)
+
+    cache = IfcCacheManager(max_size=1)
+    owner = Owner()
+    cache.add_release_listener(owner.release)
+
+    first = cache.get_or_load(duplex_copies[0])
+    second = cache.get_or_load(duplex_copies[1])
+    cache.clear()
+    assert owner.released == [first, second]
+
+    # A dead owner is skipped and dropped from the listeners
+    del owner
+    cache.get_or_load(duplex_copies[0])
+    cache.clear()
+    assert cache._release_listeners == []
+
+
+def test_replaced_file_is_reloaded(tmp_path):
+    """Test that a file replaced at the same path is not served from the cache."""
+    path = tmp_path / "model.ifc"
+    shutil.copy(FIXTURES_DIR / "sample.ifc", path)
+    cache = IfcCacheManager()
+
+    first = cache.get_or_load(str(path))
+    shutil.copy(DUPLEX_IFC, path)
+    second = cache.get_or_load(str(path))
+
+    assert second is not first
+    assert len(second.by_type("IfcWall")) > len(first.by_type("IfcWall"))
+    stats = cache.get_stats()
+    assert stats["invalidations"] == 1
+    assert stats["misses_by_kind"] == {"new": 1, "changed": 1, "expired": 0}
+    assert stats["size"] == 1
+
+
+def test_identical_content_is_shared_across_paths(duplex_copies):
+    """Test that content hashing shares one entry between identical files."""
+    cache = IfcCacheManager(hash_content=True)
+
+    first = cache.get_or_load(duplex_copies[0])
+    second = cache.get_or_load(duplex_copies[1])
+    again = cache.get_or_load(duplex_copies[1])
+
+    assert first is second is again
+    stats = cache.get_stats()
+    assert stats["size"] == 1
+    assert stats["hits_by_kind"] == {"path": 1, "content": 1}
+    assert stats["cached_files"] == duplex_copies[:2]
+
+
+def test_stat_keys_do_not_share_across_paths(duplex_copies):
+    """Test that without content hashing each path gets its own entry."""
+    cache = IfcCacheManager()
+
+    assert cache.get_or_load(duplex_copies[0]) is not cache.get_or_load(duplex_copies[1])
+    assert cache.get_stats()["size"] == 2
+
+
+def test_touched_file_with_same_content_stays_cached(duplex_copies):
+    """Test that an mtime change without content change keeps the entry when hashing."""
+    cache = IfcCacheManager(hash_content=True)
+    first = cache.get_or_load(duplex_copies[0])
+
+    _touch(duplex_copies[0], 10)
+
+    assert cache.get_or_load(duplex_copies[0]) is first
+    assert cache.get_stats()["invalidations"] == 0
+
+
+def test_touched_file_is_reloaded_with_stat_keys(duplex_copies):
+    """Test that an mtime change invalidates the entry with stat fingerprints."""
+    cache = IfcCacheManager()
+    first = cache.get_or_load(duplex_copies[0])
+
+    _touch(duplex_copies[0], 10)
+
+    assert cache.get_or_load(duplex_copies[0]) is not first
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_changed_shared_file_keeps_entry_for_other_paths(duplex_copies):
+    """Test that changing one of two identical files leaves the other one cached."""
+    cache = IfcCacheManager(hash_content=True)
+    shared = cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[1])
+
+    shutil.copy(FIXTURES_DIR / "sample.ifc", duplex_copies[0])
+
+    assert cache.get_or_load(duplex_copies[0]) is not shared
+    assert cache.get_or_load(duplex_copies[1]) is shared
+    assert cache.get_stats()["invalidations"] == 0
+
+
+def test_remove_by_path(duplex_copies):
+    """Test removing an entry by one of its paths."""
+    cache = IfcCacheManager(hash_content=True)
+    cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[1])
+
+    cache.remove(duplex_copies[1])
+
+    assert cache.get_stats()["size"] == 0
+
+
+def _run_concurrently(func, args_list):
+    """Run func once per args tuple in parallel threads, started together."""
+    barrier = threading.Barrier(len(args_list))
+    results = [None] * len(args_list)
+    errors = [None] * len(args_list)
+
+    def run(i, args):
+        barrier.wait()
+        try:
+            results[i] = func(*args)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return results, errors
+
+
+def test_concurrent_requests_load_once(monkeypatch):
+    """Test that concurrent misses on the same file are coalesced into one parse."""
+    calls = []
+    real_open = ifcopenshell.open
+
+    def slow_open(path):
+        calls.append(path)
+        time.sleep(0.3)
+        return real_open(path)
+
+    monkeypatch.setattr(cache_module.ifcopenshell, "open", slow_open)
+    cache = IfcCacheManager()
+
+    results, errors = _run_concurrently(cache.get_or_load, [(str(DUPLEX_IFC),)] * 8)
+
+    assert errors == [None] * 8
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] + stats["hits"] == 7
+    assert stats["coalesced"] >= 1
+    assert stats["in_flight"] == 0
+
+
+def test_different_files_load_in_parallel(monkeypatch, duplex_copies):
+    """Test that a slow load doesn't block loading another file."""
+    started = {path: threading.Event() for path in duplex_copies[:2]}
+    overlapped = []
+    real_open = ifcopenshell.open
+
+    def open_waiting_for_other(path):
+        started[path].set()
+        other = next(p for p in started if p != path)
+        overlapped.append(started[other].wait(timeout=5))
+        return real_open(path)
+
+    monkeypatch.setattr(cache_module.ifcopenshell, "open", open_waiting_for_other)
+    cache = IfcCacheManager()
+
+    results, errors = _run_concurrently(cache.get_or_load, [(path,) for path in duplex_copies[:2]])
+
+    assert errors == [None, None]
+    assert overlapped == [True, True]
+    assert cache.get_stats()["size"] == 2
+
+
+def test_interrupted_load_releases_waiters(monkeypatch):
+    """Test that a KeyboardInterrupt during parsing doesn't leave the load registered."""
+    real_open = ifcopenshell.open
+    attempts = []
+
+    def interrupted_open(path):
+        attempts.append(path)
+        if len(attempts) == 1:
+            raise KeyboardInterrupt
+        return real_open(path)
+
+    monkeypatch.setattr(cache_module.ifcopenshell, "open", interrupted_open)
+    cache = IfcCacheManager()
+
+    with pytest.raises(KeyboardInterrupt):
+        cache.get_or_load(str(DUPLEX_IFC))
+    assert cache.get_stats()["in_flight"] == 0
+
+    assert cache.get_or_load(str(DUPLEX_IFC)).schema == "IFC2X3"
+    assert len(attempts) == 2
+
+
+def test_failed_load_is_shared_and_retried(monkeypatch, tmp_path):
+    """Test that waiters get the loader's error and a later request loads again."""
+    path = tmp_path / "broken.ifc"
+    path.write_text("not an ifc file")
+    attempts = []
+
+    def failing_open(file_path):
+        attempts.append(file_path)
+        time.sleep(0.2)
+        raise IOError("Unable to parse")
+
+    monkeypatch.setattr(cache_module.ifcopenshell, "open", failing_open)
+    cache = IfcCacheManager()
+
+    results, errors = _run_concurrently(cache.get_or_load, [(str(path),)] * 4)
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert len(attempts) == 1
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(str(path))
+    assert len(attempts) == 2
+    assert cache.get_stats()["in_flight"] == 0
+
+
+def test_nonexistent_file():
+    """Test error for missing files."""
+    cache = IfcCacheManager()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get_or_load("/nonexistent/file.ifc")
@@ -0,0 +1,222 @@
+"""
+Unit Tests for Cache Policies
+
+Tests LRU, LFU and cost-aware policies, trace replay and their use in IfcCacheManager.
+"""
+
+import json
+import shutil
+import pytest
+from pathlib import Path
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.cache_policy import (
+    CachePolicy,
+    CostAwarePolicy,
+    LfuPolicy,
+    LruPolicy,
+    create_policy,
+    replay_trace,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+MB = 1024 * 1024
+
+
+def _workload(scans=3):
+    """Two hot models requested repeatedly, interrupted by scans over ten cold ones."""
+    hot = [("hot_a", 100 * MB, 5.0), ("hot_b", 100 * MB, 5.0)]
+    cold = [(f"cold_{i}", 100 * MB, 5.0) for i in range(10)]
+    accesses = []
+    for _ in range(scans):
+        accesses.extend(hot * 5)
+        accesses.extend(cold)
+    accesses.extend(hot * 5)
+    return accesses
+
+
+def test_create_policy():
+    """Test policy lookup by name."""
+    assert isinstance(create_policy("lru"), LruPolicy)
+    assert isinstance(create_policy("lfu"), LfuPolicy)
+    policy = CostAwarePolicy()
+    assert create_policy(policy) is policy
+
+    with pytest.raises(ValueError, match="Unknown cache policy"):
+        create_policy("fifo")
+
+
+def test_incomplete_policy_cannot_be_created():
+    """Test that a policy missing required methods fails on creation, not on eviction."""
+    class NoVictimPolicy(CachePolicy):
+        def on_insert(self, key, size_bytes, load_seconds):
+            pass
+
+        def on_remove(self, key, evicted=False):
+            pass
+
+        def clear(self):
+            pass
+
+    with pytest.raises(TypeError):
+        NoVictimPolicy()
+
+
+def test_lfu_resists_scans():
+    """Test that LFU keeps hot models through scans that flush LRU."""
+    lru = replay_trace(LruPolicy(), _workload(), max_entries=3)
+    lfu = replay_trace(LfuPolicy(), _workload(), max_entries=3)
+
+    # LRU reloads both hot models after every scan, LFU only loads them once
+    # (the first cold model takes the free slot and is hit in the later scans)
+    assert lru["misses"] == 2 + 3 * 10 + 3 * 2
+    assert lfu["misses"] == 2 + 3 * 10 - 2
+    assert lfu["rejected_admissions"] > 0
+    assert lfu["hit_rate"] > lru["hit_rate"]
+
+
+def test_lfu_admits_frequently_requested_file():
+    """Test that a file requested more often than the victim gets admitted."""
+    policy = LfuPolicy()
+    accesses = [("a", MB, 1.0)] * 2 + [("b", MB, 1.0)] * 3
+
+    stats = replay_trace(policy, accesses, max_entries=1)
+
+    # b is rejected twice (1 <= 2, 2 <= 2), admitted on its third request
+    assert stats["rejected_admissions"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_lfu_aging_halves_counts():
+    """Test that access counts decay."""
+    policy = LfuPolicy(aging_interval=4)
+    for _ in range(4):
+        policy.record_access("a")
+
+    assert policy.frequency("a") == 2
+
+
+def test_lfu_history_is_bounded():
+    """Test that access counts of uncached keys are trimmed."""
+    policy = LfuPolicy(history_size=5)
+    policy.on_insert("resident", MB, 1.0)
+    policy.record_access("resident")
+    for i in range(20):
+        policy.record_access(f"scan_{i}")
+
+    assert policy.frequency("resident") == 1
+    assert policy.frequency("scan_0") == 0
+    assert len(policy._frequency) == 5
+
+
+def test_cost_policy_evicts_cheap_models_first():
+    """Test that expensive models survive cheaper ones with equal frequency."""
+    policy = CostAwarePolicy()
+    for key, size, seconds in [("large", 500 * MB, 60.0), ("small", 5 * MB, 0.5), ("medium", 50 * MB, 6.0)]:
+        policy.record_access(key)
+        policy.on_insert(key, size, seconds)
+
+    assert policy.victim() == "small"
+    policy.on_remove("small", evicted=True)
+    assert policy.victim() == "medium"
+
+
+def test_cost_policy_prefers_expensive_workload():
+    """Test that the cost policy spends less parse time than LRU when sizes differ."""
+    expensive = [("big", 400 * MB, 120.0)]
+    cheap = [(f"small_{i}", 2 * MB, 0.3) for i in range(4)]
+    accesses = (expensive + cheap) * 10
+
+    lru = replay_trace(LruPolicy(), accesses, max_entries=3)
+    cost = replay_trace(CostAwarePolicy(), accesses, max_entries=3)
+
+    assert cost["parse_seconds"] < lru["parse_seconds"]
+
+
+def test_replay_respects_memory_budget():
+    """Test that replay evicts by memory budget."""
+    accesses = [("a", 60 * MB, 1.0), ("b", 60 * MB, 1.0), ("a", 60 * MB, 1.0)]
+
+    stats = replay_trace(LruPolicy(), accesses, max_entries=10, max_bytes=100 * MB)
+
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 2
+
+
+@pytest.fixture
+def duplex_copies(tmp_path):
+    """Three copies of Duplex.ifc under different paths."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"duplex_{i}.ifc"
+        shutil.copy(DUPLEX_IFC, path)
+        paths.append(str(path))
+    return paths
+
+
+def test_cache_manager_lfu_rejects_scan(duplex_copies):
+    """Test that a one-off file does not displace frequently used ones in the cache."""
+    cache = IfcCacheManager(max_size=2, policy="lfu")
+    for _ in range(2):
+        cache.get_or_load(duplex_copies[0])
+        cache.get_or_load(duplex_copies[1])
+
+    scanned = cache.get_or_load(duplex_copies[2])
+
+    assert scanned.schema == "IFC2X3"
+    stats = cache.get_stats()
+    assert stats["policy"] == "lfu"
+    assert stats["rejected_admissions"] == 1
+    assert stats["cached_files"] == duplex_copies[:2]
+
+
+def test_cache_manager_pins_rejected_file_while_in_use(duplex_copies):
+    """Test that a rejected file is reused while referenced and dropped afterwards."""
+    cache = IfcCacheManager(max_size=2, policy="lfu")
+    for _ in range(2):
+        cache.get_or_load(duplex_copies[0])
+        cache.get_or_load(duplex_copies[1])
+
+    scanned = cache.get_or_load(duplex_copies[2])
+    assert cache.get_or_load(duplex_copies[2]) is scanned
+    assert cache.get_stats()["pinned_hits"] == 1
+
+    # Once the request releases the model, the next request parses it again
+    del scanned
+    cache.get_or_load(duplex_copies[2])
+    stats = cache.get_stats()
+    assert stats["pinned_hits"] == 1
+    assert stats["misses"] == 4
+
+
+def test_cache_manager_lru_is_default(duplex_copies):
+    """Test that the default policy still evicts the least recently used file."""
+    cache = IfcCacheManager(max_size=2)
+    for _ in range(2):
+        cache.get_or_load(duplex_copies[0])
+        cache.get_or_load(duplex_copies[1])
+
+    cache.get_or_load(duplex_copies[2])
+
+    stats = cache.get_stats()
+    assert stats["policy"] == "lru"
+    assert stats["cached_files"] == duplex_copies[1:]
+
+
+def test_cache_manager_writes_trace(tmp_path, duplex_copies):
+    """Test that every request is appended to the access trace."""
+    trace_path = tmp_path / "trace.ndjson"
+    cache = IfcCacheManager(trace_path=str(trace_path))
+
+    cache.get_or_load(duplex_copies[0])
+    cache.get_or_load(duplex_copies[0])
+
+    records = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert [record["event"] for record in records] == ["miss", "hit"]
+    assert records[0]["key"] == records[1]["key"]
+    assert "load_ms" in records[0]
+    assert records[1]["memory"] == records[0]["memory"]
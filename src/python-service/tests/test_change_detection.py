@@ -0,0 +1,154 @@
+"""
+Unit Tests for Change Detection
+
+Tests element content hashes and the revision diff.
+"""
+
+import copy
+import pytest
+from pathlib import Path
+
+import ifcopenshell
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.bulk_element_extractor import BulkElementExtractor
+from ifc_intelligence.change_detection import (
+    RevisionDiff,
+    diff_elements,
+    element_content_hash,
+    ADDED,
+    CHANGED,
+    UNCHANGED,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+WALL = {
+    "global_id": "0BTBFw6f90Nfh9rP1dlXr2",
+    "element_type": "IfcWall",
+    "name": "Wall",
+    "description": None,
+    "properties": {
+        "property_sets": {"Pset_WallCommon": {"IsExternal": True, "FireRating": "F90"}},
+        "quantities": {"Qto_WallBaseQuantities": {"Length": 4.2}},
+        "type_properties": {},
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def duplex_elements():
+    """Elements of Duplex.ifc with content hashes."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    return extractor.extract_all_elements(str(DUPLEX_IFC))
+
+
+def test_hash_ignores_key_order():
+    """Test that the hash is computed over canonical JSON."""
+    reordered = copy.deepcopy(WALL)
+    reordered["properties"]["property_sets"]["Pset_WallCommon"] = {"FireRating": "F90", "IsExternal": True}
+
+    assert element_content_hash(reordered) == element_content_hash(WALL)
+
+
+def test_hash_detects_property_change():
+    """Test that changing a single property value changes the hash."""
+    changed = copy.deepcopy(WALL)
+    changed["properties"]["quantities"]["Qto_WallBaseQuantities"]["Length"] = 4.3
+
+    assert element_content_hash(changed) != element_content_hash(WALL)
+
+
+def test_hash_detects_storey_change():
+    """Test that moving an element to another storey changes the hash."""
+    moved = copy.deepcopy(WALL)
+    moved["storey_global_id"] = "1xS3BCk291UvhgP2a6eflN"
+
+    assert element_content_hash(moved) != element_content_hash(WALL)
+
+
+def _write_wall_with_complex_property(path, padding):
+    """IFC4 file with one wall whose pset holds a complex property; padding shifts all STEP ids."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    for _ in range(padding):
+        ifc_file.createIfcCartesianPoint((0.0, 0.0, 0.0))
+
+    wall = ifc_file.createIfcWall("0BTBFw6f90Nfh9rP1dlXr2", None, "Wall")
+    label = ifc_file.createIfcPropertySingleValue("Label", None, ifc_file.createIfcLabel("A"), None)
+    bounds = ifc_file.createIfcPropertyBoundedValue(
+        "Range", None, ifc_file.createIfcReal(2.0), ifc_file.createIfcReal(1.0), None, None
+    )
+    complex_property = ifc_file.createIfcComplexProperty("Layer", None, "Usage", [label, bounds])
+    pset = ifc_file.createIfcPropertySet("2O2Fr$t4X7Zf8NOew3FKau", None, "Pset_Custom", None, [complex_property])
+    ifc_file.createIfcRelDefinesByProperties("1kTvXnbbzCWw8lcMd1dR4o", None, None, None, [wall], pset)
+    ifc_file.write(str(path))
+
+
+def test_hash_ignores_step_ids_of_complex_properties(tmp_path):
+    """Test that renumbering the file doesn't change the hash of nested property values."""
+    hashes = []
+    for padding in (0, 7):
+        path = tmp_path / f"wall_{padding}.ifc"
+        _write_wall_with_complex_property(path, padding)
+        elements = BulkElementExtractor(cache_manager=IfcCacheManager()).extract_all_elements(str(path))
+        wall = next(element for element in elements if element["element_type"] == "IfcWall")
+        hashes.append(wall["content_hash"])
+
+        layer = wall["properties"]["property_sets"]["Pset_Custom"]["Layer"]
+        assert "id" not in layer
+        assert layer["properties"]["Range"]["UpperBoundValue"] == 2.0
+
+    assert hashes[0] == hashes[1]
+
+
+def test_extracted_elements_carry_stable_hash(duplex_elements):
+    """Test that every element has a hash that matches a fresh extraction."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    again = {element["global_id"]: element["content_hash"]
+             for element in extractor.extract_all_elements(str(DUPLEX_IFC))}
+
+    for element in duplex_elements:
+        assert len(element["content_hash"]) == 32
+        assert again[element["global_id"]] == element["content_hash"]
+
+
+def test_diff_against_identical_revision(duplex_elements):
+    """Test that an unchanged revision produces an empty diff."""
+    previous = {element["global_id"]: element["content_hash"] for element in duplex_elements}
+
+    diff = diff_elements(duplex_elements, previous)
+
+    assert diff["added"] == []
+    assert diff["changed"] == []
+    assert diff["removed"] == []
+    assert diff["statistics"]["unchanged"] == len(duplex_elements)
+
+
+def test_diff_classifies_added_changed_removed():
+    """Test added, changed and removed classification."""
+    changed_wall = copy.deepcopy(WALL)
+    changed_wall["name"] = "Renamed Wall"
+    new_door = {"global_id": "1hOSvn6df7F8_7GcBWlRGQ", "element_type": "IfcDoor",
+                "name": "Door", "description": None, "properties": {}}
+    previous = {WALL["global_id"]: element_content_hash(WALL), "3cUkl32yn9qRSPvBJVyWYp": "0" * 32}
+
+    diff = diff_elements([changed_wall, new_door], previous)
+
+    assert [element["global_id"] for element in diff["changed"]] == [WALL["global_id"]]
+    assert [element["global_id"] for element in diff["added"]] == [new_door["global_id"]]
+    assert diff["added"][0]["change"] == ADDED
+    assert diff["removed"] == ["3cUkl32yn9qRSPvBJVyWYp"]
+    assert diff["statistics"] == {"added": 1, "changed": 1, "unchanged": 0, "removed": 1}
+
+
+def test_revision_diff_streaming():
+    """Test element-by-element classification."""
+    diff = RevisionDiff({WALL["global_id"]: element_content_hash(WALL)})
+
+    assert diff.classify(WALL) == UNCHANGED
+    assert diff.classify({**WALL, "global_id": "2O2Fr$t4X7Zf8NOew3FKau"}) == ADDED
+    assert diff.classify({**WALL, "description": "x"}) == CHANGED
+    assert diff.removed() == []
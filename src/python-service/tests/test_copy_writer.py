@@ -0,0 +1,133 @@
+"""
+Unit Tests for PostgreSQL COPY Writer
+
+Round-trips extracted elements through the text and binary COPY formats.
+"""
+
+import io
+import json
+import struct
+import pytest
+from pathlib import Path
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.bulk_element_extractor import BulkElementExtractor
+from ifc_intelligence.copy_writer import (
+    IfcElementCopyWriter,
+    COPY_COLUMNS,
+    copy_statement,
+    element_to_row,
+    read_copy_text,
+    read_copy_binary,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+TRICKY_ELEMENT = {
+    "global_id": "0BTBFw6f90Nfh9rP1dlXr2",
+    "element_type": "IfcWall",
+    "name": "Wall\twith\ttabs\nand newline \\ backslash – ümlaut",
+    "description": None,
+    "properties": {"property_sets": {"Pset": {"Note": "line1\nline2\t\\"}}, "quantities": {}, "type_properties": {}},
+}
+
+
+def _write(elements, binary):
+    stream = io.BytesIO()
+    writer = IfcElementCopyWriter(stream, revision_id=7, binary=binary)
+    for element in elements:
+        writer.write_element(element)
+    writer.close()
+    return stream.getvalue()
+
+
+def test_copy_statement():
+    """Test the COPY statement column list."""
+    assert copy_statement() == (
+        'COPY "IfcElements" ("RevisionId", "GlobalId", "ElementType", "Name", '
+        '"Description", "PropertiesJson", "BuildingGlobalId", "StoreyGlobalId", "SpaceGlobalId") FROM STDIN'
+    )
+    assert copy_statement(binary=True).endswith("WITH (FORMAT binary)")
+
+
+def test_text_round_trip_with_special_characters():
+    """Test escaping of tabs, newlines, backslashes and NULLs in text format."""
+    rows = list(read_copy_text(_write([TRICKY_ELEMENT], binary=False)))
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert len(row) == len(COPY_COLUMNS)
+    assert row[0] == "7"
+    assert row[1] == TRICKY_ELEMENT["global_id"]
+    assert row[3] == TRICKY_ELEMENT["name"]
+    assert row[4] is None
+    assert json.loads(row[5]) == TRICKY_ELEMENT["properties"]
+
+
+def test_text_rows_are_single_lines():
+    """Test that every element occupies exactly one line."""
+    data = _write([TRICKY_ELEMENT, TRICKY_ELEMENT], binary=False)
+
+    assert data.count(b"\n") == 2
+
+
+def test_binary_round_trip():
+    """Test binary header, field encoding, jsonb version byte and trailer."""
+    data = _write([TRICKY_ELEMENT], binary=True)
+
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    assert data.endswith(struct.pack("!h", -1))
+
+    rows = list(read_copy_binary(data))
+    assert len(rows) == 1
+    row = rows[0]
+    assert struct.unpack("!i", row[0])[0] == 7
+    assert row[1].decode("utf-8") == TRICKY_ELEMENT["global_id"]
+    assert row[3].decode("utf-8") == TRICKY_ELEMENT["name"]
+    assert row[4] is None
+    assert row[5][:1] == b"\x01"
+    assert json.loads(row[5][1:].decode("utf-8")) == TRICKY_ELEMENT["properties"]
+
+
+def test_binary_truncated_payload():
+    """Test that a payload without trailer is rejected."""
+    data = _write([TRICKY_ELEMENT], binary=True)
+
+    with pytest.raises(ValueError, match="truncated"):
+        list(read_copy_binary(data[:-2]))
+
+
+def test_write_after_close():
+    """Test that writing after close fails."""
+    writer = IfcElementCopyWriter(io.BytesIO(), revision_id=1)
+    writer.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.write_element(TRICKY_ELEMENT)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_round_trip_extracted_elements(binary):
+    """Test that every extracted Duplex element survives the COPY round trip."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    elements = extractor.extract_all_elements(str(DUPLEX_IFC))
+
+    data = _write(elements, binary=binary)
+    rows = list(read_copy_binary(data) if binary else read_copy_text(data))
+
+    assert len(rows) == len(elements)
+    for element, row in zip(elements, rows):
+        expected = element_to_row(element, 7)
+        if binary:
+            decoded = [struct.unpack("!i", row[0])[0]] + [
+                None if field is None else field.decode("utf-8") for field in row[1:5]
+            ] + [row[5][1:].decode("utf-8")] + [
+                None if field is None else field.decode("utf-8") for field in row[6:]
+            ]
+        else:
+            decoded = [int(row[0])] + row[1:]
+        assert tuple(decoded) == expected
+    assert any(row[7] is not None for row in rows)
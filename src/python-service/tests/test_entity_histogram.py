@@ -0,0 +1,64 @@
+"""
+Unit Tests for the IFC Entity Histogram
+
+Tests the single-pass class histogram and the schema subtype roll-ups.
+"""
+
+import ifcopenshell
+from pathlib import Path
+
+from ifc_intelligence.entity_histogram import (
+    count_entity_classes,
+    get_supertypes,
+    rollup_entity_counts,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+
+def test_histogram_counts_every_instance():
+    """Test that the histogram covers all instances with exact class counts."""
+    ifc_file = ifcopenshell.open(str(DUPLEX_IFC))
+
+    histogram = count_entity_classes(ifc_file)
+
+    assert sum(histogram.values()) == len(list(ifc_file))
+    assert histogram["IfcWallStandardCase"] == len(ifc_file.by_type("IfcWallStandardCase"))
+    # Exact: walls that are IfcWallStandardCase are not counted as IfcWall
+    assert histogram["IfcWall"] == len(ifc_file.by_type("IfcWall", include_subtypes=False))
+
+
+def test_rollups_match_by_type():
+    """Test that roll-ups equal by_type() including subtypes, also for abstract classes."""
+    ifc_file = ifcopenshell.open(str(DUPLEX_IFC))
+
+    rollups = rollup_entity_counts(count_entity_classes(ifc_file), ifc_file.schema)
+
+    for entity_type in ["IfcWall", "IfcBuildingElement", "IfcProduct", "IfcRoot", "IfcRepresentationItem"]:
+        assert rollups[entity_type] == len(ifc_file.by_type(entity_type))
+
+
+def test_supertypes():
+    """Test the inheritance chain lookup."""
+    assert get_supertypes("IFC2X3", "IfcWallStandardCase")[:3] == ("IfcWallStandardCase", "IfcWall", "IfcBuildingElement")
+    assert get_supertypes("IFC4", "IFCWALL")[-1] == "IfcRoot"
+    assert get_supertypes("IFC4", "IfcNotAnEntity") == ()
+
+
+def test_histogram_of_synthetic_ifc4_file():
+    """Test counting on a file built in memory."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    ifc_file.create_entity("IfcProject", GlobalId=ifcopenshell.guid.new(), Name="P")
+    for _ in range(3):
+        ifc_file.create_entity("IfcPipeSegment", GlobalId=ifcopenshell.guid.new())
+    ifc_file.create_entity("IfcDuctSegment", GlobalId=ifcopenshell.guid.new())
+
+    histogram = count_entity_classes(ifc_file)
+    rollups = rollup_entity_counts(histogram, "IFC4")
+
+    assert histogram == {"IfcProject": 1, "IfcPipeSegment": 3, "IfcDuctSegment": 1}
+    assert rollups["IfcFlowSegment"] == 4
+    assert rollups["IfcRoot"] == 5
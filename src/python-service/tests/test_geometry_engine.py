@@ -0,0 +1,271 @@
+"""
+Unit Tests for In-Process Geometry Engine
+
+Tests the ifcopenshell.geom based glTF export with real IFC files.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.geometry_engine import ExportCancelledError, GeometryEngine, NoGeometryError
+from ifc_intelligence.gltf_exporter import GltfExporter, GltfExportOptions
+from ifc_intelligence.glb_writer import read_glb
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_IFC = FIXTURES_DIR / "sample.ifc"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+requires_duplex = pytest.mark.skipif(not DUPLEX_IFC.exists(), reason="Duplex.ifc not available")
+
+
+@pytest.fixture(scope="module")
+def cache():
+    """Cache shared by all exports of this module (Duplex.ifc is parsed once)."""
+    return IfcCacheManager()
+
+
+def positions_of(document, binary, node):
+    """Vertex positions of a node's mesh."""
+    accessor = document["accessors"][document["meshes"][node["mesh"]]["primitives"][0]["attributes"]["POSITION"]]
+    view = document["bufferViews"][accessor["bufferView"]]
+    return np.frombuffer(binary, dtype=np.float32, count=accessor["count"] * 3,
+                         offset=view["byteOffset"]).reshape(-1, 3)
+
+
+def world_positions(document, binary, node):
+    """Vertex positions of a node's mesh after applying the node matrix."""
+    positions = positions_of(document, binary, node).astype(np.float64)
+    if "matrix" in node:
+        matrix = np.array(node["matrix"]).reshape(4, 4).T
+        positions = (np.c_[positions, np.ones(len(positions))] @ matrix.T)[:, :3]
+    return positions
+
+
+@pytest.fixture(scope="module")
+def default_export(cache, tmp_path_factory):
+    """Duplex.ifc exported with default options (Z-up, not centered)."""
+    if not DUPLEX_IFC.exists():
+        pytest.skip("Duplex.ifc not available")
+    output_path = tmp_path_factory.mktemp("gltf") / "duplex.glb"
+    stats = GeometryEngine(cache_manager=cache).export(str(DUPLEX_IFC), str(output_path), GltfExportOptions())
+    document, binary = read_glb(str(output_path))
+    return stats, document, binary
+
+
+@requires_duplex
+def test_export_nodes_named_by_guid(default_export, cache):
+    """Test that every element becomes one node named by its GlobalId."""
+    stats, document, _ = default_export
+    ifc_file = cache.get_or_load(str(DUPLEX_IFC))
+
+    assert stats["elements"] == len(document["nodes"]) > 0
+    assert stats["triangles"] > 0
+    for node in document["nodes"]:
+        element = ifc_file.by_guid(node["name"])
+        assert node["extras"]["ifc_type"] == element.is_a()
+        # Skipped by default, like IfcConvert
+        assert not element.is_a("IfcOpeningElement")
+        assert not element.is_a("IfcSpace")
+
+
+@requires_duplex
+def test_export_material_names(default_export):
+    """Test that materials carry the IfcSurfaceStyle names."""
+    stats, document, _ = default_export
+    names = {material["name"] for material in document["materials"]}
+
+    assert stats["materials"] == len(document["materials"])
+    assert "Masonry - Brick" in names
+    assert not any(name.startswith("IfcSurfaceStyleRendering-") for name in names)
+
+
+@requires_duplex
+def test_export_y_up_and_centered(default_export, cache, tmp_path):
+    """Test that y_up rotates (x, y, z) to (x, z, -y) and center_model shifts by the placement center."""
+    _, document, binary = default_export
+    output_path = tmp_path / "duplex_y_up.glb"
+
+    GeometryEngine(cache_manager=cache).export(
+        str(DUPLEX_IFC), str(output_path), GltfExportOptions(y_up=True, center_model=True)
+    )
+    y_up_document, y_up_binary = read_glb(str(output_path))
+
+    assert [node["name"] for node in y_up_document["nodes"]] == [node["name"] for node in document["nodes"]]
+
+    z_up = positions_of(document, binary, document["nodes"][0])
+    y_up = positions_of(y_up_document, y_up_binary, y_up_document["nodes"][0])
+    rotated = z_up[:, [0, 2, 1]] * (1.0, 1.0, -1.0)
+
+    # Same shape, shifted by one constant offset
+    offset = y_up - rotated
+    assert np.allclose(offset, offset[0], atol=1e-4)
+    assert not np.allclose(offset[0], 0.0)
+
+
+@requires_duplex
+def test_export_names_without_normals(cache, tmp_path):
+    """Test element names as node names and the no_normals option."""
+    output_path = tmp_path / "duplex_names.gltf"
+    options = GltfExportOptions(use_element_guids=False, use_element_names=True, no_normals=True)
+
+    GeometryEngine(cache_manager=cache).export(str(DUPLEX_IFC), str(output_path), options, format="gltf")
+    document = json.loads(output_path.read_text())
+    ifc_file = cache.get_or_load(str(DUPLEX_IFC))
+
+    node = document["nodes"][0]
+    assert node["name"] == ifc_file.by_guid(node["extras"]["global_id"]).Name
+    for mesh in document["meshes"]:
+        for primitive in mesh["primitives"]:
+            assert "NORMAL" not in primitive["attributes"]
+
+
+@requires_duplex
+def test_export_progress(cache, tmp_path):
+    """Test that progress is reported per element and ends at 100%."""
+    calls = []
+    stats = GeometryEngine(cache_manager=cache).export(
+        str(DUPLEX_IFC), str(tmp_path / "duplex.glb"), GltfExportOptions(threads=2),
+        progress=lambda written, percent: calls.append((written, percent))
+    )
+
+    assert stats["threads"] == 2
+    assert calls[-1] == (stats["elements"], 100)
+    written = [call[0] for call in calls]
+    assert written == sorted(written)
+
+
+@pytest.mark.skipif(not SAMPLE_IFC.exists(), reason="sample.ifc not available")
+def test_export_without_geometry(cache, tmp_path):
+    """Test that a model without geometry raises and writes nothing."""
+    output_path = tmp_path / "sample.glb"
+
+    with pytest.raises(NoGeometryError):
+        GeometryEngine(cache_manager=cache).export(str(SAMPLE_IFC), str(output_path), GltfExportOptions())
+
+    assert not output_path.exists()
+
+
+@requires_duplex
+def test_exporter_engine_option(cache, tmp_path):
+    """Test that GltfExporter runs the in-process engine on the cached model."""
+    exporter = GltfExporter(ifcconvert_path="/nonexistent/IfcConvert", cache_manager=cache)
+    result = exporter.export(
+        ifc_file_path=str(DUPLEX_IFC),
+        output_path=str(tmp_path / "duplex.txt"),
+        options=GltfExportOptions(engine="ifcopenshell")
+    )
+
+    assert result.success is True
+    assert result.output_path == str(tmp_path / "duplex.glb")
+    assert result.file_size == (tmp_path / "duplex.glb").stat().st_size
+    assert result.statistics["elements"] > 0
+    assert cache.get_stats()["hits"] > 0
+
+
+def test_exporter_unknown_engine(tmp_path):
+    """Test that unknown engines are rejected."""
+    exporter = GltfExporter()
+
+    with pytest.raises(ValueError):
+        exporter.export(
+            ifc_file_path=str(SAMPLE_IFC),
+            output_path=str(tmp_path / "sample.glb"),
+            options=GltfExportOptions(engine="blender")
+        )
+
+
+@requires_duplex
+def test_export_timeout(cache, tmp_path):
+    """Test that the in-process engine stops after options.timeout_seconds."""
+    output_path = tmp_path / "duplex.glb"
+    exporter = GltfExporter(cache_manager=cache)
+
+    result = exporter.export(
+        ifc_file_path=str(DUPLEX_IFC),
+        output_path=str(output_path),
+        options=GltfExportOptions(engine="ifcopenshell", timeout_seconds=0)
+    )
+
+    assert result.success is False
+    assert result.timed_out is True
+    assert not output_path.exists()
+
+
+@requires_duplex
+def test_export_cancel(cache, tmp_path):
+    """Test that the in-process engine stops when the cancel event is set."""
+    output_path = tmp_path / "duplex.glb"
+    cancel = threading.Event()
+
+    with pytest.raises(ExportCancelledError):
+        GeometryEngine(cache_manager=cache).export(
+            str(DUPLEX_IFC), str(output_path), GltfExportOptions(),
+            # Cancel after the tenth element
+            progress=lambda written, percent: written >= 10 and cancel.set(),
+            cancel_event=cancel
+        )
+
+    assert not output_path.exists()
+
+
+@requires_duplex
+def test_export_instancing(default_export, cache, tmp_path):
+    """Test that repeated geometry is written once and placed by node matrices."""
+    default_stats, document, binary = default_export
+    output_path = tmp_path / "duplex_instanced.glb"
+
+    stats = GeometryEngine(cache_manager=cache).export(
+        str(DUPLEX_IFC), str(output_path), GltfExportOptions(instancing=True)
+    )
+    instanced_document, instanced_binary = read_glb(str(output_path))
+
+    # Same elements and triangles, fewer meshes and a smaller file
+    assert stats["elements"] == default_stats["elements"]
+    assert stats["triangles"] == default_stats["triangles"]
+    assert stats["instanced_elements"] > 0
+    assert stats["meshes"] == len(instanced_document["meshes"]) == stats["elements"] - stats["instanced_elements"]
+    assert len(instanced_binary) < len(binary)
+
+    meshes_used = [node["mesh"] for node in instanced_document["nodes"]]
+    assert len(set(meshes_used)) < len(meshes_used)
+
+    # Every element ends up where the world-coordinate export put it
+    expected = {node["name"]: world_positions(document, binary, node) for node in document["nodes"]}
+    for node in instanced_document["nodes"]:
+        assert np.allclose(world_positions(instanced_document, instanced_binary, node), expected[node["name"]],
+                           atol=1e-3)
+
+
+@requires_duplex
+def test_export_instancing_y_up_and_centered(cache, tmp_path):
+    """Test that centering and Y-up are applied through the node matrices."""
+    engine = GeometryEngine(cache_manager=cache)
+    options = GltfExportOptions(y_up=True, center_model=True)
+
+    engine.export(str(DUPLEX_IFC), str(tmp_path / "baked.glb"), options)
+    options.instancing = True
+    engine.export(str(DUPLEX_IFC), str(tmp_path / "instanced.glb"), options)
+
+    baked_document, baked_binary = read_glb(str(tmp_path / "baked.glb"))
+    instanced_document, instanced_binary = read_glb(str(tmp_path / "instanced.glb"))
+    for baked, instanced in zip(baked_document["nodes"][:20], instanced_document["nodes"][:20]):
+        assert baked["name"] == instanced["name"]
+        assert np.allclose(world_positions(instanced_document, instanced_binary, instanced),
+                           world_positions(baked_document, baked_binary, baked), atol=1e-3)
+
+
+def test_exporter_instancing_requires_ifcopenshell_engine(tmp_path):
+    """Test that IfcConvert exports reject the instancing option."""
+    with pytest.raises(ValueError):
+        GltfExporter().export(
+            ifc_file_path=str(SAMPLE_IFC),
+            output_path=str(tmp_path / "sample.glb"),
+            options=GltfExportOptions(instancing=True)
+        )
@@ -0,0 +1,155 @@
+"""
+Unit Tests for GLB Writer
+
+Tests the streaming glTF 2.0 writer and the GLB reader.
+"""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from ifc_intelligence.glb_writer import (
+    COMPONENT_UNSIGNED_INT,
+    COMPONENT_UNSIGNED_SHORT,
+    GlbWriter,
+    read_glb,
+)
+
+
+# One triangle (3 vertices, 3 indices: 6 bytes of uint16 -> padded to 8)
+TRIANGLE_POSITIONS = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 3.0]])
+TRIANGLE_NORMALS = np.array([[0.0, 0.0, 1.0]] * 3)
+TRIANGLE_INDICES = np.array([[0, 1, 2]])
+
+
+def test_write_glb(tmp_path):
+    """Test the GLB container layout and the written document."""
+    output_path = tmp_path / "model.glb"
+
+    with GlbWriter(str(output_path)) as writer:
+        material = writer.add_material("Concrete", (0.5, 0.5, 0.5))
+        mesh = writer.add_mesh("wall", TRIANGLE_POSITIONS, TRIANGLE_NORMALS, [(material, TRIANGLE_INDICES)])
+        writer.add_node("2O2Fr$t4X7Zf8NOew3FKau", mesh=mesh)
+
+    data = output_path.read_bytes()
+    magic, version, length = struct.unpack_from("<4sII", data)
+    assert magic == b"glTF"
+    assert version == 2
+    assert length == len(data)
+    assert len(data) % 4 == 0
+
+    document, binary = read_glb(str(output_path))
+    assert document["asset"]["version"] == "2.0"
+    assert document["scenes"][0]["nodes"] == [0]
+    assert document["nodes"][0] == {"name": "2O2Fr$t4X7Zf8NOew3FKau", "mesh": 0}
+    assert document["buffers"][0]["byteLength"] == len(binary)
+
+    # Every buffer view starts 4-byte aligned
+    for view in document["bufferViews"]:
+        assert view["byteOffset"] % 4 == 0
+
+    primitive = document["meshes"][0]["primitives"][0]
+    assert primitive["material"] == 0
+    assert set(primitive["attributes"]) == {"POSITION", "NORMAL"}
+
+    position_accessor = document["accessors"][primitive["attributes"]["POSITION"]]
+    assert position_accessor["count"] == 3
+    assert position_accessor["min"] == [0.0, 0.0, 0.0]
+    assert position_accessor["max"] == [1.0, 2.0, 3.0]
+
+    index_accessor = document["accessors"][primitive["indices"]]
+    assert index_accessor["componentType"] == COMPONENT_UNSIGNED_SHORT
+    view = document["bufferViews"][index_accessor["bufferView"]]
+    indices = np.frombuffer(binary, dtype=np.uint16, count=3, offset=view["byteOffset"])
+    assert indices.tolist() == [0, 1, 2]
+
+
+def test_write_gltf_with_sidecar_bin(tmp_path):
+    """Test JSON output with an external .bin buffer."""
+    output_path = tmp_path / "model.gltf"
+
+    with GlbWriter(str(output_path), format="gltf") as writer:
+        mesh = writer.add_mesh("wall", TRIANGLE_POSITIONS, None, [(None, TRIANGLE_INDICES)])
+        writer.add_node("wall", mesh=mesh)
+
+    document = json.loads(output_path.read_text())
+    bin_path = tmp_path / "model.bin"
+    assert document["buffers"][0]["uri"] == "model.bin"
+    assert document["buffers"][0]["byteLength"] == bin_path.stat().st_size
+    assert "material" not in document["meshes"][0]["primitives"][0]
+    assert "NORMAL" not in document["meshes"][0]["primitives"][0]["attributes"]
+
+
+def test_nodes_share_mesh(tmp_path):
+    """Test that several nodes can reference one mesh with their own matrix."""
+    output_path = tmp_path / "model.glb"
+    translated = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 5.0, 0.0, 0.0, 1.0]
+
+    with GlbWriter(str(output_path)) as writer:
+        mesh = writer.add_mesh("chair", TRIANGLE_POSITIONS, None, [(None, TRIANGLE_INDICES)])
+        writer.add_node("chair-1", mesh=mesh)
+        writer.add_node("chair-2", mesh=mesh, matrix=translated)
+
+    document, _ = read_glb(str(output_path))
+    assert len(document["meshes"]) == 1
+    assert [node["mesh"] for node in document["nodes"]] == [0, 0]
+    assert "matrix" not in document["nodes"][0]
+    assert document["nodes"][1]["matrix"] == translated
+
+
+def test_materials_deduplicated(tmp_path):
+    """Test that identical materials are written once."""
+    with GlbWriter(str(tmp_path / "model.glb")) as writer:
+        first = writer.add_material("Glass", (0.2, 0.4, 0.6), transparency=0.5)
+        second = writer.add_material("Glass", (0.2, 0.4, 0.6), transparency=0.5)
+        other = writer.add_material("Glass", (0.2, 0.4, 0.6))
+
+        assert first == second
+        assert other != first
+        assert writer.material_count == 2
+
+        glass = writer.document["materials"][first]
+        assert glass["alphaMode"] == "BLEND"
+        assert glass["pbrMetallicRoughness"]["baseColorFactor"] == [0.2, 0.4, 0.6, 0.5]
+
+
+def test_large_mesh_uses_uint32_indices(tmp_path):
+    """Test that meshes with more than 65535 vertices get 32-bit indices."""
+    output_path = tmp_path / "model.glb"
+    positions = np.zeros((70000, 3))
+
+    with GlbWriter(str(output_path)) as writer:
+        writer.add_mesh("big", positions, None, [(None, np.array([[0, 1, 69999]]))])
+
+    document, _ = read_glb(str(output_path))
+    assert document["accessors"][1]["componentType"] == COMPONENT_UNSIGNED_INT
+
+
+def test_abort_on_exception(tmp_path):
+    """Test that a failed export leaves no output file behind."""
+    output_path = tmp_path / "model.glb"
+
+    with pytest.raises(RuntimeError):
+        with GlbWriter(str(output_path)) as writer:
+            writer.add_mesh("wall", TRIANGLE_POSITIONS, None, [(None, TRIANGLE_INDICES)])
+            raise RuntimeError("tessellation failed")
+
+    assert not output_path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_format(tmp_path):
+    """Test that unknown output formats are rejected."""
+    with pytest.raises(ValueError):
+        GlbWriter(str(tmp_path / "model.obj"), format="obj")
+
+
+def test_read_glb_rejects_other_files(tmp_path):
+    """Test that read_glb() rejects files that are not GLB."""
+    path = tmp_path / "model.glb"
+    path.write_bytes(b"ISO-10303-21;\nHEADER;\n")
+
+    with pytest.raises(ValueError):
+        read_glb(str(path))
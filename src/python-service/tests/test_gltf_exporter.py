@@ -6,6 +6,9 @@
 
 import pytest
 import os
+import sys
+import time
+import threading
 from pathlib import Path
 from ifc_intelligence.gltf_exporter import GltfExporter, GltfExportOptions, GltfExportResult
 
@@ -18,6 +21,9 @@
 XEOKIT_IFC_DIR = Path(__file__).parent.parent.parent.parent / "xeokit-sdk" / "assets" / "models" / "ifc"
 DUPLEX_IFC = XEOKIT_IFC_DIR / "Duplex.ifc"
 
+# The fake IfcConvert is a script with a shebang line and uses resource
+requires_posix = pytest.mark.skipif(os.name != "posix", reason="requires a POSIX system")
+
 
 def test_exporter_initialization():
     """Test that GltfExporter can be instantiated."""
@@ -41,6 +47,11 @@ def test_export_options_defaults():
     assert options.center_model is False
     assert options.no_normals is False
     assert options.y_up is False
+    assert options.engine == "ifcconvert"
+    assert options.threads is None
+    assert options.timeout_seconds is None
+    assert options.memory_limit_mb is None
+    assert options.instancing is False
 
 
 @pytest.mark.skipif(not DUPLEX_IFC.exists(), reason="Duplex.ifc not available")
@@ -156,3 +167,142 @@ def test_export_ifc_without_geometry(tmp_path):
     # IfcConvert succeeds but doesn't create output file (no geometry)
     assert result.success is False
     assert result.error_message is not None
+
+
+FAKE_IFCCONVERT = """#!{python}
+import os, sys, time, resource
+
+mode = os.environ.get("FAKE_IFCCONVERT_MODE", "ok")
+print("Scanning file...")
+if mode == "limit":
+    print("RLIMIT_AS=%d" % resource.getrlimit(resource.RLIMIT_AS)[0])
+if mode == "fail":
+    sys.stderr.write("Failed to process file\\n")
+    sys.exit(1)
+for done in range(0, 51, 10):
+    sys.stdout.write("\\r[" + "#" * done + " " * (50 - done) + "]")
+    sys.stdout.flush()
+    if mode == "hang" and done == 10:
+        time.sleep(60)
+    time.sleep(0.01)
+print()
+with open(sys.argv[-1], "wb") as f:
+    f.write(b"glTF")
+"""
+
+
+@pytest.fixture
+def fake_ifcconvert(tmp_path):
+    """Executable that behaves like IfcConvert (mode from FAKE_IFCCONVERT_MODE)."""
+    script = tmp_path / "IfcConvert"
+    script.write_text(FAKE_IFCCONVERT.format(python=sys.executable))
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture
+def ifc_input(tmp_path):
+    """Input file for the fake IfcConvert (its content is never read)."""
+    path = tmp_path / "model.ifc"
+    path.write_text("ISO-10303-21;\n")
+    return str(path)
+
+
+def test_build_command_threads():
+    """Test that the thread count is always passed to IfcConvert."""
+    exporter = GltfExporter()
+
+    command = exporter._build_command("input.ifc", "output.glb", GltfExportOptions(threads=3))
+    assert command[command.index("--threads") + 1] == "3"
+
+    command = exporter._build_command("input.ifc", "output.glb", GltfExportOptions())
+    assert int(command[command.index("--threads") + 1]) >= 1
+
+
+@requires_posix
+def test_export_reports_ifcconvert_progress(fake_ifcconvert, ifc_input, tmp_path):
+    """Test that progress parsed from the IfcConvert progress bar is reported while it runs."""
+    exporter = GltfExporter(ifcconvert_path=fake_ifcconvert)
+    updates = []
+
+    result = exporter.export(
+        ifc_file_path=ifc_input,
+        output_path=str(tmp_path / "model.glb"),
+        progress=lambda elements_written, percent: updates.append((elements_written, percent))
+    )
+
+    assert result.success is True
+    assert result.file_size == 4
+    assert result.duration_ms is not None
+    assert [percent for _, percent in updates] == [20.0, 40.0, 60.0, 80.0, 100.0]
+    assert all(elements_written is None for elements_written, _ in updates)
+
+
+@requires_posix
+def test_export_timeout(fake_ifcconvert, ifc_input, tmp_path, monkeypatch):
+    """Test that a hanging IfcConvert is killed after the timeout."""
+    monkeypatch.setenv("FAKE_IFCCONVERT_MODE", "hang")
+    exporter = GltfExporter(ifcconvert_path=fake_ifcconvert)
+
+    start = time.monotonic()
+    result = exporter.export(
+        ifc_file_path=ifc_input,
+        output_path=str(tmp_path / "model.glb"),
+        options=GltfExportOptions(timeout_seconds=0.5)
+    )
+
+    assert time.monotonic() - start < 10
+    assert result.success is False
+    assert result.timed_out is True
+    assert "timed out" in result.error_message
+    assert not (tmp_path / "model.glb").exists()
+
+
+@requires_posix
+def test_export_cancel(fake_ifcconvert, ifc_input, tmp_path, monkeypatch):
+    """Test that setting the cancel event stops a running export."""
+    monkeypatch.setenv("FAKE_IFCCONVERT_MODE", "hang")
+    exporter = GltfExporter(ifcconvert_path=fake_ifcconvert)
+    cancel = threading.Event()
+
+    result = exporter.export(
+        ifc_file_path=ifc_input,
+        output_path=str(tmp_path / "model.glb"),
+        # Cancel as soon as IfcConvert reports progress
+        progress=lambda elements_written, percent: cancel.set(),
+        cancel_event=cancel
+    )
+
+    assert result.success is False
+    assert result.cancelled is True
+    assert result.timed_out is False
+    assert result.error_message == "Export cancelled"
+
+
+@requires_posix
+def test_export_memory_limit(fake_ifcconvert, ifc_input, tmp_path, monkeypatch):
+    """Test that the memory limit is applied to the IfcConvert process."""
+    monkeypatch.setenv("FAKE_IFCCONVERT_MODE", "limit")
+    exporter = GltfExporter(ifcconvert_path=fake_ifcconvert)
+
+    result = exporter.export(
+        ifc_file_path=ifc_input,
+        output_path=str(tmp_path / "model.glb"),
+        options=GltfExportOptions(memory_limit_mb=2048)
+    )
+
+    assert result.success is True
+    assert f"RLIMIT_AS={2048 * 1024 * 1024}" in result.stdout
+
+
+@requires_posix
+def test_export_ifcconvert_failure(fake_ifcconvert, ifc_input, tmp_path, monkeypatch):
+    """Test that IfcConvert errors are returned as error message."""
+    monkeypatch.setenv("FAKE_IFCCONVERT_MODE", "fail")
+    exporter = GltfExporter(ifcconvert_path=fake_ifcconvert)
+
+    result = exporter.export(ifc_file_path=ifc_input, output_path=str(tmp_path / "model.glb"))
+
+    assert result.success is False
+    assert result.timed_out is False
+    assert "Failed to process file" in result.error_message
@@ -0,0 +1,104 @@
+"""
+Unit Tests for Parallel Bulk Element Extractor
+
+Tests that ParallelBulkElementExtractor produces the same result as the serial extractor,
+and the pre-scan based extraction plan.
+"""
+
+import pytest
+from pathlib import Path
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.bulk_element_extractor import BulkElementExtractor
+from ifc_intelligence.parallel_extractor import (
+    ELEMENTS_PER_WORKER,
+    PARALLEL_MIN_ELEMENTS,
+    ParallelBulkElementExtractor,
+    plan_extraction,
+    recommend_workers,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+requires_fork = pytest.mark.skipif(
+    not ParallelBulkElementExtractor.fork_available(),
+    reason="fork start method not available"
+)
+
+
+@pytest.fixture
+def serial_elements():
+    """Elements of Duplex.ifc extracted by the serial extractor."""
+    extractor = BulkElementExtractor(cache_manager=IfcCacheManager())
+    return extractor.extract_all_elements(str(DUPLEX_IFC))
+
+
+@requires_fork
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_matches_serial(serial_elements, workers):
+    """Test that parallel extraction returns the serial result in the same order."""
+    extractor = ParallelBulkElementExtractor(workers=workers, cache_manager=IfcCacheManager())
+
+    elements = extractor.extract_all_elements(str(DUPLEX_IFC))
+
+    assert elements == serial_elements
+
+
+@requires_fork
+def test_parallel_type_pset_cache_stats(serial_elements):
+    """Test that worker cache hits and misses are merged into the stats."""
+    extractor = ParallelBulkElementExtractor(workers=2, cache_manager=IfcCacheManager())
+
+    extractor.extract_all_elements(str(DUPLEX_IFC))
+    stats = extractor.get_type_pset_cache_stats()
+
+    assert stats["hits"] + stats["misses"] > 0
+
+
+def test_single_worker_runs_serially(serial_elements):
+    """Test that one worker falls back to the serial extractor."""
+    extractor = ParallelBulkElementExtractor(workers=1, cache_manager=IfcCacheManager())
+
+    assert extractor.extract_all_elements(str(DUPLEX_IFC)) == serial_elements
+
+
+def test_make_shards_preserves_order():
+    """Test that shards are contiguous, balanced and cover all ids."""
+    extractor = ParallelBulkElementExtractor(workers=2, shards_per_worker=2, cache_manager=IfcCacheManager())
+
+    shards = extractor._make_shards(list(range(10)))
+
+    assert shards == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+    assert extractor._make_shards([1]) == [[1]]
+    assert extractor._make_shards([]) == []
+
+
+def test_iter_elements_without_file():
+    """Test error when extracting without loading a file."""
+    extractor = ParallelBulkElementExtractor(workers=2, cache_manager=IfcCacheManager())
+
+    with pytest.raises(RuntimeError, match="No IFC file loaded"):
+        list(extractor.iter_elements())
+
+
+@requires_fork
+def test_recommend_workers():
+    """Test that small models run serially and large ones are capped by max_workers."""
+    assert recommend_workers(0) == 1
+    assert recommend_workers(PARALLEL_MIN_ELEMENTS - 1, max_workers=8) == 1
+    assert recommend_workers(PARALLEL_MIN_ELEMENTS, max_workers=8) == 2
+    assert recommend_workers(ELEMENTS_PER_WORKER * 5, max_workers=8) == 5
+    assert recommend_workers(ELEMENTS_PER_WORKER * 100, max_workers=8) == 8
+
+
+def test_plan_extraction_duplex(serial_elements):
+    """Test that the plan counts exactly the elements bulk extraction returns."""
+    plan = plan_extraction(str(DUPLEX_IFC), max_workers=4)
+
+    assert plan["schema"] == "IFC2X3"
+    assert plan["element_count"] == len(serial_elements)
+    assert plan["recommended_workers"] == 1
+    assert plan["estimated_memory_bytes"] > plan["file_size"]
@@ -66,3 +66,18 @@ def test_entity_counts_only_includes_present_types():
     # Should NOT have types that don't exist in sample.ifc
     assert "IfcBeam" not in metadata.entity_counts
     assert "IfcColumn" not in metadata.entity_counts
+
+
+def test_entity_histogram_and_rollups():
+    """Test the full class histogram and subtype roll-ups in the metadata."""
+    parser = IfcParser()
+    metadata = parser.parse_file(str(SAMPLE_IFC))
+
+    # Every class of the file is counted, not only the common types
+    assert metadata.entity_histogram["IfcProject"] == 1
+    assert "IfcOwnerHistory" in metadata.entity_histogram
+
+    # Roll-ups include abstract supertypes and agree with entity_counts
+    assert metadata.entity_rollups["IfcBuildingElement"] == 4
+    for entity_type, count in metadata.entity_counts.items():
+        assert metadata.entity_rollups[entity_type] == count
@@ -0,0 +1,165 @@
+"""
+Unit Tests for Revision Pipeline
+
+Tests that RevisionPipeline runs all stages with a single IFC parse.
+"""
+
+import shutil
+import pytest
+from pathlib import Path
+from ifc_intelligence import cache_manager as cache_module
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.gltf_exporter import GltfExportOptions, GltfExportResult
+from ifc_intelligence.pipeline import RevisionPipeline, PIPELINE_STAGES
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+
+def test_pipeline_parses_file_once():
+    """Test that all in-process stages share a single parse."""
+    cache = IfcCacheManager(max_size=5)
+    pipeline = RevisionPipeline(cache_manager=cache)
+
+    result = pipeline.process(str(DUPLEX_IFC))
+
+    assert result["metadata"]["schema"] == "IFC2X3"
+    assert result["spatial_tree"]["ifc_type"] == "IfcProject"
+    assert len(result["elements"]) > 0
+
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+
+def test_pipeline_parses_once_when_cache_rejects_file(monkeypatch, tmp_path):
+    """Test that a file the LFU policy does not admit is still parsed only once per run."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"duplex_{i}.ifc"
+        shutil.copy(DUPLEX_IFC, path)
+        paths.append(str(path))
+
+    cache = IfcCacheManager(max_size=2, policy="lfu")
+    for _ in range(2):
+        cache.get_or_load(paths[0])
+        cache.get_or_load(paths[1])
+
+    opened = []
+    real_open = cache_module.ifcopenshell.open
+    monkeypatch.setattr(cache_module.ifcopenshell, "open", lambda path: opened.append(path) or real_open(path))
+
+    result = RevisionPipeline(cache_manager=cache).process(paths[2])
+
+    assert len(result["elements"]) > 0
+    assert opened == [paths[2]]
+    stats = cache.get_stats()
+    assert stats["rejected_admissions"] == 1
+    assert stats["pinned_hits"] == 3
+    assert stats["cached_files"] == paths[:2]
+
+
+def test_pipeline_metrics_shape():
+    """Test that the combined metrics have per-stage timings and statistics."""
+    pipeline = RevisionPipeline(cache_manager=IfcCacheManager())
+
+    result = pipeline.process(str(DUPLEX_IFC))
+    metrics = result["metrics"]
+
+    for key in ["parse_ms", "metadata_ms", "spatial_tree_ms", "element_extraction_ms", "total_ms"]:
+        assert key in metrics["timings"]
+
+    assert "start_time" in metrics
+    assert "end_time" in metrics
+    assert metrics["statistics"]["total_elements"] == len(result["elements"])
+    assert metrics["statistics"]["node_count"] > 1
+
+    # No output path given, so glTF is skipped
+    assert result["gltf"] is None
+    assert "gltf_export_ms" not in metrics["timings"]
+
+
+def test_pipeline_selected_stages():
+    """Test running only a subset of stages."""
+    pipeline = RevisionPipeline(cache_manager=IfcCacheManager())
+
+    result = pipeline.process(str(DUPLEX_IFC), stages=["metadata"])
+
+    assert result["metadata"] is not None
+    assert result["spatial_tree"] is None
+    assert result["elements"] is None
+
+
+def test_pipeline_gltf_failure_is_reported(tmp_path):
+    """Test that a failing glTF stage does not abort the other stages."""
+    pipeline = RevisionPipeline(
+        cache_manager=IfcCacheManager(),
+        ifcconvert_path="/nonexistent/IfcConvert"
+    )
+
+    result = pipeline.process(
+        str(DUPLEX_IFC),
+        gltf_output_path=str(tmp_path / "out.glb"),
+        stages=["metadata", "gltf"]
+    )
+
+    assert result["metadata"] is not None
+    assert result["gltf"]["success"] is False
+    assert result["gltf"]["timed_out"] is False
+    assert result["gltf"]["cancelled"] is False
+    assert "gltf_export_ms" in result["metrics"]["timings"]
+    assert any("gltf" in warning for warning in result["metrics"]["warnings"])
+
+
+def test_pipeline_in_process_gltf_runs_after_other_stages(monkeypatch, tmp_path):
+    """Test that the in-process glTF engine doesn't overlap the stages walking the same model."""
+    pipeline = RevisionPipeline(cache_manager=IfcCacheManager())
+    events = []
+
+    extract_all_elements = pipeline.bulk_extractor.extract_all_elements
+
+    def elements(file_path):
+        events.append("elements_started")
+        result = extract_all_elements(file_path)
+        events.append("elements_finished")
+        return result
+
+    def export(**kwargs):
+        events.append("gltf_started")
+        return GltfExportResult(success=True, output_path=kwargs["output_path"], file_size=0)
+
+    monkeypatch.setattr(pipeline.bulk_extractor, "extract_all_elements", elements)
+    monkeypatch.setattr(pipeline.gltf_exporter, "export", export)
+
+    result = pipeline.process(
+        str(DUPLEX_IFC),
+        gltf_output_path=str(tmp_path / "out.glb"),
+        gltf_options=GltfExportOptions(engine="ifcopenshell"),
+        stages=["elements", "gltf"]
+    )
+
+    assert result["gltf"]["success"] is True
+    assert events == ["elements_started", "elements_finished", "gltf_started"]
+
+
+def test_pipeline_unknown_stage():
+    """Test that unknown stages are rejected."""
+    pipeline = RevisionPipeline(cache_manager=IfcCacheManager())
+
+    with pytest.raises(ValueError, match="Unknown pipeline stage"):
+        pipeline.process(str(DUPLEX_IFC), stages=["metadata", "bogus"])
+
+
+def test_pipeline_nonexistent_file():
+    """Test error handling for non-existent file."""
+    pipeline = RevisionPipeline(cache_manager=IfcCacheManager())
+
+    with pytest.raises(FileNotFoundError):
+        pipeline.process("/nonexistent/file.ifc")
+
+
+def test_pipeline_stages_constant():
+    """Test the stage order."""
+    assert PIPELINE_STAGES == ("metadata", "spatial_tree", "elements", "gltf")
@@ -0,0 +1,95 @@
+"""
+Unit Tests for Process Runner
+
+Tests progress parsing, timeout and cancellation of external commands.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from ifc_intelligence.process_runner import ProcessRunner, parse_progress
+
+
+def python_command(code: str) -> list:
+    """Command that runs a Python snippet in a fresh interpreter."""
+    return [sys.executable, "-c", code]
+
+
+def test_parse_progress():
+    """Test progress extraction from IfcConvert output lines."""
+    assert parse_progress("[" + "#" * 25 + " " * 25 + "]") == 50.0
+    assert parse_progress("[" + " " * 50 + "]") == 0.0
+    assert parse_progress("[" + "#" * 50 + "]") == 100.0
+    assert parse_progress("Creating geometry... 42%") == 42.0
+    assert parse_progress("Done creating geometry (215 objects)") is None
+    assert parse_progress("Scanning file...") is None
+
+
+def test_run_captures_output():
+    """Test exit code and captured output of a normal run."""
+    result = ProcessRunner(python_command(
+        "import sys; print('out'); sys.stderr.write('err'); sys.exit(3)"
+    )).run()
+
+    assert result.returncode == 3
+    assert result.stdout.strip() == "out"
+    assert result.stderr == "err"
+    assert result.timed_out is False
+    assert result.cancelled is False
+
+
+def test_progress_from_carriage_return_updates():
+    """Test that progress redrawn with carriage returns is reported once per increase."""
+    updates = []
+    runner = ProcessRunner(python_command(
+        "import sys\n"
+        "for p in (10, 10, 30, 20, 90):\n"
+        "    sys.stdout.write('\\rConverting %d%%' % p); sys.stdout.flush()\n"
+    ), progress=updates.append)
+
+    result = runner.run()
+
+    assert result.returncode == 0
+    assert updates == [10.0, 30.0, 90.0]
+    assert runner.percent == 90.0
+
+
+def test_timeout_terminates_process():
+    """Test that the command is terminated when the timeout expires."""
+    start = time.monotonic()
+    result = ProcessRunner(python_command("import time; time.sleep(60)"), timeout=0.3).run()
+
+    assert time.monotonic() - start < 10
+    assert result.timed_out is True
+    assert result.returncode != 0
+
+
+def test_cancel_from_other_thread():
+    """Test that cancel() stops a running command."""
+    runner = ProcessRunner(python_command("import time; time.sleep(60)"))
+    threading.Timer(0.3, runner.cancel).start()
+
+    result = runner.run()
+
+    assert result.cancelled is True
+    assert result.timed_out is False
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires POSIX resource limits")
+def test_memory_limit_set_before_exec():
+    """Test that the command starts with the address-space limit already in place."""
+    result = ProcessRunner(python_command(
+        "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"
+    ), memory_limit_mb=1024).run()
+
+    assert result.returncode == 0
+    assert int(result.stdout) == 1024 * 1024 * 1024
+
+
+def test_missing_executable():
+    """Test that a missing executable raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        ProcessRunner(["/nonexistent/IfcConvert"]).run()
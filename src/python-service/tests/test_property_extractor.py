@@ -4,8 +4,12 @@
 Tests the PropertyExtractor class with real IFC files.
 """
 
+import json
 import pytest
 from pathlib import Path
+
+import ifcopenshell
+import ifcopenshell.util.element
 from ifc_intelligence.property_extractor import PropertyExtractor, IfcElementProperties
 
 
@@ -198,3 +202,32 @@ def test_clean_property_dict():
     assert cleaned["bool_prop"] is True
     assert cleaned["none_prop"] is None
     assert cleaned["list_prop"] == [1, 2, 3]
+
+
+def test_clean_entity_valued_predefined_pset():
+    """Test that an entity attribute of a predefined pset becomes a small reference, not its subgraph."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    door = ifc_file.createIfcDoor(ifcopenshell.guid.new(), None, "Door")
+    origin = ifc_file.createIfcAxis2Placement3D(ifc_file.createIfcCartesianPoint((0.0, 0.0, 0.0)))
+    context = ifc_file.createIfcGeometricRepresentationContext(None, "Model", 3, 1e-5, origin, None)
+    polyline = ifc_file.createIfcPolyline([ifc_file.createIfcCartesianPoint((float(i), 0.0)) for i in range(50)])
+    body = ifc_file.createIfcShapeRepresentation(context, "Body", "Curve2D", [polyline])
+    door.Representation = ifc_file.createIfcProductDefinitionShape(None, None, [body])
+    aspect = ifc_file.createIfcShapeAspect([body], "Lining aspect", None, True, door.Representation)
+    lining = ifc_file.create_entity(
+        "IfcDoorLiningProperties", GlobalId=ifcopenshell.guid.new(), Name="Lining",
+        LiningDepth=0.1, LiningThickness=0.05, ShapeAspectStyle=aspect
+    )
+    ifc_file.createIfcRelDefinesByProperties(ifcopenshell.guid.new(), None, None, None, [door], lining)
+
+    psets = ifcopenshell.util.element.get_psets(door)
+    cleaned = PropertyExtractor()._clean_property_dict(psets["Lining"])
+
+    assert cleaned["LiningDepth"] == 0.1
+    assert cleaned["ShapeAspectStyle"] == {
+        "ifc_type": "IfcShapeAspect",
+        "Name": "Lining aspect",
+        "Description": None,
+        "ProductDefinitional": True,
+    }
+    assert len(json.dumps(cleaned)) < 300
@@ -0,0 +1,208 @@
+"""
+Unit Tests for Property Set Index
+
+Tests that PropertySetIndex and the type-object pset cache produce the
+same result as ifcopenshell.util.element.get_psets().
+"""
+
+import copy
+import json
+import pickle
+import pytest
+from pathlib import Path
+from dataclasses import asdict
+import ifcopenshell
+import ifcopenshell.guid
+import ifcopenshell.util.element
+
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.property_extractor import PropertyExtractor, FrozenPropertyDict
+from ifc_intelligence.property_index import PropertySetIndex
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+
+@pytest.fixture(scope="module")
+def duplex():
+    return ifcopenshell.open(str(DUPLEX_IFC))
+
+
+@pytest.fixture
+def typed_ifc4():
+    """IFC4 model with a typed door, type psets and an overriding occurrence pset."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    new = ifcopenshell.guid.new
+    ifc_file.create_entity("IfcProject", GlobalId=new(), Name="Typed")
+
+    def pset(name, **values):
+        props = [
+            ifc_file.create_entity("IfcPropertySingleValue", Name=key, NominalValue=value)
+            for key, value in values.items()
+        ]
+        return ifc_file.create_entity("IfcPropertySet", GlobalId=new(), Name=name, HasProperties=props)
+
+    type_pset = pset("Pset_DoorCommon",
+                     FireRating=ifc_file.create_entity("IfcLabel", "EI30"),
+                     IsExternal=ifc_file.create_entity("IfcBoolean", False))
+    door_type = ifc_file.create_entity("IfcDoorType", GlobalId=new(), Name="D1",
+                                       HasPropertySets=[type_pset], PredefinedType="DOOR",
+                                       OperationType="SINGLE_SWING_LEFT")
+
+    doors = [ifc_file.create_entity("IfcDoor", GlobalId=new(), Name=f"Door {i}") for i in range(3)]
+    ifc_file.create_entity("IfcRelDefinesByType", GlobalId=new(), RelatedObjects=doors, RelatingType=door_type)
+
+    override = pset("Pset_DoorCommon", IsExternal=ifc_file.create_entity("IfcBoolean", True))
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=[doors[0]], RelatingPropertyDefinition=override)
+
+    width = ifc_file.create_entity("IfcQuantityLength", Name="Width", LengthValue=0.9)
+    qto = ifc_file.create_entity("IfcElementQuantity", GlobalId=new(), Name="Qto_DoorBaseQuantities",
+                                 Quantities=[width])
+    shared = pset("Pset_Shared", Mark=ifc_file.create_entity("IfcLabel", "M1"))
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=[doors[1]], RelatingPropertyDefinition=qto)
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=doors, RelatingPropertyDefinition=shared)
+
+    return ifc_file
+
+
+def _assert_same_psets(ifc_file, index):
+    for element in ifc_file.by_type("IfcObjectDefinition"):
+        expected = ifcopenshell.util.element.get_psets(element)
+        actual = index.get_psets(element)
+        # Compare serialized form to include key order
+        assert json.dumps(actual, default=str) == json.dumps(expected, default=str), element
+
+
+def test_index_matches_get_psets_ifc2x3(duplex):
+    """Test identical output on a real IFC2X3 model."""
+    index = PropertySetIndex(duplex)
+
+    _assert_same_psets(duplex, index)
+    assert index.get_stats()["relationships"] > 0
+
+
+def test_index_matches_get_psets_ifc4(typed_ifc4):
+    """Test identical output with type inheritance and overrides in IFC4."""
+    index = PropertySetIndex(typed_ifc4)
+
+    _assert_same_psets(typed_ifc4, index)
+
+    door = typed_ifc4.by_type("IfcDoor")[0]
+    assert index.get_psets(door)["Pset_DoorCommon"]["IsExternal"] is True
+    assert index.get_psets(door)["Pset_DoorCommon"]["FireRating"] == "EI30"
+
+
+def test_index_get_type(typed_ifc4):
+    """Test type lookup from the index."""
+    index = PropertySetIndex(typed_ifc4)
+    door_type = typed_ifc4.by_type("IfcDoorType")[0]
+
+    for door in typed_ifc4.by_type("IfcDoor"):
+        assert index.get_type(door) == door_type
+    assert index.get_type(door_type) == door_type
+
+
+def test_index_results_are_independent(typed_ifc4):
+    """Test that mutating one result does not affect later results."""
+    index = PropertySetIndex(typed_ifc4)
+    door = typed_ifc4.by_type("IfcDoor")[2]
+
+    index.get_psets(door)["Pset_DoorCommon"]["FireRating"] = "changed"
+
+    assert index.get_psets(door)["Pset_DoorCommon"]["FireRating"] == "EI30"
+
+
+def test_extractor_output_identical_with_index():
+    """Test that PropertyExtractor output does not change when the index is used."""
+    extractor = PropertyExtractor(str(DUPLEX_IFC), cache_manager=IfcCacheManager())
+    products = extractor.ifc_file.by_type("IfcProduct")
+
+    without_index = [asdict(extractor.extract_element_properties(p)) for p in products]
+    extractor.build_property_index()
+    with_index = [asdict(extractor.extract_element_properties(p)) for p in products]
+
+    assert json.dumps(with_index, default=str) == json.dumps(without_index, default=str)
+
+
+def test_build_property_index_without_file():
+    """Test error when building the index without loading a file."""
+    extractor = PropertyExtractor(cache_manager=IfcCacheManager())
+
+    with pytest.raises(RuntimeError, match="No IFC file loaded"):
+        extractor.build_property_index()
+
+
+def _baseline_properties(extractor, element):
+    """Cleaned get_psets() result, as computed before the type pset cache existed."""
+    psets = ifcopenshell.util.element.get_psets(element)
+    return {name: extractor._clean_property_dict(data) for name, data in psets.items()}
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_type_pset_cache_output_identical(typed_ifc4, use_index):
+    """Test that memoized type psets give the same cleaned result as get_psets()."""
+    extractor = PropertyExtractor(cache_manager=IfcCacheManager())
+    extractor.ifc_file = typed_ifc4
+    if use_index:
+        extractor.build_property_index()
+
+    for element in typed_ifc4.by_type("IfcObjectDefinition"):
+        expected = _baseline_properties(extractor, element)
+        actual = extractor._get_cleaned_psets(element)
+        assert json.dumps(actual) == json.dumps(expected), element
+
+
+def test_type_pset_cache_output_identical_duplex():
+    """Test identical extraction results on a real model."""
+    extractor = PropertyExtractor(str(DUPLEX_IFC), cache_manager=IfcCacheManager())
+    extractor.build_property_index()
+
+    for element in extractor.ifc_file.by_type("IfcProduct"):
+        expected = _baseline_properties(extractor, element)
+        actual = extractor._get_cleaned_psets(element)
+        assert json.dumps(actual, default=str) == json.dumps(expected, default=str), element
+
+    assert extractor.get_type_pset_cache_stats()["hits"] > 0
+
+
+def test_type_pset_cache_hits(typed_ifc4):
+    """Test that a type shared by three doors is cleaned once."""
+    extractor = PropertyExtractor(cache_manager=IfcCacheManager())
+    extractor.ifc_file = typed_ifc4
+
+    for door in typed_ifc4.by_type("IfcDoor"):
+        extractor.extract_element_properties(door)
+
+    assert extractor.get_type_pset_cache_stats() == {"hits": 2, "misses": 1, "cached_types": 1}
+
+
+def test_shared_type_psets_are_read_only(typed_ifc4):
+    """Test that shared type psets cannot be mutated by accident."""
+    extractor = PropertyExtractor(cache_manager=IfcCacheManager())
+    extractor.ifc_file = typed_ifc4
+
+    door = typed_ifc4.by_type("IfcDoor")[2]
+    shared = extractor.extract_element_properties(door).property_sets["Pset_DoorCommon"]
+
+    assert isinstance(shared, FrozenPropertyDict)
+    with pytest.raises(TypeError):
+        shared["FireRating"] = "changed"
+    with pytest.raises(TypeError):
+        shared.update({"FireRating": "changed"})
+
+    again = extractor.extract_element_properties(door).property_sets["Pset_DoorCommon"]
+    assert again["FireRating"] == "EI30"
+
+
+def test_frozen_property_dict_serialization():
+    """Test that frozen dicts survive asdict/deepcopy/pickle/json."""
+    frozen = FrozenPropertyDict({"a": 1, "b": [1, 2]})
+
+    assert copy.deepcopy(frozen) == frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert json.loads(json.dumps(frozen)) == {"a": 1, "b": [1, 2]}
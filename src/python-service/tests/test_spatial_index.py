@@ -0,0 +1,120 @@
+"""
+Unit Tests for Spatial Containment Index
+
+Tests that SpatialIndex maps aggregation and containment relationships the
+same way as the inverse attributes of the IFC file.
+"""
+
+import pytest
+from pathlib import Path
+import ifcopenshell
+import ifcopenshell.guid
+
+from ifc_intelligence.spatial_index import SpatialIndex
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+
+@pytest.fixture(scope="module")
+def duplex():
+    return ifcopenshell.open(str(DUPLEX_IFC))
+
+
+@pytest.fixture
+def small_model():
+    """IFC4 model: Project → Site → Building → two storeys with walls, one nested space."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    new = ifcopenshell.guid.new
+    project = ifc_file.create_entity("IfcProject", GlobalId=new(), Name="Project")
+    site = ifc_file.create_entity("IfcSite", GlobalId=new(), Name="Site")
+    building = ifc_file.create_entity("IfcBuilding", GlobalId=new(), Name="Building")
+    storeys = [ifc_file.create_entity("IfcBuildingStorey", GlobalId=new(), Name=f"Storey {i}") for i in range(2)]
+    space = ifc_file.create_entity("IfcSpace", GlobalId=new(), Name="Room")
+    walls = [ifc_file.create_entity("IfcWall", GlobalId=new(), Name=f"Wall {i}") for i in range(3)]
+
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=project, RelatedObjects=[site])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=site, RelatedObjects=[building])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=building, RelatedObjects=storeys)
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=storeys[0], RelatedObjects=[space])
+    ifc_file.create_entity(
+        "IfcRelContainedInSpatialStructure", GlobalId=new(), RelatingStructure=storeys[0], RelatedElements=walls[:2]
+    )
+    ifc_file.create_entity(
+        "IfcRelContainedInSpatialStructure", GlobalId=new(), RelatingStructure=storeys[1], RelatedElements=walls[2:]
+    )
+    return ifc_file
+
+
+def test_aggregated_and_contained(small_model):
+    """Test the parent → children maps in relationship order."""
+    index = SpatialIndex(small_model)
+    building = small_model.by_type("IfcBuilding")[0]
+    storey = small_model.by_type("IfcBuildingStorey")[0]
+
+    assert [s.Name for s in index.get_aggregated(building)] == ["Storey 0", "Storey 1"]
+    assert [w.Name for w in index.get_contained(storey)] == ["Wall 0", "Wall 1"]
+    assert [c.Name for c in index.get_children(storey)] == ["Room", "Wall 0", "Wall 1"]
+    assert index.get_contained(building) == []
+
+
+def test_container_and_parent(small_model):
+    """Test the element → container and child → aggregate maps."""
+    index = SpatialIndex(small_model)
+    wall = [w for w in small_model.by_type("IfcWall") if w.Name == "Wall 2"][0]
+    space = small_model.by_type("IfcSpace")[0]
+
+    assert index.get_container(wall).Name == "Storey 1"
+    assert index.get_aggregate_parent(space).Name == "Storey 0"
+    assert index.get_container(space) is None
+    assert index.get_aggregate_parent(small_model.by_type("IfcProject")[0]) is None
+    assert index.get_stats()["relationships"] == 6
+
+
+def test_matches_inverse_attributes(duplex):
+    """Test that the index agrees with IsDecomposedBy / ContainsElements on a real model."""
+    index = SpatialIndex(duplex)
+
+    for element in duplex.by_type("IfcSpatialStructureElement"):
+        aggregated = [child for rel in element.IsDecomposedBy for child in rel.RelatedObjects]
+        contained = [child for rel in element.ContainsElements for child in rel.RelatedElements]
+        assert index.get_aggregated(element) == aggregated
+        assert index.get_contained(element) == contained
+
+    for element in duplex.by_type("IfcProduct"):
+        containment = element.ContainedInStructure if hasattr(element, "ContainedInStructure") else ()
+        expected = containment[0].RelatingStructure if containment else None
+        assert index.get_container(element) == expected
+
+
+def test_spatial_location(small_model):
+    """Test building/storey/space resolution, including nested spaces and hosted openings."""
+    new = ifcopenshell.guid.new
+    storey = [s for s in small_model.by_type("IfcBuildingStorey") if s.Name == "Storey 0"][0]
+    room = small_model.by_type("IfcSpace")[0]
+    alcove = small_model.create_entity("IfcSpace", GlobalId=new(), Name="Alcove")
+    small_model.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=room, RelatedObjects=[alcove])
+    lamp = small_model.create_entity("IfcFurniture", GlobalId=new(), Name="Lamp")
+    small_model.create_entity(
+        "IfcRelContainedInSpatialStructure", GlobalId=new(), RelatingStructure=alcove, RelatedElements=[lamp]
+    )
+    wall = [w for w in small_model.by_type("IfcWall") if w.Name == "Wall 0"][0]
+    opening = small_model.create_entity("IfcOpeningElement", GlobalId=new())
+    door = small_model.create_entity("IfcDoor", GlobalId=new(), Name="Door")
+    small_model.create_entity("IfcRelVoidsElement", GlobalId=new(), RelatingBuildingElement=wall, RelatedOpeningElement=opening)
+    small_model.create_entity("IfcRelFillsElement", GlobalId=new(), RelatingOpeningElement=opening, RelatedBuildingElement=door)
+
+    index = SpatialIndex(small_model)
+    building_guid = small_model.by_type("IfcBuilding")[0].GlobalId
+
+    assert index.get_spatial_location(lamp) == {
+        "building": building_guid, "storey": storey.GlobalId, "space": alcove.GlobalId
+    }
+    assert index.get_spatial_location(door) == {"building": building_guid, "storey": storey.GlobalId, "space": None}
+    assert index.get_spatial_location(alcove)["space"] == room.GlobalId
+    assert index.get_spatial_location(storey) == {"building": building_guid, "storey": None, "space": None}
+    assert index.get_spatial_location(small_model.by_type("IfcProject")[0]) == {
+        "building": None, "storey": None, "space": None
+    }
@@ -7,6 +7,7 @@
 import pytest
 from pathlib import Path
 import ifcopenshell
+import ifcopenshell.guid
 
 from ifc_intelligence.spatial_tree_extractor import (
     SpatialTreeExtractor,
@@ -236,3 +237,253 @@ def test_spatial_element_types_constant():
     # Non-spatial types should NOT be included
     assert "IfcWall" not in SPATIAL_ELEMENT_TYPES
     assert "IfcDoor" not in SPATIAL_ELEMENT_TYPES
+
+
+def test_tree_from_index_nested_and_contained_spaces(tmp_path):
+    """Test children order, spaces nested in spaces and spaces contained in a storey."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    new = ifcopenshell.guid.new
+    project = ifc_file.create_entity("IfcProject", GlobalId=new(), Name="Project")
+    site = ifc_file.create_entity("IfcSite", GlobalId=new(), Name="Site")
+    building = ifc_file.create_entity("IfcBuilding", GlobalId=new(), Name="Building")
+    storeys = [ifc_file.create_entity("IfcBuildingStorey", GlobalId=new(), Name=f"Storey {i}") for i in range(3)]
+    room = ifc_file.create_entity("IfcSpace", GlobalId=new(), Name="Room")
+    alcove = ifc_file.create_entity("IfcSpace", GlobalId=new(), Name="Alcove")
+    hall = ifc_file.create_entity("IfcSpace", GlobalId=new(), Name="Hall")
+    wall = ifc_file.create_entity("IfcWall", GlobalId=new(), Name="Wall")
+    door = ifc_file.create_entity("IfcDoor", GlobalId=new(), Name="Door")
+
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=project, RelatedObjects=[site])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=site, RelatedObjects=[building])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=building, RelatedObjects=storeys)
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=storeys[0], RelatedObjects=[room])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=room, RelatedObjects=[alcove])
+    ifc_file.create_entity(
+        "IfcRelContainedInSpatialStructure", GlobalId=new(), RelatingStructure=storeys[0], RelatedElements=[wall, hall]
+    )
+    ifc_file.create_entity(
+        "IfcRelContainedInSpatialStructure", GlobalId=new(), RelatingStructure=room, RelatedElements=[door]
+    )
+    path = tmp_path / "nested.ifc"
+    ifc_file.write(str(path))
+
+    tree = SpatialTreeExtractor(artifact_cache=None).extract_tree(str(path))
+
+    building_node = tree.children[0].children[0]
+    assert [storey.name for storey in building_node.children] == ["Storey 0", "Storey 1", "Storey 2"]
+    storey_node = building_node.children[0]
+    assert [(child.name, child.ifc_type) for child in storey_node.children] == [
+        ("Room", "IfcSpace"), ("Alcove", "IfcSpace"), ("Hall", "IfcSpace"), ("Wall", "IfcWall")
+    ]
+    # Spaces are leaves; elements are listed below storeys only
+    assert all(not child.children for child in storey_node.children)
+
+
+def test_lazy_tree_matches_full_tree():
+    """Test that root and paged children reproduce the full tree."""
+    extractor = SpatialTreeExtractor(artifact_cache=None)
+    tree = extractor.extract_tree(str(TEST_IFC_FILE))
+
+    def expand(node):
+        page = extractor.get_children(str(TEST_IFC_FILE), node["global_id"], limit=None)
+        assert page["total"] == node["child_count"]
+        return {
+            "global_id": node["global_id"],
+            "children": [expand(child) for child in page["children"]]
+        }
+
+    def identities(node):
+        return {"global_id": node.global_id, "children": [identities(child) for child in node.children]}
+
+    root = extractor.get_root(str(TEST_IFC_FILE))
+    assert root["ifc_type"] == "IfcProject"
+    assert "children" not in root
+    assert expand(root) == identities(tree)
+
+
+def test_get_children_paging():
+    """Test offset/limit paging of a storey's children."""
+    extractor = SpatialTreeExtractor(artifact_cache=None)
+    tree = extractor.extract_tree(str(TEST_IFC_FILE))
+    storey = max(tree.children[0].children[0].children, key=lambda node: len(node.children))
+
+    first = extractor.get_children(str(TEST_IFC_FILE), storey.global_id, offset=0, limit=5)
+    second = extractor.get_children(str(TEST_IFC_FILE), storey.global_id, offset=5, limit=5)
+    beyond = extractor.get_children(str(TEST_IFC_FILE), storey.global_id, offset=10_000, limit=5)
+
+    assert first["total"] == len(storey.children)
+    assert [child["global_id"] for child in first["children"] + second["children"]] == \
+        [child.global_id for child in storey.children[:10]]
+    assert beyond["children"] == []
+    with pytest.raises(ValueError):
+        extractor.get_children(str(TEST_IFC_FILE), storey.global_id, offset=-1)
+
+
+def test_get_node_path():
+    """Test that get_node returns the ancestor path to expand the tree down to an element."""
+    extractor = SpatialTreeExtractor(artifact_cache=None)
+    tree = extractor.extract_tree(str(TEST_IFC_FILE))
+    site = tree.children[0]
+    building = site.children[0]
+    storey = next(node for node in building.children if node.children)
+    element = storey.children[-1]
+
+    node = extractor.get_node(str(TEST_IFC_FILE), element.global_id)
+
+    assert node["path"] == [tree.global_id, site.global_id, building.global_id, storey.global_id]
+    assert node["parent_global_id"] == storey.global_id
+    assert extractor.get_node(str(TEST_IFC_FILE), tree.global_id)["parent_global_id"] is None
+    with pytest.raises(ValueError, match="not found"):
+        extractor.get_node(str(TEST_IFC_FILE), "invalid-guid-123")
+
+
+def test_tree_index_cached_per_file_version(tmp_path):
+    """Test that the tree index is built once and rebuilt when the file changes."""
+    import shutil
+
+    path = tmp_path / "model.ifc"
+    shutil.copy(TEST_IFC_FILE, path)
+    extractor = SpatialTreeExtractor(artifact_cache=None)
+
+    index = extractor.get_tree_index(str(path))
+    assert extractor.get_tree_index(str(path)) is index
+
+    shutil.copy(Path(__file__).parent / "fixtures" / "sample.ifc", path)
+    assert extractor.get_tree_index(str(path)) is not index
+
+
+def test_compact_roundtrip():
+    """Test that the compact encoding decodes into the same tree and is smaller."""
+    import json
+
+    tree = SpatialTreeExtractor(artifact_cache=None).extract_tree(str(TEST_IFC_FILE))
+
+    compact = tree.to_compact()
+    decoded = SpatialNode.from_compact(json.loads(json.dumps(compact)))
+
+    assert decoded.to_dict() == tree.to_dict()
+    assert compact["count"] == len(compact["parent"]) == len(compact["global_id"])
+    assert compact["types"][compact["type"][0]] == "IfcProject"
+    assert len(json.dumps(compact, separators=(",", ":"))) * 2 < len(json.dumps(tree.to_dict()))
+
+
+def test_compact_child_ranges():
+    """Test that child ranges and parent indices describe the same breadth-first layout."""
+    tree = SpatialTreeExtractor(artifact_cache=None).extract_tree(str(TEST_IFC_FILE))
+    compact = tree.to_compact()
+
+    for position, (first, count) in enumerate(zip(compact["first_child"], compact["child_count"])):
+        assert all(compact["parent"][child] == position for child in range(first, first + count))
+    assert compact["parent"][0] == -1
+    assert all(parent < position for position, parent in enumerate(compact["parent"]))
+
+
+def test_compact_deep_tree_without_recursion():
+    """Test encoding and decoding a tree deeper than the recursion limit."""
+    import sys
+
+    depth = sys.getrecursionlimit() + 100
+    root = SpatialNode(global_id="0", name=None, ifc_type="IfcProject")
+    node = root
+    for i in range(1, depth):
+        child = SpatialNode(global_id=str(i), name=f"Node {i}", ifc_type="IfcSpace", long_name="Deep")
+        node.children.append(child)
+        node = child
+
+    decoded = SpatialNode.from_compact(root.to_compact())
+
+    count = 0
+    while decoded.children:
+        decoded = decoded.children[0]
+        count += 1
+    assert count == depth - 1
+    assert decoded.global_id == str(depth - 1)
+    assert decoded.long_name == "Deep"
+
+
+def test_compact_rejects_unknown_format():
+    """Test that data which is not a compact tree is rejected."""
+    with pytest.raises(ValueError):
+        SpatialNode.from_compact({"format": "other", "version": 1})
+
+
+@pytest.fixture
+def quantified_model(tmp_path):
+    """IFC4 model with two storeys, walls and slabs with quantity sets (one set shared)."""
+    ifc_file = ifcopenshell.file(schema="IFC4")
+    new = ifcopenshell.guid.new
+    project = ifc_file.create_entity("IfcProject", GlobalId=new(), Name="Project")
+    site = ifc_file.create_entity("IfcSite", GlobalId=new(), Name="Site")
+    building = ifc_file.create_entity("IfcBuilding", GlobalId=new(), Name="Building")
+    storeys = [ifc_file.create_entity("IfcBuildingStorey", GlobalId=new(), Name=f"Storey {i}") for i in range(2)]
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=project, RelatedObjects=[site])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=site, RelatedObjects=[building])
+    ifc_file.create_entity("IfcRelAggregates", GlobalId=new(), RelatingObject=building, RelatedObjects=storeys)
+
+    def qto(name, **values):
+        quantities = [ifc_file.create_entity("IfcQuantityVolume", Name=key, VolumeValue=value) for key, value in values.items()]
+        return ifc_file.create_entity("IfcElementQuantity", GlobalId=new(), Name=name, Quantities=quantities)
+
+    walls = [ifc_file.create_entity("IfcWall", GlobalId=new(), Name=f"Wall {i}") for i in range(3)]
+    slab = ifc_file.create_entity("IfcSlab", GlobalId=new(), Name="Slab")
+    # Shared by the first two walls
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=walls[:2], RelatingPropertyDefinition=qto("Qto_WallBaseQuantities", NetVolume=0.1))
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=[walls[2]], RelatingPropertyDefinition=qto("Qto_WallBaseQuantities", NetVolume=0.2))
+    ifc_file.create_entity("IfcRelDefinesByProperties", GlobalId=new(),
+                           RelatedObjects=[slab], RelatingPropertyDefinition=qto("Qto_SlabBaseQuantities", NetVolume=4.0))
+    ifc_file.create_entity("IfcRelContainedInSpatialStructure", GlobalId=new(),
+                           RelatingStructure=storeys[0], RelatedElements=walls[:2] + [slab])
+    ifc_file.create_entity("IfcRelContainedInSpatialStructure", GlobalId=new(),
+                           RelatingStructure=storeys[1], RelatedElements=walls[2:])
+
+    path = tmp_path / "quantities.ifc"
+    ifc_file.write(str(path))
+    return path
+
+
+def test_rollups(quantified_model):
+    """Test element counts, type counts and quantity sums per storey and for the project."""
+    tree = SpatialTreeExtractor(artifact_cache=None).extract_tree(str(quantified_model))
+    storeys = tree.children[0].children[0].children
+
+    assert storeys[0].rollup == {
+        "element_count": 3,
+        "type_counts": {"IfcWall": 2, "IfcSlab": 1},
+        "quantities": {"Qto_WallBaseQuantities": {"NetVolume": 0.2}, "Qto_SlabBaseQuantities": {"NetVolume": 4.0}},
+    }
+    assert tree.rollup == {
+        "element_count": 4,
+        "type_counts": {"IfcWall": 3, "IfcSlab": 1},
+        "quantities": {"Qto_WallBaseQuantities": {"NetVolume": 0.4}, "Qto_SlabBaseQuantities": {"NetVolume": 4.0}},
+    }
+    assert all(element.rollup is None for element in storeys[0].children)
+
+
+def test_rollups_match_tree_leaves():
+    """Test that every node's element count equals the element leaves below it."""
+    tree = SpatialTreeExtractor(artifact_cache=None).extract_tree(str(TEST_IFC_FILE))
+
+    def leaves(node):
+        if node.rollup is None:
+            return 1
+        return sum(leaves(child) for child in node.children)
+
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        if node.rollup is not None:
+            assert node.rollup["element_count"] == leaves(node)
+            assert sum(node.rollup["type_counts"].values()) == node.rollup["element_count"]
+            pending.extend(node.children)
+
+
+def test_rollups_survive_encodings_and_lazy_api(quantified_model):
+    """Test that rollups are kept by to_dict, to_compact and the lazy tree API."""
+    extractor = SpatialTreeExtractor(artifact_cache=None)
+    tree = extractor.extract_tree(str(quantified_model))
+
+    assert SpatialNode.from_dict(tree.to_dict()).rollup == tree.rollup
+    assert SpatialNode.from_compact(tree.to_compact()).to_dict() == tree.to_dict()
+    assert extractor.get_root(str(quantified_model))["rollup"]["element_count"] == 4
@@ -0,0 +1,205 @@
+"""
+Unit Tests for the Raw STEP Scanner
+
+Tests header parsing, record lookup, sampled and full entity counts without
+IfcOpenShell, and the IfcParser.parse_header() fast path built on them.
+"""
+
+import re
+import pytest
+from pathlib import Path
+
+from ifc_intelligence.parser import IfcParser
+from ifc_intelligence.step_scanner import (
+    StepFile,
+    StepRef,
+    decode_step_string,
+    expand_subtypes,
+    parse_step_parameters,
+    scan_entities,
+)
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+SAMPLE_IFC = FIXTURES_DIR / "sample.ifc"
+
+
+def test_parse_parameters():
+    """Test parsing the STEP value kinds."""
+    record = b"('a''b',$,*,#12,(1,2.5,-3.E-2),.NOCHANGE.,IFCLABEL('x'),())"
+
+    values, end = parse_step_parameters(record, 0)
+
+    assert values == ["a'b", None, None, 12, [1, 2.5, -0.03], "NOCHANGE", "x", []]
+    assert isinstance(values[3], StepRef)
+    assert end == len(record)
+
+
+def test_parse_parameters_rejects_truncated_record():
+    """Test that an unterminated record raises ValueError."""
+    with pytest.raises(ValueError):
+        parse_step_parameters(b"('abc',#1", 0)
+
+
+def test_decode_step_string():
+    """Test decoding of STEP string escapes."""
+    assert decode_step_string(r"Gr\X2\00FC\X0\n") == "Grün"
+    assert decode_step_string(r"Stra\X\DFe") == "Straße"
+    assert decode_step_string("it''s") == "it's"
+
+
+def test_read_header():
+    """Test reading the HEADER section."""
+    with StepFile(str(DUPLEX_IFC)) as step:
+        header = step.read_header()
+
+    assert header.schema == "IFC2X3"
+    assert header.description == ["ViewDefinition [CoordinationView_V2.0]"]
+    assert header.time_stamp == "2015-11-12T09:06:15+0100"
+    assert header.originating_system.startswith("20150220_1215")
+
+
+def test_find_and_resolve_instances():
+    """Test locating records by type and following references."""
+    with StepFile(str(DUPLEX_IFC)) as step:
+        project_id, project = step.find_instance("IfcProject")
+        owner_history = step.resolve(project[1], "IfcOwnerHistory")
+        wrong_type = step.resolve(project[1], "IfcPerson")
+
+    assert project_id == 100
+    assert project[0] == "1xS3BCk291UvhgP2a6eflL"
+    assert owner_history[3] == "NOCHANGE"
+    assert wrong_type is None
+
+
+def test_find_instance_ignores_longer_names():
+    """Test that IFCWALL does not match IFCWALLSTANDARDCASE records."""
+    with StepFile(str(DUPLEX_IFC)) as step:
+        found = step.find_instance("IfcWall")
+        instance_type, _ = step.get_instance(found[0])
+
+    assert instance_type == "IFCWALL"
+
+
+def test_sample_counts_small_file_exact():
+    """Test that files smaller than the sample are counted exactly."""
+    with StepFile(str(DUPLEX_IFC)) as step:
+        counts, exact = step.sample_entity_counts(["IfcWall", "IfcWallStandardCase", "IfcDoor"])
+
+    assert exact
+    assert counts == {"IfcWall": 1, "IfcWallStandardCase": 56, "IfcDoor": 14}
+
+
+def test_sample_counts_large_file_extrapolated():
+    """Test that sampled counts are extrapolated to the file size."""
+    with StepFile(str(DUPLEX_IFC)) as step:
+        counts, exact = step.sample_entity_counts(["IfcCartesianPoint"], sample_bytes=256 * 1024)
+
+    assert not exact
+    # 5311 points in the file; an extrapolated sample should be in the right range
+    assert 2500 < counts["IfcCartesianPoint"] < 10000
+
+
+def test_expand_subtypes():
+    """Test expanding types to their schema subtypes."""
+    assert expand_subtypes("IFC4", ["IfcWall"]) == ["IfcWall", "IfcWallElementedCase", "IfcWallStandardCase"]
+    assert expand_subtypes("IFC2X3", ["IfcPipeSegment"]) == []
+
+
+def test_rejects_non_step_file(tmp_path):
+    """Test that files without the ISO-10303-21 signature are rejected."""
+    path = tmp_path / "model.ifc"
+    path.write_text("<ifcXML/>")
+
+    with pytest.raises(RuntimeError):
+        StepFile(str(path))
+
+
+@pytest.mark.parametrize("fixture", [DUPLEX_IFC, SAMPLE_IFC])
+def test_parse_header_matches_full_parse(fixture):
+    """Test that the fast path returns the same metadata as a full parse."""
+    parser = IfcParser(artifact_cache=None)
+
+    fast = parser.parse_header(str(fixture))
+    full = parser.parse_file(str(fixture))
+
+    assert fast.model_id == full.model_id
+    assert fast.project_name == full.project_name
+    assert fast.schema == full.schema
+    assert fast.entity_counts == full.entity_counts
+    assert (fast.author, fast.organization, fast.application) == (full.author, full.organization, full.application)
+    assert not fast.entity_counts_approximate
+
+
+def test_parse_header_mixed_case_keywords(tmp_path):
+    """Test that lowercase entity keywords (valid Part 21) are found like uppercase ones."""
+    path = tmp_path / "duplex_mixed_case.ifc"
+    content = DUPLEX_IFC.read_bytes()
+    path.write_bytes(re.sub(rb"(#\d+\s*=\s*)IFC([A-Z0-9_]+)\(",
+                            lambda match: match.group(1) + b"Ifc" + match.group(2).lower() + b"(", content))
+    parser = IfcParser(artifact_cache=None)
+
+    fast = parser.parse_header(str(path))
+    full = parser.parse_file(str(DUPLEX_IFC))
+
+    assert fast.model_id == full.model_id
+    assert fast.project_name == full.project_name
+    assert fast.entity_counts == full.entity_counts
+    assert (fast.author, fast.organization, fast.application) == (full.author, full.organization, full.application)
+
+    with StepFile(str(path)) as step:
+        counts, exact = step.sample_entity_counts(["IfcWall", "IfcWallStandardCase", "IfcDoor"])
+    assert counts == {"IfcWall": 1, "IfcWallStandardCase": 56, "IfcDoor": 14}
+
+
+def test_parse_header_nonexistent_file():
+    """Test error handling for non-existent files."""
+    with pytest.raises(FileNotFoundError):
+        IfcParser().parse_header("nonexistent.ifc")
+
+
+def test_scan_entities_matches_ifcopenshell():
+    """Test that the raw scan counts every class like a full parse."""
+    import ifcopenshell
+    from ifc_intelligence.entity_histogram import count_entity_classes
+
+    scan = scan_entities(str(DUPLEX_IFC))
+    ifc_file = ifcopenshell.open(str(DUPLEX_IFC))
+
+    assert scan.histogram == count_entity_classes(ifc_file)
+    assert scan.instance_count == len(list(ifc_file))
+    assert scan.rollups["IfcBuildingElement"] == len(ifc_file.by_type("IfcBuildingElement"))
+    assert scan.unknown_types == {}
+
+
+def test_scan_entities_small_chunks_and_progress():
+    """Test that chunk boundaries don't lose instances and progress reaches the end."""
+    progress = []
+
+    scan = scan_entities(str(DUPLEX_IFC), chunk_bytes=4096, progress=lambda done, total: progress.append((done, total)))
+
+    assert scan.instance_count == scan_entities(str(DUPLEX_IFC)).instance_count
+    assert len(progress) > 100
+    assert progress[-1][0] == progress[-1][1]
+
+
+def test_scan_entities_case_insensitive(tmp_path):
+    """Test that lowercase entity names map to schema classes and unknown names are reported."""
+    path = tmp_path / "mixed.ifc"
+    path.write_text(
+        "ISO-10303-21;\nHEADER;\nFILE_SCHEMA(('IFC4'));\nENDSEC;\nDATA;\n"
+        "#1=IfcWall('a',$,$,$,$,$,$,$,$);\n"
+        "#2 = ifcwallstandardcase('b',$,$,$,$,$,$,$,$);\n"
+        "#3=IFCDOOR('c',$,$,$,$,$,$,$,$,$,$,$,$);\n"
+        "#4=IFCNOTANENTITY();\n"
+        "ENDSEC;\nEND-ISO-10303-21;\n"
+    )
+
+    scan = scan_entities(str(path))
+
+    assert scan.schema == "IFC4"
+    assert scan.histogram == {"IfcWall": 1, "IfcWallStandardCase": 1, "IfcDoor": 1}
+    assert scan.rollups["IfcWall"] == 2
+    assert scan.unknown_types == {"IFCNOTANENTITY": 1}
@@ -0,0 +1,227 @@
+"""
+Unit Tests for IFC Worker
+
+Tests the IfcWorker request dispatching and the line-delimited JSON protocol.
+"""
+
+import gc
+import io
+import json
+import weakref
+import pytest
+from pathlib import Path
+from ifc_intelligence.cache_manager import IfcCacheManager
+from ifc_intelligence.worker import IfcWorker
+
+
+# Test fixtures path
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_IFC = FIXTURES_DIR / "sample.ifc"
+DUPLEX_IFC = FIXTURES_DIR / "Duplex.ifc"
+
+WALL_GUID = "2O2Fr$t4X7Zf8NOew3FKau"
+
+
+@pytest.fixture
+def worker():
+    """Worker with its own (non-global) cache."""
+    return IfcWorker(cache_manager=IfcCacheManager(max_size=5))
+
+
+def test_ping(worker):
+    """Test that the worker answers ping requests."""
+    response = worker.handle_request({"id": 1, "command": "ping"})
+
+    assert response["id"] == 1
+    assert response["result"]["pong"] is True
+
+
+def test_unknown_command(worker):
+    """Test error response for unknown commands."""
+    response = worker.handle_request({"id": 2, "command": "does_not_exist"})
+
+    assert response["id"] == 2
+    assert "Unknown command" in response["error"]
+
+
+def test_parse_request(worker):
+    """Test parsing a file through the worker."""
+    response = worker.handle_request({
+        "id": 3,
+        "command": "parse",
+        "params": {"file_path": str(SAMPLE_IFC)}
+    })
+
+    assert "error" not in response
+    assert response["result"]["project_name"] == "Sample Project"
+    assert response["result"]["schema"] == "IFC4"
+    assert "total_ms" in response["metrics"]["timings"]
+
+
+def test_missing_param(worker):
+    """Test error response for requests without required params."""
+    response = worker.handle_request({"id": 4, "command": "parse", "params": {}})
+
+    assert "Invalid request" in response["error"]
+
+
+def test_nonexistent_file(worker):
+    """Test error response for non-existent files."""
+    response = worker.handle_request({
+        "id": 5,
+        "command": "parse",
+        "params": {"file_path": "/nonexistent/file.ifc"}
+    })
+
+    assert "File not found" in response["error"]
+
+
+def test_cache_is_reused_across_requests(worker):
+    """Test that repeated requests are served from the shared cache."""
+    params = {"file_path": str(DUPLEX_IFC)}
+
+    worker.handle_request({"id": 1, "command": "parse", "params": params})
+    worker.handle_request({"id": 2, "command": "spatial_tree", "params": params})
+    worker.handle_request({
+        "id": 3,
+        "command": "properties",
+        "params": {"file_path": str(DUPLEX_IFC), "element_guid": WALL_GUID}
+    })
+
+    stats = worker.handle_request({"id": 4, "command": "stats"})["result"]["cache"]
+
+    # File is parsed once, every following request is a hit
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_properties_request(worker):
+    """Test extracting element properties through the worker."""
+    response = worker.handle_request({
+        "id": 1,
+        "command": "properties",
+        "params": {"file_path": str(DUPLEX_IFC), "element_guid": WALL_GUID}
+    })
+
+    assert response["result"]["global_id"] == WALL_GUID
+    assert "Pset_WallCommon" in response["result"]["property_sets"]
+
+
+def test_lazy_spatial_tree_requests(worker):
+    """Test paging through the spatial tree with the spatial_* commands."""
+    root = worker.handle_request({"id": 1, "command": "spatial_root", "params": {"file_path": str(DUPLEX_IFC)}})
+    assert root["result"]["ifc_type"] == "IfcProject"
+
+    page = worker.handle_request({
+        "id": 2,
+        "command": "spatial_children",
+        "params": {"file_path": str(DUPLEX_IFC), "global_id": root["result"]["global_id"], "limit": 1}
+    })
+    assert page["result"]["total"] == root["result"]["child_count"]
+    assert page["result"]["children"][0]["ifc_type"] == "IfcSite"
+
+    node = worker.handle_request({
+        "id": 3,
+        "command": "spatial_node",
+        "params": {"file_path": str(DUPLEX_IFC), "global_id": WALL_GUID}
+    })
+    assert node["result"]["path"][0] == root["result"]["global_id"]
+
+    missing = worker.handle_request({
+        "id": 4,
+        "command": "spatial_node",
+        "params": {"file_path": str(DUPLEX_IFC), "global_id": "does-not-exist"}
+    })
+    assert "not found" in missing["error"]
+
+
+def test_bulk_differential_request(worker):
+    """Test that bulk with previous_hashes returns only the changes."""
+    params = {"file_path": str(DUPLEX_IFC)}
+    full = worker.handle_request({"id": 1, "command": "bulk", "params": params})["result"]
+
+    previous = {element["global_id"]: element["content_hash"] for element in full["elements"]}
+    changed_guid = full["elements"][0]["global_id"]
+    previous[changed_guid] = "0" * 32
+    previous["3cUkl32yn9qRSPvBJVyWYp"] = "0" * 32
+
+    response = worker.handle_request({
+        "id": 2,
+        "command": "bulk",
+        "params": {**params, "previous_hashes": previous}
+    })
+
+    result = response["result"]
+    assert [element["global_id"] for element in result["elements"]] == [changed_guid]
+    assert result["removed"] == ["3cUkl32yn9qRSPvBJVyWYp"]
+    assert result["changes"]["unchanged"] == full["element_count"] - 1
+
+
+def test_evicted_model_is_released_by_extractors():
+    """Test that the long-lived extractors don't keep an evicted model alive."""
+    worker = IfcWorker(cache_manager=IfcCacheManager(max_size=1))
+    duplex = {"file_path": str(DUPLEX_IFC)}
+    worker.handle_request({"id": 1, "command": "bulk", "params": duplex})
+    worker.handle_request({"id": 2, "command": "properties", "params": {**duplex, "element_guid": WALL_GUID}})
+    worker.handle_request({"id": 3, "command": "spatial_root", "params": duplex})
+    model = weakref.ref(worker.cache.get_or_load(str(DUPLEX_IFC)))
+
+    # Loading another file evicts Duplex.ifc
+    response = worker.handle_request({"id": 4, "command": "spatial_tree", "params": {"file_path": str(SAMPLE_IFC)}})
+    assert "error" not in response
+    assert worker.cache.get_stats()["cached_files"] == [str(SAMPLE_IFC)]
+
+    gc.collect()
+    assert model() is None
+
+
+def test_gltf_unknown_option(worker):
+    """Test that a misspelled export option is reported as an invalid request."""
+    response = worker.handle_request({
+        "id": 1,
+        "command": "gltf",
+        "params": {"file_path": str(DUPLEX_IFC), "output_path": "model.glb", "options": {"y_upp": True}}
+    })
+
+    assert response["error"] == "Invalid request: unknown option(s): y_upp"
+
+    response = worker.handle_request({
+        "id": 2,
+        "command": "process_revision",
+        "params": {"file_path": str(DUPLEX_IFC), "options": ["y_up"]}
+    })
+    assert response["error"].startswith("Invalid request:")
+
+
+def test_serve_protocol(worker):
+    """Test the stdin/stdout line protocol including shutdown."""
+    requests = [
+        {"id": 1, "command": "ping"},
+        {"id": 2, "command": "parse", "params": {"file_path": str(SAMPLE_IFC)}},
+        {"id": 3, "command": "shutdown"},
+        {"id": 4, "command": "ping"},  # Never processed
+    ]
+    input_stream = io.StringIO("\n".join(json.dumps(r) for r in requests) + "\nnot json\n")
+    output_stream = io.StringIO()
+
+    worker.serve(input_stream, output_stream)
+
+    responses = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+    assert [r["id"] for r in responses] == [1, 2, 3]
+    assert responses[1]["result"]["model_id"] == "3vB2YO$MX4xv5uCqZZG0Xq"
+    assert responses[2]["result"]["shutdown"] is True
+
+
+def test_serve_invalid_json(worker):
+    """Test that malformed lines produce an error frame and serving continues."""
+    input_stream = io.StringIO('not json\n{"id": 1, "command": "ping"}\n')
+    output_stream = io.StringIO()
+
+    worker.serve(input_stream, output_stream)
+
+    responses = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+    assert len(responses) == 2
+    assert "Invalid request" in responses[0]["error"]
+    assert responses[1]["result"]["pong"] is True